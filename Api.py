@@ -8,10 +8,35 @@ Created on Wed May  1 16:26:47 2019
 
 import Game
 import Interface
+import Sessions
+import Metrics
+import io
+import csv
+import json
+import time
+import datetime
+import collections.abc
 from flask import Flask, jsonify, request
 
 app = Flask("Hangman")
 
+#bounds of the number of scores sent in one response
+DEFAULT_SCORES_LIMIT    = 100
+MAX_SCORES_LIMIT        = 1000
+
+#the biggest number of characters guessed with one request
+MAX_BATCH_CHARACTERS    = 100
+
+#the longest accepted name of a user
+MAX_NAME_LENGTH         = 100
+
+#formats of exported scores and their content types
+EXPORT_FORMATS = \
+{
+ 'ndjson':  'application/x-ndjson',
+ 'csv':     'text/csv; charset=utf-8',
+ }
+
 class CustomError(Exception):
     """
     Excetipn handling any problem which needs to be reported back via https.
@@ -68,30 +93,110 @@ def handleCustomError(error):
 
 
 
+class ApiRequest:
+    """
+    Basically a struct holding the parts of a http request used by HangmanApi, 
+    so that the api does not depend on the server which received the request.
+
+    """
+    
+    def __init__(self, args, body, headers):
+        """
+        Constructor of ApiRequest struct.
+    
+        Parameters
+        ----------
+        args: dict(string, string)
+            arguments from the query string
+        body: bytes
+            body of the request
+        headers: dict(string, string)
+            headers of the request with lowercase names
+    
+        """
+        self.args       = args
+        self.body       = body
+        self.headers    = headers
+
+
+
+class ApiResponse:
+    """
+    Basically a struct holding data which is sent back as json, with the status 
+    code and additional headers of the response. Data given as bytes is sent as it 
+    is, with the Content-Type set in headers. Data given as an iterator of bytes is
+    streamed chunk by chunk, while the iterator produces them.
+
+    """
+    
+    def __init__(self, data, status=200, headers=None):
+        """
+        Constructor of ApiResponse struct.
+    
+        Parameters
+        ----------
+        data: dict or list or bytes or iterator(bytes)
+            data to send as json, the raw body or chunks of the streamed body, no body is sent if None
+        status: int
+            status code of the response
+        headers: dict(string, string)
+            additional headers of the response
+    
+        """
+        self.data       = data
+        self.status     = status
+        self.headers    = headers if headers is not None else dict()
+
+
+
 class HangmanApi(Interface.Base):
     """
-    Class holding the methods used by game's flask web api.
+    Class holding the methods used by game's web api. Every method handling a request
+    takes ApiRequest and returns ApiResponse, so it can be used by any server.
 
     """
     
     def __init__(self):
         """
-        Constructor of HangmanApi Class.
+        Constructor of HangmanApi Class. Creates the registry of games played via api.
     
         Parameters
         ----------
     
         """
         super(HangmanApi, self).__init__()
+        self._sessions = Sessions.SessionRegistry()
+    
+    
+    
+    def attachJournal(self, journal):
+        """
+        Restores the games saved by the journal and saves every change of games with it from now on.
+        
+        Rsises Snapshots.SnapshotError.
+    
+        Parameters
+        ----------
+        journal: Snapshots.SessionJournal
+            the journal
+        
+        Returns
+        int
+            number of restored games
+    
+        """
+        return self._sessions.attachJournal(journal)
     
     
     
-    def createGameStateDict(self):
+    def createGameStateDict(self, gameInstance):
         """
         Creates a dict representation of the game's state.
     
         Parameters
         ----------
+        gameInstance: Game.Core
+            the game to describe
         
         Returns
         dict(string,...)
@@ -99,141 +204,721 @@ class HangmanApi(Interface.Base):
     
         """
         state = dict()
-        state['currentGuess']   = self._gameInstance.currentGuess
-        state['attemptsLeft']   = self._gameInstance.attemptsLeft
-        state['gameActive']     = self._gameInstance.active
-        state['userGuessed']    = self._gameInstance.userGuesssed
-        state['userName']       = self._gameInstance.userName
-        state['score']          = self._gameInstance.score
+        state['currentGuess']   = gameInstance.currentGuess
+        state['attemptsLeft']   = gameInstance.attemptsLeft
+        state['gameActive']     = gameInstance.active
+        state['userGuessed']    = gameInstance.userGuesssed
+        state['userName']       = gameInstance.userName
+        state['score']          = gameInstance.score
+        state['version']        = gameInstance.version
         return state
     
     
     
-    def endGame(self):
+    def createETag(self, gameInstance):
         """
-        Ends the game, but does not delete its instance.
+        Creates an entity tag of the game's state. It changes with every change of the state.
     
         Parameters
         ----------
+        gameInstance: Game.Core
+            the game to describe
         
         Returns
-        json
-            a jasonified message for the client
+        string
+            the quoted entity tag
     
         """
-        self._gameInstance.end()
-        return jsonify({'message': "Game ended"})
+        return '"'+str(gameInstance.version)+'"'
     
     
     
-    def startGame(self):
+    def matchesETag(self, apiRequest, eTag):
         """
-        Checks if the data from the client with user's name is proper and (re)starts the game.
+        Checks if If-None-Match header of the request holds the given entity tag.
+    
+        Parameters
+        ----------
+        apiRequest: ApiRequest
+            the request
+        eTag: string
+            the quoted entity tag of the current state
+        
+        Returns
+        bool
+            True if the client already has the current state
+    
+        """
+        header = apiRequest.headers.get('if-none-match')
+        if header is None:
+            return False
+        if header.strip() == '*':
+            return True
+        for tag in header.split(','):
+            tag = tag.strip()
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            if tag == eTag:
+                return True
+        return False
+    
+    
+    
+    def getIncludeState(self, jsonData):
+        """
+        Checks if the client asked for the state of the game in the response.
         
         Rsises CustomError.
     
         Parameters
         ----------
+        jsonData: dict(string,...)
+            json data of the request
         
         Returns
-        json
-            a jasonified message for the client
+        bool
+            value of the optional includeState field, False if missing
+    
+        """
+        includeState = jsonData.get('includeState', False)
+        if not isinstance(includeState, bool):
+            raise CustomError('IncludeState has to be a boolean')
+        return includeState
+    
+    
+    
+    def getJsonData(self, apiRequest):
+        """
+        Provides json data sent by the client.
+        
+        Rsises CustomError.
+    
+        Parameters
+        ----------
+        apiRequest: ApiRequest
+            the request
+        
+        Returns
+        dict(string,...)
+            json data of the request
     
         """
         try:
-            jsonData = request.get_json(force=True)
+            jsonData = json.loads(apiRequest.body)
         except:
             raise CustomError("Missing or wrong json data in request")
-        if not ('name' in jsonData):
-            raise CustomError('Missing name field in json data')
-        usersInput = jsonData.get('name')
-        lengthCondition = lambda x: x > 0
-        correctInput = self.validateInput(usersInput, lengthCondition, "Name cannot be empty", "Unsupported characters in name", allowWhitespaces=True)
-        if not correctInput:
-            raise CustomError(self._errorMessage)
-            self.clearErrorMessage()
-        self._gameInstance.start(usersInput)
-        return jsonify({'message': "Game started"})
+        if not isinstance(jsonData, dict):
+            raise CustomError("Missing or wrong json data in request")
+        return jsonData
+    
+    
+    
+    def getGameId(self, apiRequest, jsonData=None):
+        """
+        Provides the id of the game the request refers to. It is looked for in 
+        json data first and then in the query string.
+        
+        Rsises CustomError.
+    
+        Parameters
+        ----------
+        apiRequest: ApiRequest
+            the request
+        jsonData: dict(string,...)
+            json data of the request, if any
+        
+        Returns
+        string
+            id of the game
+    
+        """
+        gameId = None
+        if jsonData is not None:
+            gameId = jsonData.get('gameId')
+        if gameId is None:
+            gameId = apiRequest.args.get('gameId')
+        if not gameId:
+            raise CustomError('Missing gameId')
+        return str(gameId)
+    
+    
+    
+    def endGame(self, apiRequest):
+        """
+        Ends the game and removes it from the registry.
+        
+        Rsises CustomError.
+    
+        Parameters
+        ----------
+        apiRequest: ApiRequest
+            the request
+        
+        Returns
+        ApiResponse
+            a jasonified message for the client
+    
+        """
+        gameId = self.getGameId(apiRequest)
+        try:
+            with self._sessions.session(gameId) as gameInstance:
+                gameInstance.end()
+            self._sessions.remove(gameId)
+        except Sessions.SessionNotFound:
+            raise CustomError('Game not found. (Re)start', status_code=404)
+        return ApiResponse({'message': "Game ended"})
+    
     
     
+    def startGame(self, apiRequest):
+        """
+        Checks if the data from the client with user's name is proper and starts the game.
+        If json data holds gameId of a live game, that game is restarted. Otherwise a new 
+        game is created. Optional length and difficulty fields choose the word to guess.
+        If includeState field is true, the state of the game is sent back as well.
+        
+        Rsises CustomError.
+    
+        Parameters
+        ----------
+        apiRequest: ApiRequest
+            the request
+        
+        Returns
+        ApiResponse
+            a jasonified message and id of the game for the client
     
-    def getGameState(self):
         """
-        Provides json with the current state of the game.
+        jsonData = self.getJsonData(apiRequest)
+        if not ('name' in jsonData):
+            raise CustomError('Missing name field in json data')
+        usersInput = jsonData.get('name')
+        if not isinstance(usersInput, str):
+            raise CustomError('Name has to be a string')
+        lengthCondition = lambda x: 0 < x <= MAX_NAME_LENGTH
+        message = self.checkInput(usersInput, lengthCondition, "Name has to have from 1 to "+str(MAX_NAME_LENGTH)+" characters", "Unsupported characters in name", allowWhitespaces=True)
+        if message is not None:
+            raise CustomError(message)
+        length = jsonData.get('length')
+        if length is not None and (not isinstance(length, int) or isinstance(length, bool)):
+            raise CustomError('Length has to be an integer')
+        difficulty = jsonData.get('difficulty')
+        includeState = self.getIncludeState(jsonData)
+        gameId = jsonData.get('gameId')
+        newGame = gameId is None
+        if newGame:
+            gameId = self._sessions.create()
+        try:
+            with self._sessions.session(str(gameId)) as gameInstance:
+                gameInstance.start(usersInput, length, difficulty)
+                data = {'message': "Game started", 'gameId': gameId}
+                headers = dict()
+                if includeState:
+                    data['state'] = self.createGameStateDict(gameInstance)
+                    headers['ETag'] = self.createETag(gameInstance)
+        except Sessions.SessionNotFound:
+            raise CustomError('Game not found. (Re)start', status_code=404)
+        except ValueError as e:
+            if newGame:
+                self._sessions.remove(gameId)
+            raise CustomError(str(e))
+        return ApiResponse(data, headers=headers)
+    
+    
+    
+    def getGameState(self, apiRequest):
+        """
+        Provides json with the current state of the game and its entity tag.
+        If If-None-Match header holds the tag of the current state, only status 304 is sent.
+        
+        Rsises CustomError.
     
         Parameters
         ----------
+        apiRequest: ApiRequest
+            the request
         
         Returns
-        json
+        ApiResponse
             a jasonified state of the game
     
         """
-        return jsonify(self.createGameStateDict())
+        try:
+            with self._sessions.session(self.getGameId(apiRequest)) as gameInstance:
+                eTag = self.createETag(gameInstance)
+                if self.matchesETag(apiRequest, eTag):
+                    return ApiResponse(None, 304, {'ETag': eTag})
+                state = self.createGameStateDict(gameInstance)
+        except Sessions.SessionNotFound:
+            raise CustomError('Game not found. (Re)start', status_code=404)
+        return ApiResponse(state, headers={'ETag': eTag})
 
 
 
-    def tryCharacter(self):
+    def tryCharacter(self, apiRequest):
         """
         Checks if the data from the client with user's guess is proper and forewards it to the game.
+        If includeState field is true, the updated state of the game is sent back as well.
         
         Rsises CustomError.
     
         Parameters
         ----------
+        apiRequest: ApiRequest
+            the request
         
         Returns
-        json
+        ApiResponse
             a jasonified bool which is True if the guess was correct
     
         """
-        if not self._gameInstance.active:
-            raise CustomError('Game is not active. (Re)start', status_code=412)
-        try:
-            jsonData = request.get_json(force=True)
-        except:
-            raise CustomError("Missing or wrong json data in request")
+        jsonData = self.getJsonData(apiRequest)
+        gameId = self.getGameId(apiRequest, jsonData)
         if not ('character' in jsonData):
             raise CustomError('Missing character field in json data')
         usersInput = jsonData.get('character')
+        includeState = self.getIncludeState(jsonData)
+        if not isinstance(usersInput, str):
+            raise CustomError('Character has to be a string')
+        lengthCondition = lambda x: x == 1
+        message = self.checkInput(usersInput, lengthCondition, "Invalid number of characters", "Wrong character provided")
+        if message is not None:
+            raise CustomError(message)
+        try:
+            with self._sessions.session(gameId) as gameInstance:
+                if not gameInstance.active:
+                    raise CustomError('Game is not active. (Re)start', status_code=412)
+                #here we choose to ignore any exceptions related to score data since it is not related directly to the request
+                succesfullAttempt = gameInstance.handleNewCharacter(usersInput)
+                data = {'successfullAttempt': succesfullAttempt}
+                headers = dict()
+                if includeState:
+                    data['state'] = self.createGameStateDict(gameInstance)
+                    headers['ETag'] = self.createETag(gameInstance)
+        except Sessions.SessionNotFound:
+            raise CustomError('Game not found. (Re)start', status_code=404)
+        return ApiResponse(data, headers=headers)
+    
+    
+    
+    def tryCharacters(self, apiRequest):
+        """
+        Checks if the data from the client with an ordered list of user's guesses is proper 
+        and forewards them to the game one by one, until the game ends. All characters 
+        are validated before any of them is used. Characters sent after the end of the 
+        game are ignored.
+        
+        Rsises CustomError.
+    
+        Parameters
+        ----------
+        apiRequest: ApiRequest
+            the request
+        
+        Returns
+        ApiResponse
+            a jasonified list with the result of every used character and the final state of the game
+    
+        """
+        jsonData = self.getJsonData(apiRequest)
+        gameId = self.getGameId(apiRequest, jsonData)
+        if not ('characters' in jsonData):
+            raise CustomError('Missing characters field in json data')
+        characters = jsonData.get('characters')
+        if not isinstance(characters, list) or len(characters) == 0 or len(characters) > MAX_BATCH_CHARACTERS:
+            raise CustomError('Characters have to be a list of 1 to '+str(MAX_BATCH_CHARACTERS)+' entries')
         lengthCondition = lambda x: x == 1
-        correctInput = self.validateInput(usersInput, lengthCondition, "Invalid number of characters", "Wrong character provided")
-        if not correctInput:
-            raise CustomError(self._errorMessage)
-            self.clearErrorMessage()
-        #here we choose to ignore any exceptions related to score data since it is not related directly to the request
-        succesfullAttempt = self._gameInstance.handleNewCharacter(usersInput)
-        return jsonify({'successfullAttempt': succesfullAttempt})
+        for usersInput in characters:
+            if not isinstance(usersInput, str):
+                raise CustomError('Wrong character provided')
+            message = self.checkInput(usersInput, lengthCondition, "Invalid number of characters", "Wrong character provided")
+            if message is not None:
+                raise CustomError(message)
+        results = []
+        try:
+            with self._sessions.session(gameId) as gameInstance:
+                if not gameInstance.active:
+                    raise CustomError('Game is not active. (Re)start', status_code=412)
+                for usersInput in characters:
+                    if not gameInstance.active:
+                        break
+                    succesfullAttempt = gameInstance.handleNewCharacter(usersInput)
+                    results.append({'character': usersInput, 'successfullAttempt': succesfullAttempt})
+                state = self.createGameStateDict(gameInstance)
+                eTag = self.createETag(gameInstance)
+        except Sessions.SessionNotFound:
+            raise CustomError('Game not found. (Re)start', status_code=404)
+        return ApiResponse({'results': results, 'state': state}, headers={'ETag': eTag})
+    
+    
+    
+    def getIntArgument(self, apiRequest, name, default, maximum=None):
+        """
+        Provides a non-negative integer given in the query string.
+        
+        Rsises CustomError.
     
+        Parameters
+        ----------
+        apiRequest: ApiRequest
+            the request
+        name: string
+            name of the argument
+        default: int
+            value used if the argument is missing
+        maximum: int
+            the biggest allowed value, if any
+        
+        Returns
+        int
+            value of the argument
+    
+        """
+        value = apiRequest.args.get(name)
+        if value is None:
+            return default
+        try:
+            value = int(value)
+        except ValueError:
+            raise CustomError(name+' has to be an integer')
+        if value < 0 or (maximum is not None and value > maximum):
+            raise CustomError(name+' out of range')
+        return value
     
     
-    def getScores(self):
+    
+    def getScores(self, apiRequest):
         """
-        Provides json with all the scores saved by the game.
+        Provides json with one page of the scores saved by the game. The page is 
+        selected with offset and limit arguments of the query string. The total 
+        number of saved scores is sent in X-Total-Count header.
+        
+        Rsises CustomError.
     
         Parameters
         ----------
+        apiRequest: ApiRequest
+            the request
         
         Returns
-        json
+        ApiResponse
             a jasonified scores saved by the game
     
         """
+        offset = self.getIntArgument(apiRequest, 'offset', 0)
+        limit = self.getIntArgument(apiRequest, 'limit', DEFAULT_SCORES_LIMIT, maximum=MAX_SCORES_LIMIT)
+        try:        
+            scores = self._gameInstance.getScores(offset, limit)
+            total = Game.queryScores('count')
+        except Game.ScoreDataProblem:
+            raise CustomError("Problem with score data handling", status_code=500)
+        return ApiResponse(scores, headers={'X-Total-Count': str(total)})
+    
+    
+    def getDateArgument(self, apiRequest, name):
+        """
+        Provides a date given in ISO 8601 format in the query string.
+        
+        Rsises CustomError.
+    
+        Parameters
+        ----------
+        apiRequest: ApiRequest
+            the request
+        name: string
+            name of the argument
+        
+        Returns
+        datetime.datetime
+            value of the argument, None if it is missing
+    
+        """
+        value = apiRequest.args.get(name)
+        if value is None:
+            return None
+        try:
+            return datetime.datetime.fromisoformat(value)
+        except ValueError:
+            raise CustomError(name+' has to be a date in ISO 8601 format')
+    
+    
+    
+    def getTopScores(self, apiRequest):
+        """
+        Provides json with the best scores saved by the game. Their number is given 
+        with count argument of the query string.
+        
+        Rsises CustomError.
+    
+        Parameters
+        ----------
+        apiRequest: ApiRequest
+            the request
+        
+        Returns
+        ApiResponse
+            a jasonified list of the best scores
+    
+        """
+        count = self.getIntArgument(apiRequest, 'count', 10, maximum=MAX_SCORES_LIMIT)
+        try:        
+            scores = self._gameInstance.getTopScores(count)
+        except Game.ScoreDataProblem:
+            raise CustomError("Problem with score data handling", status_code=500)
+        return ApiResponse(scores)
+    
+    
+    
+    def getUserStats(self, apiRequest):
+        """
+        Provides json with the number, the best and the average of scores of the user 
+        given with name argument of the query string.
+        
+        Rsises CustomError.
+    
+        Parameters
+        ----------
+        apiRequest: ApiRequest
+            the request
+        
+        Returns
+        ApiResponse
+            a jasonified aggregates of user's scores
+    
+        """
+        name = apiRequest.args.get('name')
+        if not name:
+            raise CustomError('Missing name')
+        try:        
+            stats = self._gameInstance.getUserStats(name)
+        except Game.ScoreDataProblem:
+            raise CustomError("Problem with score data handling", status_code=500)
+        if stats is None:
+            raise CustomError('No scores of the user', status_code=404)
+        return ApiResponse(stats)
+    
+    
+    
+    def getScoresBetween(self, apiRequest):
+        """
+        Provides json with one page of scores saved between since and until dates 
+        given in the query string. Any of the dates can be skipped.
+        
+        Rsises CustomError.
+    
+        Parameters
+        ----------
+        apiRequest: ApiRequest
+            the request
+        
+        Returns
+        ApiResponse
+            a jasonified list of scores, the oldest first
+    
+        """
+        since = self.getDateArgument(apiRequest, 'since')
+        until = self.getDateArgument(apiRequest, 'until')
+        offset = self.getIntArgument(apiRequest, 'offset', 0)
+        limit = self.getIntArgument(apiRequest, 'limit', DEFAULT_SCORES_LIMIT, maximum=MAX_SCORES_LIMIT)
         try:        
-            scores = self._gameInstance.getScores()
+            scores = self._gameInstance.getScoresBetween(since, until, offset, limit)
         except Game.ScoreDataProblem:
             raise CustomError("Problem with score data handling", status_code=500)
-        return jsonify(scores)
+        return ApiResponse(scores)
+    
+    
+    
+    def exportScores(self, apiRequest):
+        """
+        Streams all scores saved by the game, or only scores of the user given with name 
+        argument of the query string, saved between optional since and until dates, the 
+        oldest first. Scores are sent as newline-delimited json or as csv, chosen with 
+        format argument. They are read from the storage in batches while they are sent, so
+        memory does not grow with the number of scores and the first batch is sent at once.
+        
+        Rsises CustomError.
+    
+        Parameters
+        ----------
+        apiRequest: ApiRequest
+            the request
+        
+        Returns
+        ApiResponse
+            the streamed scores
+    
+        """
+        exportFormat = apiRequest.args.get('format', 'ndjson')
+        if not exportFormat in EXPORT_FORMATS:
+            raise CustomError('Format has to be one of: '+', '.join(EXPORT_FORMATS))
+        name = apiRequest.args.get('name') or None
+        since = self.getDateArgument(apiRequest, 'since')
+        until = self.getDateArgument(apiRequest, 'until')
+        batches = self._gameInstance.iterateScores(name, since, until)
+        #the first batch is read before the response starts, so that problems can still be reported with the status code
+        try:
+            firstBatch = next(batches, [])
+        except Game.ScoreDataProblem:
+            raise CustomError("Problem with score data handling", status_code=500)
+        return ApiResponse(self.encodeScores(exportFormat, firstBatch, batches), headers={'Content-Type': EXPORT_FORMATS[exportFormat]})
+    
+    
+    
+    def encodeScores(self, exportFormat, firstBatch, batches):
+        """
+        Encodes batches of scores as chunks of the exported body. If reading scores fails 
+        after the response started, the problem is logged and the body ends early.
+    
+        Parameters
+        ----------
+        exportFormat: string
+            one of EXPORT_FORMATS
+        firstBatch: list(tuple(string, string, float))
+            the batch which was already read
+        batches: generator(list(tuple(string, string, float)))
+            the remaining batches
+        
+        Returns
+        generator(bytes)
+            one chunk for every batch
+    
+        """
+        if exportFormat == 'csv':
+            yield b'date,name,score\n'
+        batch = firstBatch
+        while len(batch) > 0:
+            if exportFormat == 'csv':
+                buffer = io.StringIO()
+                csv.writer(buffer, lineterminator='\n').writerows(batch)
+                yield buffer.getvalue().encode('utf8')
+            else:
+                yield ''.join(json.dumps({'date': date, 'name': name, 'score': score})+'\n' for date, name, score in batch).encode('utf8')
+            try:
+                batch = next(batches, [])
+            except Game.ScoreDataProblem as e:
+                Game.logger.error("Export of scores stopped: "+str(e), extra={'event': 'exportProblem'})
+                return
+    
+    
+    
+    def getMetrics(self, apiRequest):
+        """
+        Provides the metrics of the process in the text format of Prometheus.
+    
+        Parameters
+        ----------
+        apiRequest: ApiRequest
+            the request
+        
+        Returns
+        ApiResponse
+            the metrics as plain text
+    
+        """
+        return ApiResponse(Metrics.registry.render().encode('utf8'), headers={'Content-Type': Metrics.CONTENT_TYPE})
     
     
+    
+def timedHandler(path, handler):
+    """
+    Wraps a method of HangmanApi, so that the time and the status of every request
+    it handles are recorded in Metrics.registry, including CustomError statuses.
+    If request events are not sampled out completely, every request is logged as well.
+    For streamed responses the time until the response starts is recorded.
+
+    Parameters
+    ----------
+    path: string
+        path of the route
+    handler: callable(ApiRequest) -> ApiResponse
+        method of HangmanApi handling the request
+        
+    Returns
+    ----------
+    callable(ApiRequest) -> ApiResponse
+        the wrapped method
+    
+    """
+    def timed(apiRequest):
+        start = time.perf_counter()
+        status = 500
+        try:
+            apiResponse = handler(apiRequest)
+            status = apiResponse.status
+            return apiResponse
+        except CustomError as error:
+            status = error.status_code
+            raise
+        finally:
+            seconds = time.perf_counter()-start
+            Metrics.registry.observeRequest(path, status, seconds)
+            if Game.loggingHandler.sampleRate('request') > 0.0:
+                Game.logger.info("Request", extra={'event': 'request', 'fields': {'route': path, 'status': status, 'ms': seconds*1000.0}})
+    timed.__name__ = handler.__name__
+    return timed
+    
+    
+    
+def flaskView(handler):
+    """
+    Creates a flask view function which passes the request to a method of HangmanApi 
+    and sends its response as json.
+
+    Parameters
+    ----------
+    handler: callable(ApiRequest) -> ApiResponse
+        method of HangmanApi handling the request
+        
+    Returns
+    ----------
+    callable
+        the view function
+    
+    """
+    def view():
+        apiRequest = ApiRequest(request.args, request.get_data(), {name.lower(): value for name, value in request.headers.items()})
+        apiResponse = handler(apiRequest)
+        if isinstance(apiResponse.data, (bytes, collections.abc.Iterator)):
+            response = app.response_class(apiResponse.data)
+        elif apiResponse.data is not None:
+            response = jsonify(apiResponse.data)
+        else:
+            response = app.response_class()
+        response.status_code = apiResponse.status
+        response.headers.update(apiResponse.headers)
+        return response
+    view.__name__ = handler.__name__
+    return view
+
+
+
+#routes of the api: path, method of HangmanApi, http methods and whether the method 
+#may wait for the disk, which servers should not do in the thread handling requests
+ROUTES = \
+[
+ ('/hangman/api/endGame',              'endGame',              ['GET'],    False),
+ ('/hangman/api/startGame',            'startGame',            ['POST'],   False),
+ ('/hangman/api/gameState',            'getGameState',         ['GET'],    False),
+ ('/hangman/api/tryCharacter',         'tryCharacter',         ['PUT'],    False),
+ ('/hangman/api/tryCharacters',        'tryCharacters',        ['PUT'],    False),
+ ('/hangman/api/getScores',            'getScores',            ['GET'],    True),
+ ('/hangman/api/getTopScores',         'getTopScores',         ['GET'],    True),
+ ('/hangman/api/getUserStats',         'getUserStats',         ['GET'],    True),
+ ('/hangman/api/getScoresBetween',     'getScoresBetween',     ['GET'],    True),
+ ('/hangman/api/exportScores',         'exportScores',         ['GET'],    True),
+ ('/hangman/api/metrics',              'getMetrics',           ['GET'],    False),
+ ]
+
 #bind methods to flask requests
 InstanceOfApi = HangmanApi()
 
-app.add_url_rule('/hangman/api/endGame',      view_func=InstanceOfApi.endGame,      methods=['GET'])
-app.add_url_rule('/hangman/api/startGame',    view_func=InstanceOfApi.startGame,    methods=['POST'])
-app.add_url_rule('/hangman/api/gameState',    view_func=InstanceOfApi.getGameState, methods=['GET'])
-app.add_url_rule('/hangman/api/tryCharacter', view_func=InstanceOfApi.tryCharacter, methods=['PUT'])
-app.add_url_rule('/hangman/api/getScores',    view_func=InstanceOfApi.getScores,    methods=['GET'])
+#timed methods of the api by path, used by all servers
+HANDLERS = {path: timedHandler(path, getattr(InstanceOfApi, methodName)) for path, methodName, _, _ in ROUTES}
+
+Metrics.registry.setGauge(Metrics.ACTIVE_SESSIONS, lambda: len(InstanceOfApi._sessions))
+
+for path, _, httpMethods, _ in ROUTES:
+    app.add_url_rule(path, view_func=flaskView(HANDLERS[path]), methods=httpMethods)
 
 if __name__ == '__main__':
     
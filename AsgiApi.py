@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:10:26 2026
+
+@author: lukasz
+"""
+
+import json
+import asyncio
+import urllib.parse
+import collections.abc
+
+import Api
+import Game
+
+
+#routes of Api.ROUTES by path: http methods, timed method of HangmanApi and whether it may wait for the disk
+ROUTES = {path: (httpMethods, Api.HANDLERS[path], blocking) for path, _, httpMethods, blocking in Api.ROUTES}
+
+
+
+async def readBody(receive):
+    """
+    Reads the whole body of a http request.
+
+    Parameters
+    ----------
+    receive: callable
+        asgi receive channel of the request
+        
+    Returns
+    ----------
+    bytes
+        body of the request
+    
+    """
+    body = b''
+    moreBody = True
+    while moreBody:
+        message = await receive()
+        body += message.get('body', b'')
+        moreBody = message.get('more_body', False)
+    return body
+
+
+
+async def sendResponse(send, apiResponse):
+    """
+    Sends ApiResponse as json. Response without data is sent without body, bytes are sent as they are.
+    Chunks of a streamed body are produced in the default executor, since they may be read from 
+    the disk, and each of them is sent as soon as it is ready. Sending waits while the client is 
+    slower than the server, so chunks do not pile up in memory.
+
+    Parameters
+    ----------
+    send: callable
+        asgi send channel of the request
+    apiResponse: Api.ApiResponse
+        the response to send
+    
+    """
+    if isinstance(apiResponse.data, collections.abc.Iterator):
+        headers = [(name.lower().encode('latin1'), str(value).encode('latin1')) for name, value in apiResponse.headers.items()]
+        await send({'type': 'http.response.start', 'status': apiResponse.status, 'headers': headers})
+        loop = asyncio.get_running_loop()
+        while True:
+            chunk = await loop.run_in_executor(None, next, apiResponse.data, None)
+            if chunk is None:
+                break
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+    if apiResponse.data is None:
+        body = b''
+        headers = []
+    elif isinstance(apiResponse.data, bytes):
+        body = apiResponse.data
+        headers = [(b'content-length', str(len(body)).encode('latin1'))]
+    else:
+        body = json.dumps(apiResponse.data).encode('utf8')
+        headers = [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode('latin1'))]
+    headers += [(name.lower().encode('latin1'), str(value).encode('latin1')) for name, value in apiResponse.headers.items()]
+    await send({'type': 'http.response.start', 'status': apiResponse.status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+
+async def handleLifespan(receive, send):
+    """
+    Handles start and shutdown of the server. All queued scores are written at shutdown.
+
+    Parameters
+    ----------
+    receive: callable
+        asgi receive channel
+    send: callable
+        asgi send channel
+    
+    """
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await asyncio.get_running_loop().run_in_executor(None, Game.getScoreStore().flush)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+
+async def app(scope, receive, send):
+    """
+    Asgi application serving the same routes as the flask one. Game requests are
+    handled directly in the event loop since they never wait: scores of ended games are
+    only queued, so the storage must not block appending (Logs.OVERFLOW_BLOCK). Requests
+    which may read or write scores run in the default executor, so they do not stop other requests.
+
+    Parameters
+    ----------
+    scope: dict(string,...)
+        asgi connection scope
+    receive: callable
+        asgi receive channel
+    send: callable
+        asgi send channel
+    
+    """
+    if scope['type'] == 'lifespan':
+        await handleLifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+    body = await readBody(receive)
+    route = ROUTES.get(scope['path'])
+    if route is None:
+        await sendResponse(send, Api.ApiResponse({'message': "Not found"}, 404))
+        return
+    httpMethods, handler, blocking = route
+    if not scope['method'] in httpMethods:
+        await sendResponse(send, Api.ApiResponse({'message': "Method not allowed"}, 405, {'Allow': ', '.join(httpMethods)}))
+        return
+    args = dict(urllib.parse.parse_qsl(scope['query_string'].decode('latin1')))
+    headers = {name.decode('latin1').lower(): value.decode('latin1') for name, value in scope['headers']}
+    apiRequest = Api.ApiRequest(args, body, headers)
+    try:
+        if blocking:
+            apiResponse = await asyncio.get_running_loop().run_in_executor(None, handler, apiRequest)
+        else:
+            apiResponse = handler(apiRequest)
+    except Api.CustomError as error:
+        apiResponse = Api.ApiResponse(error.toDict(), error.status_code)
+    except Exception as e:
+        Game.logger.exception("Unhandled exception in "+scope['path']+": "+str(e), extra={'event': 'unhandledException', 'fields': {'route': scope['path']}})
+        apiResponse = Api.ApiResponse({'message': "Internal server error"}, 500)
+    await sendResponse(send, apiResponse)
+
+
+
+def serve(host, port):
+    """
+    Serves the asgi application with uvicorn in one process. Games live in the memory
+    of the process which started them, so the application is never served by more
+    than one worker.
+
+    Parameters
+    ----------
+    host: string
+        address to bind
+    port: int
+        port to bind
+    
+    """
+    import uvicorn
+    
+    config = uvicorn.Config(app, host=host, port=port, lifespan='on', log_level='warning')
+    uvicorn.Server(config).run()
+
+
+if __name__ == '__main__':
+    
+    serve('127.0.0.1', 5000)
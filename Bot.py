@@ -7,9 +7,22 @@ Created on Fri May  3 13:06:15 2019
 """
 
 import urllib.parse
-import urllib.request
+import http.client
+import itertools
+import argparse
+import queue
+import time
 import json
 
+import Solver
+import OpeningBook
+
+#words the bot expects the server to choose from, the same as Game.DEFAULT_WORDS
+DEFAULT_WORDS = ["3dhubs", "marvin", "print", "filament", "order", "layer"]
+
+#fields of the game's state sent by the server
+STATE_FIELDS = ['attemptsLeft', 'currentGuess', 'gameActive', 'score', 'userGuessed', 'userName']
+
 
 class MissingJsonData(Exception):
     """
@@ -32,6 +45,19 @@ class WrongJsonData(Exception):
         
     
     
+class ResponseError(Exception):
+    """
+    Excetipn raised when the server answered with an error status.
+
+    """
+    
+    def __init__(self, status, message):
+        super(ResponseError, self).__init__(str(status)+" "+str(message))
+        self.status = status
+        self.message = message
+        
+        
+    
 class RequestError(Exception):
     """
     Excetipn raised when any problem with https request occured. It provides additional
@@ -97,221 +123,894 @@ def checkData(jsonDict, requiredFields):
 
 
 
-def getState():
+class GameClient:
     """
-    Asks the game server for the data describing the state of the game. Validates 
-    the answer and returns the requested data.
+    Base class for all clients of the game. Bots play through its methods only, so 
+    the same bot can play via the web api or with games kept in its own process.
     
-    Rsises RequestError.
+    Every problem is reported with RequestError, whose originalException is 
+    ResponseError with the status the web api would answer with.
 
-    Parameters
-    ----------
+    """
+    
+    def __enter__(self):
+        return self
+    
+    
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
         
-    Returns
-    ----------
-    josn
-        json with the data describing the state of the game
+        
+        
+    def close(self):
+        """
+        Frees resources held by the client. The client can still be used afterwards.
     
-    """  
-    dataJson = None
-    url = 'http://localhost:5000/hangman/api/gameState'    
-    req = urllib.request.Request(url, method = 'GET')
-    try:
-        with urllib.request.urlopen(req) as response:
-           if not checkForJson(response.info()):
-               raise MissingJsonData
-           data = response.read()
-           dataJson = json.loads(data)
-           if not checkData(dataJson, ['attemptsLeft', 'currentGuess', 'gameActive', 'score', 'userGuessed', 'userName']):
-               raise WrongJsonData
-    except (urllib.error.URLError, WrongJsonData, MissingJsonData)  as e:
-        raise RequestError(e,req.get_full_url(),req.get_method(),req.data)
-    return dataJson
-   
-    
-
-def startGame(name):
-    """
-    Starts the game and sends user's name to the server. Validates 
-    the answer and returns server's message.
+        Parameters
+        ----------
     
-    Rsises RequestError.
-
-    Parameters
-    ----------
-    name: string
-        users name
+        """
+        pass
+    
+    
+    
+    def getState(self, gameId):
+        """
+        Provides the data describing the state of the game.
         
-    Returns
-    ----------
-    string
-        server's message
-    
-    """    
-    url = 'http://localhost:5000/hangman/api/startGame'
-    data = {"name":name}
-    dataBytes = bytes(json.dumps(data), encoding='utf8')
-    req = urllib.request.Request(url, method = 'POST', data=dataBytes, headers={'Content-Type': 'application/json'})
-    try:
-        with urllib.request.urlopen(req) as response:
-           if not checkForJson(response.info()):
-               raise MissingJsonData
-           data = response.read()
-           dataJson = json.loads(data)
-           if not checkData(dataJson, ['message']):
-               raise WrongJsonData
-    except (urllib.error.URLError, WrongJsonData, MissingJsonData) as e:
-        raise RequestError(e,req.get_full_url(),req.get_method(),req.data)
-    return dataJson['message']
-   
-    
-
-def makeAGuess(character):
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+            
+        Returns
+        ----------
+        josn
+            json with the data describing the state of the game
+        
+        """
+        raise NotImplementedError
+    
+    
+    
+    def startGame(self, name, gameId=None, length=None, difficulty=None):
+        """
+        Starts the game of the user.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        name: string
+            users name
+        gameId: string
+            id of the game to restart, a new game is created if None
+        length: int
+            length of the word to guess, any if None
+        difficulty: string
+            difficulty of the word to guess, any if None
+            
+        Returns
+        ----------
+        tuple(string, string, json)
+            message, id of the game and json with the data describing the state of the started game
+        
+        """
+        raise NotImplementedError
+    
+    
+    
+    def makeAGuess(self, gameId, character):
+        """
+        Evaluates a character guess.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+        character: string
+            a guess which needs to be evaluated by the game
+            
+        Returns
+        ----------
+        bool
+            True if the guess was correct
+        
+        """
+        raise NotImplementedError
+    
+    
+    
+    def makeGuesses(self, gameId, characters):
+        """
+        Evaluates an ordered list of character guesses until the game ends.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+        characters: list(string)
+            guesses which need to be evaluated by the game
+            
+        Returns
+        ----------
+        tuple(list(bool), json)
+            True for every correct guess used by the game and json with the data describing the state of the game
+        
+        """
+        raise NotImplementedError
+    
+    
+    
+    def endGame(self, gameId):
+        """
+        Ends the game.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+            
+        Returns
+        ----------
+        string
+            message
+        
+        """
+        raise NotImplementedError
+
+
+
+class HangmanClient(GameClient):
     """
-    Sends a character guess to the game server. Validates 
-    the answer and returns the result.
+    Client of the game's web api. Inherits from GameClient. Connections to the server are kept alive and 
+    reused by the following requests, so the time of a request is mostly the time 
+    of the server's work. The client can be shared by many threads; each request 
+    takes a connection from the pool and gives it back when the answer is read.
     
-    Rsises RequestError.
+    Failed requests are repeated with growing pauses. Requests which change the game
+    (startGame, makeAGuess, makeGuesses) are repeated only if they surely did not 
+    reach the server, i.e. the connection was refused or a kept alive connection 
+    turned out to be closed by the server, so no guess is ever counted twice.
+    
+    The client remembers the last state of every game it knows, so getState asks
+    the server with If-None-Match and the unchanged state is not sent again.
 
-    Parameters
-    ----------
-    character: string
-        a guess which needs to be evaluated by the game
+    """
+    
+    def __init__(self, baseUrl='http://localhost:5000', poolSize=4, timeout=5.0, retries=3, backoff=0.1, recorder=None):
+        """
+        Constructor of HangmanClient. Does not connect to the server yet.
+    
+        Parameters
+        ----------
+        baseUrl: string
+            scheme, host and port of the server, e.g. http://localhost:5000
+        poolSize: int
+            maximal number of idle connections kept open
+        timeout: float
+            seconds after which connecting or waiting for an answer fails
+        retries: int
+            number of times a failed request is repeated
+        backoff: float
+            seconds of the pause before the first repetition, doubled by every next one
+        recorder: callable(string, float, bool)
+            called after every request with the path of the route, seconds it took
+            including repetitions and True if it failed, nothing is recorded if None
+    
+        """
+        url = urllib.parse.urlsplit(baseUrl)
+        if not url.scheme in ('http', 'https') or not url.hostname:
+            raise ValueError("Unsupported base url: "+str(baseUrl))
+        self.__baseUrl          = baseUrl.rstrip('/')
+        self.__connectionClass  = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        self.__host             = url.hostname
+        self.__port             = url.port
+        self.__prefix           = url.path.rstrip('/')
+        self.__timeout          = timeout
+        self.__retries          = retries
+        self.__backoff          = backoff
+        self.__pool             = queue.LifoQueue(maxsize=poolSize)
+        self.__states           = dict()
+        self.__recorder         = recorder
         
-    Returns
-    ----------
-    bool
-        True if the guess was correct
+        
+        
+    @property
+    def baseUrl(self):
+        return self.__baseUrl
     
-    """
-    url = 'http://localhost:5000/hangman/api/tryCharacter'
-    data = {"character":character}
-    dataBytes = bytes(json.dumps(data), encoding='utf8')
-    req = urllib.request.Request(url, method = 'PUT', data=dataBytes, headers={'Content-Type': 'application/json'})
-    try:
-        with urllib.request.urlopen(req) as response:
-           if not checkForJson(response.info()):
-               raise MissingJsonData
-           data = response.read()
-           dataJson = json.loads(data)
-           if not checkData(dataJson, ['successfullAttempt']):
-               raise WrongJsonData
-    except (urllib.error.URLError, WrongJsonData, MissingJsonData) as e:
-        raise RequestError(e,req.get_full_url(),req.get_method(),req.data)
-    return dataJson['successfullAttempt']
+    
+    
+    def close(self):
+        """
+        Closes all idle connections. The client can still be used afterwards.
+    
+        Parameters
+        ----------
+    
+        """
+        while True:
+            try:
+                self.__pool.get_nowait().close()
+            except queue.Empty:
+                return
+            
+            
+            
+    def __acquire(self):
+        """
+        Provides an idle connection from the pool or a new one if the pool is empty.
+    
+        Parameters
+        ----------
+        
+        Returns
+        ----------
+        tuple(http.client.HTTPConnection, bool)
+            the connection and True if it was used before
+    
+        """
+        try:
+            return self.__pool.get_nowait(), True
+        except queue.Empty:
+            return self.__connectionClass(self.__host, self.__port, timeout=self.__timeout), False
+        
+        
+        
+    def __release(self, connection):
+        """
+        Gives a connection back to the pool. It is closed if the pool is full.
+    
+        Parameters
+        ----------
+        connection: http.client.HTTPConnection
+            connection with the whole answer read
+    
+        """
+        try:
+            self.__pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+            
+            
+            
+    def __request(self, method, path, requiredFields, args=None, data=None, headers=None):
+        """
+        Sends a request to the server with __exchange and passes its time to the recorder.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        method: string
+            http method
+        path: string
+            path of the api's route
+        requiredFields: list(string)
+            fields which have to be found in the json answer
+        args: dict(string, string)
+            arguments of the query string
+        data: dict(string,...)
+            json data of the request
+        headers: dict(string, string)
+            additional headers of the request
+            
+        Returns
+        ----------
+        tuple(int, http.client.HTTPMessage, json)
+            status, headers and json data of the answer, the data is None if the status is 304
+    
+        """
+        if self.__recorder is None:
+            return self.__exchange(method, path, requiredFields, args, data, headers)
+        start = time.perf_counter()
+        try:
+            answer = self.__exchange(method, path, requiredFields, args, data, headers)
+        except RequestError:
+            self.__recorder(path, time.perf_counter()-start, True)
+            raise
+        self.__recorder(path, time.perf_counter()-start, False)
+        return answer
+    
+    
+    
+    def __exchange(self, method, path, requiredFields, args=None, data=None, headers=None):
+        """
+        Sends a request to the server, repeating it if it fails. Validates the answer.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        method: string
+            http method
+        path: string
+            path of the api's route
+        requiredFields: list(string)
+            fields which have to be found in the json answer
+        args: dict(string, string)
+            arguments of the query string
+        data: dict(string,...)
+            json data of the request
+        headers: dict(string, string)
+            additional headers of the request
+            
+        Returns
+        ----------
+        tuple(int, http.client.HTTPMessage, json)
+            status, headers and json data of the answer, the data is None if the status is 304
+    
+        """
+        url = self.__prefix + path
+        if args is not None:
+            url += '?' + urllib.parse.urlencode(args)
+        body = None
+        requestHeaders = dict() if headers is None else dict(headers)
+        if data is not None:
+            body = bytes(json.dumps(data), encoding='utf8')
+            requestHeaders['Content-Type'] = 'application/json'
+        idempotent = method == 'GET'
+        attempt = 0
+        while True:
+            connection, reused = self.__acquire()
+            try:
+                connection.request(method, url, body=body, headers=requestHeaders)
+                response = connection.getresponse()
+                responseBody = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                notSent = isinstance(e, ConnectionRefusedError) or (reused and isinstance(e, (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)))
+                if attempt < self.__retries and (idempotent or notSent):
+                    #a closed kept alive connection is not a problem of the server, so it is replaced at once
+                    if not (reused and notSent):
+                        time.sleep(self.__backoff*2**attempt)
+                        attempt += 1
+                    continue
+                raise RequestError(e, self.__baseUrl+url, method, body)
+            if response.will_close:
+                connection.close()
+            else:
+                self.__release(connection)
+            if response.status in (502, 503, 504) and idempotent and attempt < self.__retries:
+                time.sleep(self.__backoff*2**attempt)
+                attempt += 1
+                continue
+            break
+        try:
+            if response.status == 304:
+                return response.status, response.msg, None
+            if response.status >= 400:
+                raise ResponseError(response.status, json.loads(responseBody).get('message') if checkForJson(response.msg) else responseBody.decode('utf8', 'replace'))
+            if not checkForJson(response.msg):
+                raise MissingJsonData
+            dataJson = json.loads(responseBody)
+            if not checkData(dataJson, requiredFields):
+                raise WrongJsonData
+        except (ValueError, WrongJsonData, MissingJsonData, ResponseError) as e:
+            raise RequestError(e, self.__baseUrl+url, method, body)
+        return response.status, response.msg, dataJson
+    
+    
+    
+    def getState(self, gameId):
+        """
+        Asks the game server for the data describing the state of the game. Validates 
+        the answer and returns the requested data. If the client knows the state 
+        already, the server is asked to send it only if it changed.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        gameId: string
+            id of the game given by the server
+            
+        Returns
+        ----------
+        josn
+            json with the data describing the state of the game
+        
+        """
+        headers = dict()
+        known = self.__states.get(gameId)
+        if known is not None:
+            headers['If-None-Match'] = known[0]
+        status, responseHeaders, dataJson = self.__request('GET', '/hangman/api/gameState', STATE_FIELDS, args={'gameId': gameId}, headers=headers)
+        if status == 304 and known is not None:
+            return known[1]
+        self.__remember(gameId, responseHeaders, dataJson)
+        return dataJson
+    
+    
+    
+    def startGame(self, name, gameId=None, length=None, difficulty=None):
+        """
+        Starts the game and sends user's name to the server. Validates 
+        the answer and returns server's message with the id and the state of the game,
+        which the server sends in the same answer.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        name: string
+            users name
+        gameId: string
+            id of the game to restart, a new game is created if None
+        length: int
+            length of the word to guess, any if None
+        difficulty: string
+            difficulty of the word to guess, any if None
+            
+        Returns
+        ----------
+        tuple(string, string, json)
+            server's message, id of the game and json with the data describing the state of the started game
+        
+        """
+        data = {"name":name, "includeState":True}
+        for field, value in (("gameId", gameId), ("length", length), ("difficulty", difficulty)):
+            if value is not None:
+                data[field] = value
+        _, headers, dataJson = self.__request('POST', '/hangman/api/startGame', ['message', 'gameId', 'state'], data=data)
+        self.__remember(dataJson['gameId'], headers, dataJson['state'])
+        return dataJson['message'], dataJson['gameId'], dataJson['state']
+    
+    
+    
+    def makeAGuess(self, gameId, character):
+        """
+        Sends a character guess to the game server. Validates 
+        the answer and returns the result.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        gameId: string
+            id of the game given by the server
+        character: string
+            a guess which needs to be evaluated by the game
+            
+        Returns
+        ----------
+        bool
+            True if the guess was correct
+        
+        """
+        data = {"gameId":gameId, "character":character, "includeState":True}
+        _, headers, dataJson = self.__request('PUT', '/hangman/api/tryCharacter', ['successfullAttempt', 'state'], data=data)
+        self.__remember(gameId, headers, dataJson['state'])
+        return dataJson['successfullAttempt']
+    
+    
+    
+    def makeGuesses(self, gameId, characters):
+        """
+        Sends an ordered list of character guesses to the game server, which uses them 
+        until the game ends. Validates the answer and returns the results together with 
+        the final state of the game.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        gameId: string
+            id of the game given by the server
+        characters: list(string)
+            guesses which need to be evaluated by the game
+            
+        Returns
+        ----------
+        tuple(list(bool), json)
+            True for every correct guess used by the game and json with the data describing the state of the game
+        
+        """
+        data = {"gameId":gameId, "characters":list(characters)}
+        _, headers, dataJson = self.__request('PUT', '/hangman/api/tryCharacters', ['results', 'state'], data=data)
+        self.__remember(gameId, headers, dataJson['state'])
+        return [result['successfullAttempt'] for result in dataJson['results']], dataJson['state']
+    
+    
+    
+    def endGame(self, gameId):
+        """
+        Ends the game. Validates the answer and returns server's message.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        gameId: string
+            id of the game given by the server
+            
+        Returns
+        ----------
+        string
+            server's message
+        
+        """
+        self.__states.pop(gameId, None)
+        _, _, dataJson = self.__request('GET', '/hangman/api/endGame', ['message'], args={'gameId': gameId})
+        return dataJson['message']
+    
+    
+    
+    def __remember(self, gameId, headers, state):
+        """
+        Keeps the state of the game with its entity tag for the following getState.
+    
+        Parameters
+        ----------
+        gameId: string
+            id of the game given by the server
+        headers: http.client.HTTPMessage
+            headers of the answer holding the state
+        state: json
+            the state of the game
+    
+        """
+        eTag = headers.get('ETag')
+        if eTag is not None and checkData(state, STATE_FIELDS):
+            self.__states[gameId] = (eTag, state)
+        else:
+            self.__states.pop(gameId, None)
 
 
 
-def endGame():
+class LocalClient(GameClient):
     """
-    Ends the game. Validates the answer and returns server's message.
+    Client playing games of Game.Core kept in the current process. Inherits from GameClient.
+    It answers like the web api, with the same states and errors, but nothing is serialized
+    or sent, so simulations can play many more games. Used to check the bots, HangmanClient
+    is still needed to check the server.
     
-    Rsises RequestError.
+    Many threads can share the client as long as every game is played by one thread.
 
-    Parameters
-    ----------
+    """
+    
+    def __init__(self, wordDictionary=None, recordScores=True):
+        """
+        Constructor of LocalClient.
+    
+        Parameters
+        ----------
+        wordDictionary: Dictionary.WordDictionary
+            words to guess, the dictionary shared by all games of the process if None
+        recordScores: bool
+            if False then scores of finished games are not saved
+    
+        """
+        #imported here so that clients of the web api do not load the game and its logs
+        import Game
+        self.__createGame   = lambda: Game.Core(wordDictionary, recordScores=recordScores)
+        self.__games        = dict()
+        self.__nextId       = itertools.count(1)
         
-    Returns
-    ----------
-    string
-        server's message
+        
+        
+    def __game(self, gameId, method, path, data):
+        """
+        Provides the game with the given id.
+        
+        Rsises RequestError.
     
-    """    
-    url = 'http://localhost:5000/hangman/api/endGame'
-    req = urllib.request.Request(url, method = 'GET')
-    try:
-        with urllib.request.urlopen(req) as response:
-           if not checkForJson(response.info()):
-               raise MissingJsonData
-           data = response.read()
-           dataJson = json.loads(data)
-           if not checkData(dataJson, ['message']):
-               raise WrongJsonData
-    except (urllib.error.URLError, WrongJsonData, MissingJsonData) as e:
-        raise RequestError(e,req.get_full_url(),req.get_method(),req.data)
-    return dataJson['message']
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+        method: string
+            http method of the corresponding api's route
+        path: string
+            path of the corresponding api's route
+        data: dict(string,...)
+            data of the request
+            
+        Returns
+        ----------
+        Game.Core
+            the game
+    
+        """
+        gameInstance = self.__games.get(gameId)
+        if gameInstance is None:
+            raise RequestError(ResponseError(404, 'Game not found. (Re)start'), path, method, data)
+        return gameInstance
+    
+    
+    
+    def __describe(self, gameInstance):
+        """
+        Creates the same dict of the game's state as the web api.
+    
+        Parameters
+        ----------
+        gameInstance: Game.Core
+            the game to describe
+            
+        Returns
+        ----------
+        json
+            json with the data describing the state of the game
+    
+        """
+        return {'currentGuess': gameInstance.currentGuess, 'attemptsLeft': gameInstance.attemptsLeft,
+                'gameActive': gameInstance.active, 'userGuessed': gameInstance.userGuesssed,
+                'userName': gameInstance.userName, 'score': gameInstance.score, 'version': gameInstance.version}
+    
+    
+    
+    def getState(self, gameId):
+        """
+        Provides the data describing the state of the game.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+            
+        Returns
+        ----------
+        josn
+            json with the data describing the state of the game
+        
+        """
+        return self.__describe(self.__game(gameId, 'GET', '/hangman/api/gameState', {'gameId': gameId}))
+    
+    
+    
+    def startGame(self, name, gameId=None, length=None, difficulty=None):
+        """
+        Starts the game of the user. A new game is created if gameId is None.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        name: string
+            users name
+        gameId: string
+            id of the game to restart, a new game is created if None
+        length: int
+            length of the word to guess, any if None
+        difficulty: string
+            difficulty of the word to guess, any if None
+            
+        Returns
+        ----------
+        tuple(string, string, json)
+            message, id of the game and json with the data describing the state of the started game
+        
+        """
+        data = {'name': name, 'gameId': gameId, 'length': length, 'difficulty': difficulty}
+        if gameId is None:
+            gameInstance = self.__createGame()
+        else:
+            gameInstance = self.__game(gameId, 'POST', '/hangman/api/startGame', data)
+        try:
+            gameInstance.start(name, length, difficulty)
+        except ValueError as e:
+            raise RequestError(ResponseError(400, str(e)), '/hangman/api/startGame', 'POST', data)
+        if gameId is None:
+            gameId = str(next(self.__nextId))
+            self.__games[gameId] = gameInstance
+        return "Game started", gameId, self.__describe(gameInstance)
+    
+    
+    
+    def makeAGuess(self, gameId, character):
+        """
+        Evaluates a character guess.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+        character: string
+            a guess which needs to be evaluated by the game
+            
+        Returns
+        ----------
+        bool
+            True if the guess was correct
+        
+        """
+        data = {'gameId': gameId, 'character': character}
+        gameInstance = self.__game(gameId, 'PUT', '/hangman/api/tryCharacter', data)
+        if not gameInstance.active:
+            raise RequestError(ResponseError(412, 'Game is not active. (Re)start'), '/hangman/api/tryCharacter', 'PUT', data)
+        return gameInstance.handleNewCharacter(character)
+    
+    
+    
+    def makeGuesses(self, gameId, characters):
+        """
+        Evaluates an ordered list of character guesses until the game ends.
+        Characters given after the end of the game are ignored.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+        characters: list(string)
+            guesses which need to be evaluated by the game
+            
+        Returns
+        ----------
+        tuple(list(bool), json)
+            True for every correct guess used by the game and json with the data describing the state of the game
+        
+        """
+        data = {'gameId': gameId, 'characters': list(characters)}
+        gameInstance = self.__game(gameId, 'PUT', '/hangman/api/tryCharacters', data)
+        if not gameInstance.active:
+            raise RequestError(ResponseError(412, 'Game is not active. (Re)start'), '/hangman/api/tryCharacters', 'PUT', data)
+        results = []
+        for character in characters:
+            if not gameInstance.active:
+                break
+            results.append(gameInstance.handleNewCharacter(character))
+        return results, self.__describe(gameInstance)
+    
+    
+    
+    def endGame(self, gameId):
+        """
+        Ends the game and forgets it.
+        
+        Rsises RequestError.
+    
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+            
+        Returns
+        ----------
+        string
+            message
+        
+        """
+        self.__game(gameId, 'GET', '/hangman/api/endGame', {'gameId': gameId}).end()
+        self.__games.pop(gameId, None)
+        return "Game ended"
 
 
 
-def getSortedCharacters(possibleWords):
+def playGame(client, name, wordIndex, verbose=False):
     """
-    Provides a list of characters which can be found in the possible words.
-    List is soted such that the most frequent characters are in the front.
+    Plays one game via the client and ends it.
+    
+    Every guess is chosen by Solver.Solver: the character which splits the words 
+    still matching the game into the most even groups by the positions it would reveal.
+    After the guess only the words which have the character exactly at the revealed
+    positions are kept.
+    
+    Repeat all the procedure untill game is active.
+    
+    Once only one word is left, all its remaining characters are sent in one batch.
+    
+    Rsises RequestError. A game which fails after it was started is ended, if the server lets it.
 
     Parameters
     ----------
-    possibleWords: list(string)
-        a list with the words which can be a solution to the game
+    client: GameClient
+        client of the game, HangmanClient or LocalClient
+    name: string
+        the name of the bot
+    wordIndex: Solver.WordIndex
+        words which can be a solution to the game
+    verbose: bool
+        if True then the solution process is printed
         
     Returns
     ----------
-    list(string)
-        a sorted list of characters which can be found in the possible words
-    
-    """ 
-    charactersFrequencies = dict()
-    for word in possibleWords:
-        for c in word:
-            if not c in charactersFrequencies:
-                charactersFrequencies[c] = 1
-            else:
-                charactersFrequencies[c] += 1
-    return list(dict(sorted(charactersFrequencies.items(), key = lambda kv:(kv[1], kv[0]), reverse=True)).keys())
+    json
+        json with the data describing the final state of the game
+    
+    """
+    #the state of the new game comes with the answer, so it is not asked for separately
+    message, gameId, state = client.startGame(name)
+    if verbose:
+        print(message, gameId)
+    
+    try:
+        solver = Solver.Solver(wordIndex, len(state['currentGuess']))
+        while state['gameActive']:
+            guesses = solver.remainingCharacters()
+            if len(guesses) == 0:
+                guesses = [solver.chooseGuess()]
+            if verbose:
+                print("\n***************************************")
+                print("Possible words     : ", solver.numberOfCandidates)
+            
+            results, state = client.makeGuesses(gameId, guesses)
+            for guess, guessed in zip(guesses, results):
+                solver.update(guess, state['currentGuess'])
+                if verbose:
+                    print()
+                    print("Character attempted: " ,guess)
+                    print("Result             : " ,guessed)
+            if verbose:
+                print()
+                print("New list of words  : ", solver.candidates[:10])
+                print(state['currentGuess'])
+    except RequestError:
+        #the game would stay on the server until it expires, so it is ended if the server still answers
+        try:
+            client.endGame(gameId)
+        except RequestError:
+            pass
+        raise
+    message = client.endGame(gameId)
+    if verbose:
+        print(message)
+    return state
+
 
 
 if __name__ == '__main__':
     
-    possibleWords = ["3dhubs", "marvin", "print", "filament", "order", "layer"] 
-    attemptedLetters = list()
+    parser = argparse.ArgumentParser(description='Bot playing Hangman via web API')
+    
+    parser.add_argument('--url', default='http://localhost:5000',
+                        help='base url of the game server')
     
-    #Solve the game by guessing with the most frequent character in the list of the words which 
-    #can be a solution of the game. If such a character exists in all the words then use the next most frequent one.
-    #This provides some sort of the maximized expected gain.
+    parser.add_argument('--local', action='store_true',
+                        help='play games kept in the bot\'s own process instead of a server. The words to guess are the ones given with --words')
     
-    #If guessed character was proper, remove all entries from the list of possible words which do not have it 
-    #If guessed character was not proper, remove all entries from the list of possible words which have it
+    parser.add_argument('--timeout', type=float, default=5.0,
+                        help='seconds after which a request to the server fails')
     
-    #Repeat all the procedure untill game is active.
+    parser.add_argument('--retries', type=int, default=3,
+                        help='number of times a failed request is repeated')
+    
+    parser.add_argument('-w', '--words',
+                        help='file with the words the server chooses from, one per line. The default words of the game if not given')
+    
+    parser.add_argument('-b', '--book',
+                        help='opening book built for the words with OpeningBook.py')
+    
+    args = parser.parse_args()
+    
+    words = DEFAULT_WORDS
+    if args.words is not None:
+        words = Solver.readWords(args.words)
+    wordIndex = Solver.WordIndex(words)
+    if args.book is not None:
+        wordIndex.useOpeningBook(OpeningBook.OpeningBook.load(args.book))
+    
+    if args.local:
+        import Dictionary
+        client = LocalClient(Dictionary.WordDictionary(words), recordScores=False)
+    else:
+        client = HangmanClient(args.url, timeout=args.timeout, retries=args.retries)
     
     try:
-        print(startGame("Bot")) 
-        
-        active = getState()['gameActive']
-        while active:
-            print("\n***************************************")
-            sortedCharacters = getSortedCharacters(possibleWords)
-            sortedCharacters = [character for character in sortedCharacters if not character in attemptedLetters]
-            print("Possible characters: ", sortedCharacters)
-            
-            guess = None
-            for character in sortedCharacters:
-                if not all( character in word for word in possibleWords):
-                    guess = character
-                    break
-            if guess is None:
-                guess = sortedCharacters[0]
-                
-            attemptedLetters.append(guess)
-            guessed = makeAGuess(guess)
-            if guessed:
-                possibleWords = [ word for word in possibleWords if guess in word ]
-            else:
-                possibleWords = [ word for word in possibleWords if not guess in word]
-            print()
-            print("Character attempted: " ,guess)
-            print("Result             : " ,guessed)
-            print()
-            print("New list of words  : ", possibleWords)
-            state = getState()
-            print(state['currentGuess'])
-            active = state['gameActive']
-        finalState = getState()
+        finalState = playGame(client, "Bot", wordIndex, verbose=True)
         if finalState['userGuessed']:
             print("Bot won!!")
         else:
             print("Bot lost :(")
         print("Bot's score: ",finalState['score'])
-        print(endGame())
         
     except RequestError as e:
-        print(e)
\ No newline at end of file
+        print(e)
+    finally:
+        client.close()
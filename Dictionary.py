@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:20:48 2026
+
+@author: lukasz
+"""
+
+import os
+import sys
+import mmap
+import array
+import struct
+import hashlib
+import bisect
+import random
+import itertools
+import collections
+
+
+#Characters which can be used in words. Each of them has its own bit in masks of letters.
+ALPHABET        = 'abcdefghijklmnopqrstuvwxyz0123456789'
+LETTER_BITS     = {character: 1 << idx for idx, character in enumerate(ALPHABET)}
+MAX_WORD_LENGTH = 255
+
+#Words of every length are split into equal parts of increasing difficulty.
+DIFFICULTIES    = ('easy', 'medium', 'hard')
+
+#Binary format of the dictionary, all numbers are little-endian:
+#   header          magic, version, number of words, number of lengths, size of the words' buffer
+#   offsets         uint32 * (number of words + 1)
+#   masks           uint64 * number of words
+#   idsByLength     uint32 * number of words
+#   lengthTable     uint32 * 3 * number of lengths, (length, start, end) of every range of idsByLength
+#   letterCounts    uint32 * len(ALPHABET), number of words containing every character
+#   buffer, sortedLetters, sortedPositions  bytes * size of the words' buffer
+#Every section starts at a multiple of 8 bytes, so it can be used in place as an array.
+BINARY_MAGIC    = b'HANGDICT'
+BINARY_VERSION  = 1
+BINARY_HEADER   = struct.Struct('<8sIIIQ')
+
+
+class WordDictionary:
+    """
+    Read-only collection of words to guess, shared by all games.
+    Words are identified by their index. All of them are packed into one buffer
+    with offsets, so big dictionaries take little memory. For every word the
+    dictionary keeps the mask of its letters and its positions sorted by letters,
+    so positions of any letter are found without scanning the word.
+
+    """
+
+    def __init__(self, words):
+        """
+        Constructor of WordDictionary. Words are lowercased; repeated ones and
+        the ones with characters out of ALPHABET are skipped.
+
+        Parameters
+        ----------
+        words: iterable(string)
+            words to guess
+
+        """
+        alphabet    = set(ALPHABET)
+        words       = list(dict.fromkeys(word for word in (word.strip().lower() for word in words)
+                                         if 0 < len(word) <= MAX_WORD_LENGTH and set(word) <= alphabet))
+
+        buffer          = bytearray()
+        sortedLetters   = bytearray()
+        sortedPositions = bytearray()
+        offsets         = array.array('I', [0])
+        masks           = array.array('Q')
+        for word in words:
+            encoded = word.encode('ascii')
+            buffer          += encoded
+            sortedLetters   += bytes(sorted(encoded))
+            #sorting is stable, so positions of the same letter stay in increasing order
+            sortedPositions += bytes(sorted(range(len(encoded)), key=encoded.__getitem__))
+            offsets.append(len(buffer))
+            masks.append(sum(map(LETTER_BITS.__getitem__, set(word))))
+        #a word is the harder, the less likely its letters are to be guessed, that is the less words contain them
+        letterCounts    = collections.Counter(itertools.chain.from_iterable(map(set, words)))
+        ease            = [sum(map(letterCounts.__getitem__, set(word))) for word in words]
+        self._setBuffers(bytes(buffer), offsets, bytes(sortedLetters), bytes(sortedPositions), masks,
+                         *self.__createLengthIndex(offsets, ease),
+                         array.array('I', (letterCounts[character] for character in ALPHABET)))
+
+
+
+    def _setBuffers(self, buffer, offsets, sortedLetters, sortedPositions, masks, idsByLength, lengthRanges, letterCounts):
+        """
+        Sets all the data of the dictionary.
+
+        Parameters
+        ----------
+        buffer: bytes-like
+            all words, one after another
+        offsets: sequence(int)
+            start of every word in buffer followed by the length of buffer
+        sortedLetters: bytes-like
+            letters of every word sorted, placed like the words in buffer
+        sortedPositions: bytes-like
+            positions of the letters from sortedLetters within their words
+        masks: sequence(int)
+            bits of LETTER_BITS of every word's letters
+        idsByLength: sequence(int)
+            ids of words sorted by length and then by difficulty
+        lengthRanges: dict(int, tuple(int, int))
+            range of idsByLength holding words of the given length
+        letterCounts: sequence(int)
+            number of words containing every character of ALPHABET
+
+        """
+        self._buffer            = buffer
+        self._offsets           = offsets
+        self._sortedLetters     = sortedLetters
+        self._sortedPositions   = sortedPositions
+        self._masks             = masks
+        self._idsByLength       = idsByLength
+        self._lengthRanges      = lengthRanges
+        self._letterCounts      = letterCounts
+        self._fingerprint       = None
+
+
+
+    @staticmethod
+    def __createLengthIndex(offsets, ease):
+        """
+        Sorts word ids by length and difficulty.
+
+        Parameters
+        ----------
+        offsets: sequence(int)
+            start of every word in the buffer followed by the length of the buffer
+        ease: list(int)
+            the bigger the value, the easier the word of the same index
+
+        Returns
+        ----------
+        tuple(array.array, dict(int, tuple(int, int)))
+            ids sorted by length and difficulty and range of the ids for every length
+        """
+        ids             = sorted(range(len(ease)), key=lambda wordId: (offsets[wordId+1]-offsets[wordId], -ease[wordId], wordId))
+        lengthRanges    = dict()
+        for position, wordId in enumerate(ids):
+            length = offsets[wordId+1]-offsets[wordId]
+            start, _ = lengthRanges.get(length, (position, position))
+            lengthRanges[length] = (start, position+1)
+        return array.array('I', ids), lengthRanges
+
+
+
+    @classmethod
+    def fromFile(cls, path):
+        """
+        Loads a dictionary from a text file with one word per line.
+
+        Parameters
+        ----------
+        path: string
+            path to the file
+
+        Returns
+        ----------
+        WordDictionary
+            the loaded dictionary
+        """
+        with open(path, encoding='utf8') as f:
+            return cls(f)
+
+
+
+    @classmethod
+    def fromBinary(cls, path):
+        """
+        Opens a dictionary saved with toBinary. The file is memory-mapped and used
+        in place, so opening takes no time regardless of the size, and processes
+        using the same file share its pages.
+
+        If the file is not a dictionary of a supported version, raises ValueError.
+
+        Parameters
+        ----------
+        path: string
+            path to the file
+
+        Returns
+        ----------
+        WordDictionary
+            the opened dictionary
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < BINARY_HEADER.size:
+            raise ValueError("Not a dictionary file: "+path)
+        magic, version, numberOfWords, numberOfLengths, bufferSize = BINARY_HEADER.unpack_from(mapped)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError("Not a dictionary file of version "+str(BINARY_VERSION)+": "+path)
+        view    = memoryview(mapped)
+        sizes   = [(numberOfWords+1)*4, numberOfWords*8, numberOfWords*4, numberOfLengths*12, len(ALPHABET)*4, bufferSize, bufferSize, bufferSize]
+        formats = ['I', 'Q', 'I', 'I', 'I', 'B', 'B', 'B']
+        sections, position = [], cls.__align(BINARY_HEADER.size)
+        if position + sum(cls.__align(size) for size in sizes) > len(mapped):
+            raise ValueError("Truncated dictionary file: "+path)
+        for size, typecode in zip(sizes, formats):
+            section = view[position:position+size]
+            if typecode != 'B':
+                #numbers are stored little-endian, so they can be used in place only on such machines
+                section = section.cast(typecode) if sys.byteorder == 'little' else cls.__swapped(section, typecode)
+            sections.append(section)
+            position += cls.__align(size)
+        offsets, masks, idsByLength, lengthTable, letterCounts, buffer, sortedLetters, sortedPositions = sections
+        lengthRanges = {lengthTable[idx]: (lengthTable[idx+1], lengthTable[idx+2]) for idx in range(0, len(lengthTable), 3)}
+        dictionary = cls.__new__(cls)
+        dictionary._setBuffers(buffer, offsets, sortedLetters, sortedPositions, masks, idsByLength, lengthRanges, letterCounts)
+        dictionary._mapped = mapped
+        return dictionary
+
+
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a dictionary from a binary file created with toBinary or from a text 
+        file with one word per line, recognizing the format by the file's beginning.
+
+        Parameters
+        ----------
+        path: string
+            path to the file
+
+        Returns
+        ----------
+        WordDictionary
+            the loaded dictionary
+        """
+        with open(path, 'rb') as f:
+            isBinary = f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+        return cls.fromBinary(path) if isBinary else cls.fromFile(path)
+
+
+
+    def toBinary(self, path):
+        """
+        Saves the dictionary in the binary format which can be opened with fromBinary.
+
+        Parameters
+        ----------
+        path: string
+            path to the file
+
+        """
+        lengthTable = array.array('I')
+        for length in sorted(self._lengthRanges):
+            lengthTable.extend((length,)+self._lengthRanges[length])
+        sections = [array.array('I', self._offsets), array.array('Q', self._masks), array.array('I', self._idsByLength),
+                    lengthTable, array.array('I', self._letterCounts)]
+        if sys.byteorder != 'little':
+            for section in sections:
+                section.byteswap()
+        sections += [bytes(self._buffer), bytes(self._sortedLetters), bytes(self._sortedPositions)]
+        temporaryPath = path+'.tmp'
+        with open(temporaryPath, 'wb') as f:
+            f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(self), len(self._lengthRanges), len(self._buffer)))
+            for section in sections:
+                f.write(b'\0'*(self.__align(f.tell())-f.tell()))
+                f.write(section)
+            f.write(b'\0'*(self.__align(f.tell())-f.tell()))
+        os.replace(temporaryPath, path)
+
+
+
+    @staticmethod
+    def __align(position):
+        """
+        Rounds the position up to the multiple of 8.
+
+        Parameters
+        ----------
+        position: int
+            position in the binary file
+
+        Returns
+        ----------
+        int
+            the aligned position
+        """
+        return (position+7)//8*8
+
+
+
+    @staticmethod
+    def __swapped(section, typecode):
+        """
+        Copies little-endian numbers to an array of the machine's byte order.
+
+        Parameters
+        ----------
+        section: memoryview
+            bytes of the numbers
+        typecode: string
+            typecode of the array
+
+        Returns
+        ----------
+        array.array
+            the numbers
+        """
+        numbers = array.array(typecode)
+        numbers.frombytes(section)
+        numbers.byteswap()
+        return numbers
+
+
+
+    def __len__(self):
+        return len(self._masks)
+
+
+
+    @property
+    def lengths(self):
+        return sorted(self._lengthRanges)
+
+
+
+    @property
+    def letterCounts(self):
+        return {character: count for character, count in zip(ALPHABET, self._letterCounts)}
+
+
+
+    @property
+    def fingerprint(self):
+        """
+        SHA-1 digest of the words in the order of their ids. It tells whether data saved
+        with ids of words, e.g. live games, belongs to the same dictionary.
+
+        Returns
+        ----------
+        bytes
+            20 bytes of the digest
+        """
+        if self._fingerprint is None:
+            digest = hashlib.sha1(self._buffer)
+            digest.update(memoryview(self._offsets).cast('B'))
+            self._fingerprint = digest.digest()
+        return self._fingerprint
+
+
+
+    def getWord(self, wordId):
+        """
+        Provides the word of the given id.
+
+        Parameters
+        ----------
+        wordId: int
+            id of the word
+
+        Returns
+        ----------
+        string
+            the word
+        """
+        return bytes(self._buffer[self._offsets[wordId]:self._offsets[wordId+1]]).decode('ascii')
+
+
+
+    def getLength(self, wordId):
+        """
+        Provides the length of the word of the given id.
+
+        Parameters
+        ----------
+        wordId: int
+            id of the word
+
+        Returns
+        ----------
+        int
+            number of characters of the word
+        """
+        return self._offsets[wordId+1]-self._offsets[wordId]
+
+
+
+    def getMask(self, wordId):
+        """
+        Provides the mask of letters of the word of the given id.
+
+        Parameters
+        ----------
+        wordId: int
+            id of the word
+
+        Returns
+        ----------
+        int
+            bits of LETTER_BITS of the word's letters
+        """
+        return self._masks[wordId]
+
+
+
+    def findPositions(self, wordId, character):
+        """
+        Finds positions of the character in the word of the given id. Words which
+        do not contain the character are rejected with their mask, for the others
+        the positions are found with binary search in sorted letters of the word.
+
+        Parameters
+        ----------
+        wordId: int
+            id of the word
+        character: string
+            a single character to look for
+
+        Returns
+        ----------
+        bytes
+            positions of the character in increasing order, empty if there are none
+        """
+        if not self._masks[wordId] & LETTER_BITS.get(character, 0):
+            return b''
+        code    = ord(character)
+        start   = bisect.bisect_left(self._sortedLetters, code, self._offsets[wordId], self._offsets[wordId+1])
+        end     = bisect.bisect_right(self._sortedLetters, code, start, self._offsets[wordId+1])
+        return bytes(self._sortedPositions[start:end])
+
+
+
+    def pickWordId(self, rng=random, length=None, difficulty=None):
+        """
+        Picks a random word.
+
+        If there is no word of the given length or the difficulty is unknown, raises ValueError.
+
+        Parameters
+        ----------
+        rng: random.Random
+            source of random numbers
+        length: int
+            length of the word, any if None
+        difficulty: string
+            one of DIFFICULTIES, any if None
+
+        Returns
+        ----------
+        int
+            id of the picked word
+        """
+        if difficulty is not None and not difficulty in DIFFICULTIES:
+            raise ValueError("Unknown difficulty: "+str(difficulty))
+        if len(self) == 0:
+            raise ValueError("Dictionary is empty")
+        if length is None and difficulty is None:
+            return rng.randrange(len(self))
+        if length is None:
+            #length of a random word, so that lengths are as frequent as in the dictionary
+            length = self.getLength(rng.randrange(len(self)))
+        if not length in self._lengthRanges:
+            raise ValueError("No words of length "+str(length))
+        start, end = self._lengthRanges[length]
+        if difficulty is not None:
+            level       = DIFFICULTIES.index(difficulty)
+            size        = end-start
+            first, last = start+size*level//len(DIFFICULTIES), start+size*(level+1)//len(DIFFICULTIES)
+            #too few words of this length to tell the difficulties apart
+            if first < last:
+                start, end = first, last
+        return self._idsByLength[rng.randrange(start, end)]
+
+
+if __name__ == '__main__':
+
+    """
+    Convert a text file with one word per line to the binary dictionary format.
+
+    """
+
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Hangman dictionary converter')
+
+    parser.add_argument('words', help='text file with one word per line')
+
+    parser.add_argument('output', help='path of the created binary dictionary')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    dictionary = WordDictionary.fromFile(args.words)
+    dictionary.toBinary(args.output)
+    print("Saved {0} words of {1} lengths in {2:.2f} s".format(len(dictionary), len(dictionary.lengths), time.perf_counter()-start))
@@ -5,8 +5,11 @@ Created on Thu May  2 21:51:31 2019
 
 @author: lukasz
 """
-import Api
-import Interface
+import sys
+import Logs
+import Game
+import Scores
+import Dictionary
 
 if __name__ == '__main__':
     
@@ -22,9 +25,122 @@ if __name__ == '__main__':
     parser.add_argument('-a', '--api', action="store_true", default=False,
                         help='launch hangman\'s web API instead of in-terminal interface')
     
+    parser.add_argument('--server', choices=['flask', 'asgi'], default='flask',
+                        help='server of the web API: flask development server or asgi server run with uvicorn')
+    
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='address the web API binds to')
+    
+    parser.add_argument('--port', type=int, default=5000,
+                        help='port the web API binds to')
+    
+    parser.add_argument('-d', '--dictionary', metavar='PATH',
+                        help='text file with words to guess, one per line')
+    
+    parser.add_argument('--export-scores', metavar='PATH',
+                        help='export saved scores to csv, json, xlsx or parquet file (chosen by extension) using pandas and exit')
+    
+    parser.add_argument('--score-store', choices=list(Scores.STORES), default='csv',
+                        help='storage of scores: csv file or SQLite database with indexes')
+    
+    parser.add_argument('--scores', metavar='PATH',
+                        help='file of the storage of scores. scores.csv or scores.db if not given')
+    
+    parser.add_argument('--flush-interval', type=float, default=1.0,
+                        help='maximal number of seconds a score waits before it is saved')
+    
+    parser.add_argument('--flush-size', type=int, default=256,
+                        help='number of waiting scores which are saved at once')
+    
+    parser.add_argument('--fsync', choices=[Scores.FSYNC_NEVER, Scores.FSYNC_BATCH, Scores.FSYNC_CLOSE], default=Scores.FSYNC_NEVER,
+                        help='when saved scores are synced to the disk')
+    
+    parser.add_argument('--score-queue', type=int, default=100000,
+                        help='maximal number of scores waiting to be saved, e.g. while the disk fails')
+    
+    parser.add_argument('--score-overflow', choices=[Logs.OVERFLOW_DROP_NEW, Logs.OVERFLOW_DROP_OLD, Logs.OVERFLOW_BLOCK], default=Logs.OVERFLOW_DROP_NEW,
+                        help='what happens to a score when the queue is full: the new or the oldest score is dropped, or the game waits until scores are saved')
+    
+    parser.add_argument('--sessions', metavar='PATH',
+                        help='file the live games of the web API are saved to, so that they are restored when the server starts again')
+    
+    parser.add_argument('--checkpoint-interval', type=float, default=60.0,
+                        help='maximal number of seconds between saving all live games; changes in between are kept in a log next to the file')
+    
+    parser.add_argument('--log-queue', type=int, default=10000,
+                        help='maximal number of log records waiting to be written to hangman.log')
+    
+    parser.add_argument('--log-overflow', choices=[Logs.OVERFLOW_DROP_NEW, Logs.OVERFLOW_DROP_OLD, Logs.OVERFLOW_BLOCK], default=Logs.OVERFLOW_DROP_NEW,
+                        help='what happens to a log record when the queue is full: the new or the oldest record is dropped, or the logging thread waits')
+    
+    parser.add_argument('--log-sample', metavar='EVENT=RATE', action='append', default=[],
+                        help='fraction of log records of the event which are written, e.g. request=0.01 logs every 100th request. Can be repeated')
+    
+    parser.add_argument('--dry-run', action="store_true", default=False,
+                        help='prepare the chosen mode and exit instead of starting the server or the interface, e.g. to measure the startup')
+    
     args = parser.parse_args()
     
-    if args.api:
-        Api.app.run()
+    #the asgi server handles game requests in its event loop, which a blocked append of a score would stop
+    if args.api and args.server == 'asgi' and args.score_overflow == Logs.OVERFLOW_BLOCK:
+        parser.error('Scores cannot block the asgi server, choose drop-new or drop-old overflow')
+    
+    sampleRates = dict(Logs.DEFAULT_SAMPLE_RATES)
+    for entry in args.log_sample:
+        event, _, rate = entry.partition('=')
+        try:
+            sampleRates[event] = float(rate)
+        except ValueError:
+            parser.error('Wrong sampling of log records: '+entry)
+    Game.setLoggingHandler(Logs.createFileHandler('hangman.log', queueSize=args.log_queue, overflow=args.log_overflow, sampleRates=sampleRates))
+    
+    if args.dictionary is not None:
+        Game.setDictionary(Dictionary.WordDictionary.load(args.dictionary))
+    
+    try:
+        Game.setScoreStore(Scores.createScoreStore(args.score_store, args.scores, args.flush_interval, args.flush_size, args.fsync,
+                                                   args.score_queue, args.score_overflow))
+    except Scores.ScoreStorageError as e:
+        parser.error(str(e))
+    
+    #load saved scores once, later only new ones are read. Problems are reported with the first request for scores.
+    try:
+        Game.getScoreStore().refresh()
+    except Scores.ScoreStorageError:
+        pass
+    
+    #interfaces are imported only when they are used, so that each mode loads only the libraries it needs
+    if args.export_scores is not None:
+        df = Game.Core().getScoresDataFrame()
+        extension = args.export_scores.rsplit('.', 1)[-1].lower()
+        exporters = {'csv': df.to_csv, 'json': lambda path: df.reset_index().to_json(path, orient='records', date_format='iso', date_unit='us'), 'xlsx': df.to_excel, 'parquet': df.to_parquet}
+        if not extension in exporters:
+            parser.error('Unsupported export format: '+extension)
+        exporters[extension](args.export_scores)
+    elif args.api:
+        import Api
+        if args.sessions is not None:
+            import Snapshots
+            try:
+                restored = Api.InstanceOfApi.attachJournal(Snapshots.SessionJournal(args.sessions, checkpointInterval=args.checkpoint_interval))
+            except Snapshots.SnapshotError as e:
+                parser.error(str(e))
+            Game.logger.info("Restored "+str(restored)+" games", extra={'event': 'sessionsRestored', 'fields': {'games': restored}})
+        if args.server == 'asgi':
+            import AsgiApi
+            if not args.dry_run:
+                AsgiApi.serve(args.host, args.port)
+        else:
+            import signal
+            from werkzeug.serving import WSGIRequestHandler
+            #kill, e.g. in LetThemFight.sh, ends the server like Ctrl+C, so queued scores and games are saved at exit
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+            #HTTP/1.1 lets clients keep their connections alive between requests
+            WSGIRequestHandler.protocol_version = "HTTP/1.1"
+            if not args.dry_run:
+                Api.app.run(host=args.host, port=args.port)
     else:
-        Interface.InTerminal().run()
\ No newline at end of file
+        import Interface
+        interface = Interface.InTerminal()
+        if not args.dry_run:
+            interface.run()
\ No newline at end of file
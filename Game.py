@@ -6,24 +6,45 @@ Created on Tue Apr 30 18:30:53 2019
 @author: lukasz
 """
 import random
-import pandas
+import struct
 import datetime
+import threading
 
 import logging
-import logging.handlers
+
+import Logs
+import Scores
+import Dictionary
 
 #Since game is supposed to be running with some interfaces  (either api or gui), 
 #any problems cannot be priinted as output and need to be stored for further 
-#handling in the future. Fort tha reason a logger is created.
+#handling in the future. Fort tha reason a logger is created. Records are written 
+#as json lines to hangman.log by a background thread, so logging never waits for the disk.
 
-loggingFormatter       = logging.Formatter(fmt='%(asctime)s %(message)s')
-loggingHandler         = logging.handlers.RotatingFileHandler('hangman.log', maxBytes=1024 * 1024)
-loggingHandler.setFormatter(loggingFormatter)
+loggingHandler         = Logs.createFileHandler('hangman.log')
 logger                 = logging.getLogger('HangmanLogger')
 logger.addHandler(loggingHandler)
 logger.setLevel(logging.INFO)
 
 
+
+def setLoggingHandler(newHandler):
+    """
+    Replaces the handler of the game's logger. Records queued by the previous one are written first.
+
+    Parameters
+    ----------
+    newHandler: Logs.QueueLogHandler
+        the new handler, e.g. created with Logs.createFileHandler
+    
+    """
+    global loggingHandler
+    oldHandler, loggingHandler = loggingHandler, newHandler
+    logger.addHandler(newHandler)
+    logger.removeHandler(oldHandler)
+    oldHandler.close()
+
+
 class ScoreDataProblem(Exception):
     """
     Exception to handle any score file related problems.
@@ -41,7 +62,225 @@ class ScoreDataProblem(Exception):
     
         """
         super(ScoreDataProblem, self).__init__(message)
-        logger.info("ScoreDataProblem: "+message)
+        logger.info("ScoreDataProblem: "+message, extra={'event': 'scoreDataProblem'})
+
+
+
+#Words used when no other dictionary was set.
+DEFAULT_WORDS = ["3dhubs", "marvin", "print", "filament", "order", "layer"]
+
+#All games of the process share one dictionary. It is created when it is needed 
+#for the first time, so that interfaces can set a bigger one before.
+
+dictionary          = None
+dictionaryLock      = threading.Lock()
+
+
+
+def getDictionary():
+    """
+    Provides the dictionary shared by all games, creating it from DEFAULT_WORDS 
+    if it was not set before.
+
+    Parameters
+    ----------
+        
+    Returns
+    ----------
+    Dictionary.WordDictionary
+        the shared dictionary
+    
+    """
+    global dictionary
+    with dictionaryLock:
+        if dictionary is None:
+            dictionary = Dictionary.WordDictionary(DEFAULT_WORDS)
+        return dictionary
+
+
+
+def setDictionary(newDictionary):
+    """
+    Replaces the dictionary shared by all games. Games which are already started
+    have to be restarted.
+
+    Parameters
+    ----------
+    newDictionary: Dictionary.WordDictionary
+        the new shared dictionary
+    
+    """
+    global dictionary
+    with dictionaryLock:
+        dictionary = newDictionary
+
+
+
+#All games of the process share one storage of scores. It is created when it is needed 
+#for the first time, so that interfaces can choose and configure it before.
+
+scoreStore          = None
+scoreStoreLock      = threading.Lock()
+
+
+
+def getScoreStore():
+    """
+    Provides the storage of scores shared by all games, creating scores.csv storage 
+    with default settings if it was not set before.
+
+    Parameters
+    ----------
+        
+    Returns
+    ----------
+    Scores.ScoreStore
+        the shared storage of scores
+    
+    """
+    global scoreStore
+    with scoreStoreLock:
+        if scoreStore is None:
+            scoreStore = Scores.CsvScoreStore()
+        return scoreStore
+
+
+
+def setScoreStore(store):
+    """
+    Replaces the storage of scores shared by all games. The previous one is closed.
+
+    Parameters
+    ----------
+    store: Scores.ScoreStore
+        the new shared storage of scores, e.g. created with Scores.createScoreStore
+    
+    """
+    global scoreStore
+    with scoreStoreLock:
+        previousStore, scoreStore = scoreStore, store
+    if previousStore is not None:
+        previousStore.close()
+
+
+
+def queryScores(methodName, *args):
+    """
+    Runs a query of the shared storage of scores. Queries see scores already written by the storage.
+    
+    If any problem with score data handling is detected, raises ScoreDataProblem.
+
+    Parameters
+    ----------
+    methodName: string
+        name of the query method of Scores.ScoreStore, e.g. getTop
+    args: 
+        arguments of the method
+        
+    Returns
+    ----------
+    object
+        the result of the query
+    
+    """
+    try:
+        return getattr(getScoreStore(), methodName)(*args)
+    except Scores.ScoreStorageError as e:
+        raise ScoreDataProblem(str(e))
+
+
+
+class GameState:
+    """
+    Compact record of one game's state, so that thousands of live games take little memory.
+    The word is kept as its id in the shared dictionary, guessed characters as bits of 
+    Dictionary.LETTER_BITS and the current guess as bytes with "_" in place of unguessed 
+    characters. The record can be saved as bytes with toBytes and read with fromBytes.
+    Version grows with every change of the state, so clients can tell if their copy is current.
+
+    """
+    
+    __slots__ = ('userName', 'wordId', 'guessedMask', 'reveal', 'attemptsLeft', 'active', 'userGuessed', 'score', 'version')
+    
+    #wordId, guessedMask, attemptsLeft, flags, score, version, length of userName, length of reveal
+    #followed by utf8 encoded userName and reveal. Missing numbers are saved as -1.
+    HEADER      = struct.Struct('<iQbBdIII')
+    ACTIVE      = 1
+    GUESSED     = 2
+    HAS_SCORE   = 4
+    
+    def __init__(self):
+        """
+        Constructor of GameState. Creates a state of not started game.
+    
+        Parameters
+        ----------
+        
+        """
+        self.userName       = None
+        self.wordId         = None
+        self.guessedMask    = 0
+        self.reveal         = None
+        self.attemptsLeft   = None
+        self.active         = False
+        self.userGuessed    = False
+        self.score          = None
+        self.version        = 0
+        
+        
+        
+    def toBytes(self):
+        """
+        Creates a binary representation of the state.
+    
+        Parameters
+        ----------
+        
+        Returns
+        ----------
+        bytes
+            the state which can be read with fromBytes
+        
+        """
+        name    = b'' if self.userName is None else self.userName.encode('utf8')
+        reveal  = b'' if self.reveal is None else self.reveal
+        flags   = (self.ACTIVE if self.active else 0) | (self.GUESSED if self.userGuessed else 0) | (self.HAS_SCORE if self.score is not None else 0)
+        header  = self.HEADER.pack(-1 if self.wordId is None else self.wordId, self.guessedMask,
+                                   -1 if self.attemptsLeft is None else self.attemptsLeft, flags,
+                                   0.0 if self.score is None else self.score, self.version, len(name), len(reveal))
+        return header + name + reveal
+        
+        
+        
+    @classmethod
+    def fromBytes(cls, data):
+        """
+        Reads the state from its binary representation.
+    
+        Parameters
+        ----------
+        data: bytes-like
+            the state created with toBytes
+        
+        Returns
+        ----------
+        GameState
+            the read state
+        
+        """
+        wordId, guessedMask, attemptsLeft, flags, score, version, nameLength, revealLength = cls.HEADER.unpack_from(data)
+        start = cls.HEADER.size
+        state = cls()
+        state.userName      = bytes(data[start:start+nameLength]).decode('utf8') if wordId >= 0 else None
+        state.wordId        = wordId if wordId >= 0 else None
+        state.guessedMask   = guessedMask
+        state.reveal        = bytearray(data[start+nameLength:start+nameLength+revealLength]) if wordId >= 0 else None
+        state.attemptsLeft  = attemptsLeft if attemptsLeft >= 0 else None
+        state.active        = bool(flags & cls.ACTIVE)
+        state.userGuessed   = bool(flags & cls.GUESSED)
+        state.score         = score if flags & cls.HAS_SCORE else None
+        state.version       = version
+        return state
 
 
 
@@ -53,56 +292,73 @@ class Core:
 
     """
     
-    def __init__(self):
+    __slots__ = ('__possibleWords', '__state', '__recordScores')
+    
+    def __init__(self, wordDictionary=None, state=None, recordScores=True):
         """
         Constructor of Core.
         Sets possible words to guess and defines needed class instance variables.
     
         Parameters
         ----------
+        wordDictionary: Dictionary.WordDictionary
+            words to guess, the shared dictionary if None
+        state: GameState
+            state of the game to continue, a not started game if None
+        recordScores: bool
+            if False then scores of finished games are not saved, e.g. in simulations
         
         """
-        self.__possibleWords            = ["3dhubs", "marvin", "print", "filament", "order", "layer"]
-        self.resetVariables()
+        self.__possibleWords            = wordDictionary if wordDictionary is not None else getDictionary()
+        self.__state                    = state if state is not None else GameState()
+        self.__recordScores             = recordScores
         
         
         
     def resetVariables(self):
         """
-        Resets class instance variables' values.
+        Resets class instance variables' values. The version of the state still grows.
     
         Parameters
         ----------
         
         """
-        self.__userName                 = None
-        self.__selectedWordId           = None
-        self.__currentGuess             = None
-        self.__attemptsLeft             = None
-        self.__active                   = False
-        self.__userGuesssed             = False
-        self.__score                    = None
+        state                           = GameState()
+        state.version                   = self.__state.version + 1
+        self.__state                    = state
         
         
         
-    def start(self, userName):
+    def start(self, userName, length=None, difficulty=None, wordId=None):
         """
         Starts the game. Picks one word for user to guess and sets class instance variables' values.
+        
+        If there is no word of the given length, the difficulty is unknown or the word id is wrong, raises ValueError.
     
         Parameters
         ----------
         userName: string
             the name of the user
+        length: int
+            length of the word to guess, any if None
+        difficulty: string
+            one of Dictionary.DIFFICULTIES, any if None
+        wordId: int
+            id of the word to guess in the dictionary, picked at random if None
         
         """
-        self.__userName                 = userName
-        self.__selectedWordId           = random.randint(0,len(self.__possibleWords)-1)
-        self.__attemptedWrongLetters    = set()
-        self.__attemptsLeft             = 5
-        self.__currentGuess             = ["_"]*len(self.__possibleWords[self.__selectedWordId])
-        self.__active                   = True
-        self.__userGuesssed             = False
-        self.__score                    = 0
+        if wordId is not None and not 0 <= wordId < len(self.__possibleWords):
+            raise ValueError("No word with id "+str(wordId))
+        state                           = GameState()
+        state.wordId                    = self.__possibleWords.pickWordId(random, length, difficulty) if wordId is None else wordId
+        state.userName                  = userName
+        state.attemptsLeft              = 5
+        state.reveal                    = bytearray(b"_")*self.__possibleWords.getLength(state.wordId)
+        state.active                    = True
+        state.userGuessed               = False
+        state.score                     = 0
+        state.version                   = self.__state.version + 1
+        self.__state                    = state
         
         
         
@@ -121,10 +377,10 @@ class Core:
     def handleNewCharacter(self, usersCharacter):
         """
         Checks if user guess a correct character and updates class instance variables.
-        If end of the game detected, appends new score with the timestap and user name
-        to scores.csv.
+        If end of the game detected, queues new score with the timestap and user name
+        to be saved by the shared storage of scores, unless scores are not recorded.
         
-        If any problem with scores.csv handling is detected, raises ScoreDataProblem.
+        If any problem with score data handling is detected, raises ScoreDataProblem.
     
         Parameters
         ----------
@@ -137,85 +393,231 @@ class Core:
             True if user made a correct guess
         
         """
+        state = self.__state
         success = self.checkCurrentGuess(usersCharacter)
+        state.guessedMask |= Dictionary.LETTER_BITS.get(usersCharacter, 0)
+        state.version     += 1
         if not success:
-            self.__attemptsLeft -= 1      
-            self.__active        = self.__attemptsLeft > 0
+            state.attemptsLeft  -= 1      
+            state.active         = state.attemptsLeft > 0
         else:
-            self.__active        = ("_" in self.__currentGuess)
-            if not self.__active:
-                self.__userGuesssed = True
-        if not self.__active:
-            numberOfUnguessed   = self.__currentGuess.count("_")
-            totalLength         = len(self.__possibleWords[self.__selectedWordId])
-            self.__score        = self.__attemptsLeft/5.0*50.0 + (totalLength-numberOfUnguessed)/totalLength*50.0
-            index = pandas.DatetimeIndex([datetime.datetime.now()])
-            df = pandas.DataFrame(index=index, data = {'name': self.__userName, 'score': self.__score})
-            df.index.name = 'date'
+            state.active         = (b"_" in state.reveal)
+            if not state.active:
+                state.userGuessed = True
+        if not state.active:
+            numberOfUnguessed   = state.reveal.count(b"_")
+            totalLength         = len(state.reveal)
+            state.score         = state.attemptsLeft/5.0*50.0 + (totalLength-numberOfUnguessed)/totalLength*50.0
+            if not self.__recordScores:
+                return success
             try:
-                with open('scores.csv', 'a') as f:
-                    df.to_csv(f, header=f.tell()==0)
-            except Exception as e:
+                getScoreStore().append(datetime.datetime.now(), state.userName, state.score)
+            except Scores.ScoreStorageError as e:
                 raise ScoreDataProblem(str(e))
         return success
    
     
     @property        
     def userName(self):
-        return self.__userName
+        return self.__state.userName
     
     
     @property        
     def attemptsLeft(self):
-        return self.__attemptsLeft
+        return self.__state.attemptsLeft
     
     
     @property        
     def currentGuess(self):
-        return self.__currentGuess
+        return None if self.__state.reveal is None else list(self.__state.reveal.decode('ascii'))
     
     
     @property     
     def active(self):
-        return self.__active
+        return self.__state.active
     
     
     @property     
     def userGuesssed(self):
-        return self.__userGuesssed
+        return self.__state.userGuessed
     
     
     @property     
     def score(self):
-        return self.__score
+        return self.__state.score
+    
+    
+    @property     
+    def version(self):
+        return self.__state.version
     
     
+    @property     
+    def state(self):
+        return self.__state
+    
+    
+    @property     
+    def numberOfWords(self):
+        return len(self.__possibleWords)
+    
     
-    def getScores(self):
+    
+    def getScores(self, offset=0, limit=None):
         """
-        Reads scores.csv and returns its representation as dict.
+        Provides saved scores as dict. Scores are served by the shared storage of scores,
+        e.g. from the in-memory index which reads only the part of scores.csv appended since the last call.
         
-        If any problem with scores.csv handling is detected, raises ScoreDataProblem.
+        If any problem with score data handling is detected, raises ScoreDataProblem.
     
         Parameters
         ----------
+        offset: int
+            number of the oldest scores to skip
+        limit: int
+            maximal number of returned scores, all remaining if None
             
         Returns
         ----------
         dict( timestamp, dict(name:score))
-            Dict representation of the data from scores.csv        
+            Dict representation of the saved scores       
+        """
+        return {date: {'name': name, 'score': score} for date, name, score in queryScores('getPage', offset, limit)}
+        
+    
+    
+    def getTopScores(self, count):
+        """
+        Provides the best saved scores.
+        
+        If any problem with score data handling is detected, raises ScoreDataProblem.
+    
+        Parameters
+        ----------
+        count: int
+            number of requested scores
+            
+        Returns
+        ----------
+        list(dict(string,...))
+            dates, user names and scores from the best one
+        """
+        return [{'date': date, 'name': name, 'score': score} for date, name, score in queryScores('getTop', count)]
+        
+    
+    
+    def getUserStats(self, userName):
+        """
+        Provides the number, the best and the average of the user's saved scores.
+        
+        If any problem with score data handling is detected, raises ScoreDataProblem.
+    
+        Parameters
+        ----------
+        userName: string
+            the name of the user
+            
+        Returns
+        ----------
+        dict(string,...)
+            aggregates of user's scores, None if the user has no saved scores
+        """
+        stats = queryScores('getUserStats', userName)
+        if stats is None:
+            return None
+        return {'name': userName, 'count': stats.count, 'best': stats.best, 'average': stats.average}
+        
+    
+    
+    def getScoresBetween(self, since=None, until=None, offset=0, limit=None):
+        """
+        Provides scores saved in the given period of time, the oldest first.
+        
+        If any problem with score data handling is detected, raises ScoreDataProblem.
+    
+        Parameters
+        ----------
+        since: datetime.datetime
+            the earliest time, no bound if None
+        until: datetime.datetime
+            the time before which scores have to be saved, no bound if None
+        offset: int
+            number of scores to skip
+        limit: int
+            maximal number of returned scores, all remaining if None
+            
+        Returns
+        ----------
+        list(dict(string,...))
+            dates, user names and scores
+        """
+        since = None if since is None else since.strftime(Scores.DATE_FORMAT)
+        until = None if until is None else until.strftime(Scores.DATE_FORMAT)
+        return [{'date': date, 'name': name, 'score': score} for date, name, score in queryScores('getBetween', since, until, offset, limit)]
+        
+    
+    
+    def iterateScores(self, userName=None, since=None, until=None, batchSize=1000):
         """
+        Provides scores saved in the given period of time, the oldest first, in batches read 
+        from the shared storage of scores only when they are needed, so that all of them 
+        can be exported without holding them in memory.
+        
+        If any problem with score data handling is detected, the generator raises ScoreDataProblem.
+    
+        Parameters
+        ----------
+        userName: string
+            the name of the user whose scores are given, all users if None
+        since: datetime.datetime
+            the earliest time, no bound if None
+        until: datetime.datetime
+            the time before which scores have to be saved, no bound if None
+        batchSize: int
+            maximal number of scores in one batch
+            
+        Returns
+        ----------
+        generator(list(tuple(string, string, float)))
+            batches of dates, user names and scores
+        """
+        since = None if since is None else since.strftime(Scores.DATE_FORMAT)
+        until = None if until is None else until.strftime(Scores.DATE_FORMAT)
         try:
-            df = pandas.read_csv('scores.csv', index_col = 0)
-        except Exception as e:
+            for batch in getScoreStore().iterate(userName, since, until, batchSize):
+                yield batch
+        except Scores.ScoreStorageError as e:
             raise ScoreDataProblem(str(e))
-        return df.to_dict('index')
+        
+    
+    
+    def getScoresDataFrame(self):
+        """
+        Provides all saved scores as pandas.DataFrame indexed by date, for export
+        and analysis. It is the only place which uses pandas, so it is imported here.
+        
+        If any problem with score data handling is detected, raises ScoreDataProblem.
+    
+        Parameters
+        ----------
+            
+        Returns
+        ----------
+        pandas.DataFrame
+            saved scores with name and score columns
+        """
+        import pandas
+        records = queryScores('getPage')
+        df = pandas.DataFrame.from_records(records, columns=['date', 'name', 'score'])
+        df['date'] = pandas.to_datetime(df['date'])
+        return df.set_index('date')
         
     
     
     def checkCurrentGuess(self, usersCharacter):
         """
         Checks if the provided character can be found in the word to guess.
+        Only its positions in the word are visited, thanks to the dictionary's index.
     
         Parameters
         ----------
@@ -227,13 +629,13 @@ class Core:
         bool
             True if character can be found in the word to guess 
         """
-        correctGuess = False
-        for idx,character in enumerate(self.__possibleWords[self.__selectedWordId]):
-            if character == usersCharacter:
-                if self.__currentGuess[idx] == "_":
-                    self.__currentGuess[idx] = character
-                correctGuess = True
-        return correctGuess
+        state = self.__state
+        positions = self.__possibleWords.findPositions(state.wordId, usersCharacter)
+        if len(positions) > 0:
+            code = ord(usersCharacter)
+            for idx in positions:
+                state.reveal[idx] = code
+        return len(positions) > 0
                 
         
 if __name__ == '__main__':
@@ -27,9 +27,41 @@ class Base:
         
         
         
-    def validateInput(self, userInput, lengthCondition, messageOnWrongLength, messageOnWrongCharacters, allowWhitespaces=False):
+    def checkInput(self, userInput, lengthCondition, messageOnWrongLength, messageOnWrongCharacters, allowWhitespaces=False):
         """
         Checks if usersInput meets the requirements of length and type of characters.
+        Nothing is stored in the instance, so it can be called by many threads at once.
+    
+        Parameters
+        ----------
+        userInput: string
+            users guess
+        lengthCondition : lambda
+            condition which needs to be satisfied by len(userInput)
+        messageOnWrongLength: string
+            message returned if length condition failed
+        messageOnWrongCharacters: string
+            message returned if characters' type condition failed
+        allowWhitespaces: bool
+            if True then the provided characters can also be printable whitespaces, i.e. spaces
+            
+        Returns:
+        ----------
+        string
+            the message of the failed condition, None if input is correct
+    
+        """        
+        if not lengthCondition(len(userInput)):
+            return messageOnWrongLength
+        if not all(x.isprintable() and (x.isalpha() or (allowWhitespaces and x.isspace()) or x.isdecimal()) for x in userInput):
+            return messageOnWrongCharacters
+        return None
+        
+        
+        
+    def validateInput(self, userInput, lengthCondition, messageOnWrongLength, messageOnWrongCharacters, allowWhitespaces=False):
+        """
+        Checks the input with checkInput and adds the message of the failed condition to self._errorMessage.
     
         Parameters
         ----------
@@ -42,7 +74,7 @@ class Base:
         messageOnWrongCharacters: string
             text added to self._errorMessage if characters' type condition failed
         allowWhitespaces: bool
-            if True then the provided characters can also be whitespaces
+            if True then the provided characters can also be printable whitespaces, i.e. spaces
             
         Returns:
         ----------
@@ -50,11 +82,9 @@ class Base:
             True if input is correct
     
         """        
-        if not lengthCondition(len(userInput)):
-            self._errorMessage += messageOnWrongLength
-            return False
-        if not all(x.isalpha() or (allowWhitespaces and x.isspace()) or  x.isdecimal() for x in userInput):
-            self._errorMessage += messageOnWrongCharacters
+        message = self.checkInput(userInput, lengthCondition, messageOnWrongLength, messageOnWrongCharacters, allowWhitespaces)
+        if message is not None:
+            self._errorMessage += message
             return False
         return True
     
@@ -70,7 +100,99 @@ class Base:
         self._errorMessage = ""
 
 
-import os
+import sys
+import shutil
+
+#escape sequences of ANSI terminals
+CURSOR_HOME         = '\x1b[H'
+CLEAR_SCREEN        = '\x1b[2J'
+CLEAR_LINE_END      = '\x1b[K'
+CLEAR_SCREEN_END    = '\x1b[J'
+MOVE_CURSOR         = '\x1b[{0};1H'
+
+
+
+class Renderer:
+    """
+    Draws frames of the interface in terminal without starting any process. A frame is 
+    a list of lines followed by a prompt line, where the cursor is left for the input.
+    The whole frame is sent with one write. Only the lines which differ from the 
+    previous frame are redrawn, with ANSI escape sequences moving the cursor to them.
+    The prompt line and everything below it are always redrawn, since they hold the 
+    text typed by the user.
+    
+    If the output is not a terminal, frames are written one after another as plain text.
+    Lines wider than the terminal are cut, so that every line takes one row. If a frame 
+    does not fit in the terminal, the screen is cleared and the frame is drawn whole.
+
+    """
+    
+    def __init__(self, stream=None):
+        """
+        Constructor of Renderer.
+    
+        Parameters
+        ----------
+        stream: file
+            text stream of the terminal, sys.stdout if None
+    
+        """
+        self.__stream       = sys.stdout if stream is None else stream
+        self.__ansi         = self.__stream.isatty()
+        self.__lines        = None
+        
+        
+        
+    def invalidate(self):
+        """
+        Forgets the previous frame, so the next one is drawn on a cleared screen.
+        Needed when anything else wrote to the terminal.
+    
+        Parameters
+        ----------
+    
+        """
+        self.__lines = None
+        
+        
+        
+    def render(self, lines, prompt=''):
+        """
+        Draws the frame and leaves the cursor at the end of the prompt.
+    
+        Parameters
+        ----------
+        lines: list(string)
+            lines of the frame, without line breaks
+        prompt: string
+            text of the last line, in front of the user's input
+    
+        """
+        if not self.__ansi:
+            self.__stream.write(''.join(line+'\n' for line in lines)+prompt)
+            self.__stream.flush()
+            return
+        size = shutil.get_terminal_size()
+        #a line filling the last column wraps on some terminals, so one column is left free
+        width = max(size.columns-1, 1)
+        lines = [line[:width] for line in lines]
+        #the frame, the rows of the wrapped prompt and the line below the prompt, where enter 
+        #moves the cursor, have to fit without scrolling
+        fits = len(lines)+len(prompt)//size.columns+2 <= size.lines
+        previous = self.__lines
+        if previous is None or not fits:
+            parts = [CURSOR_HOME, CLEAR_SCREEN]
+            parts.extend(line+'\n' for line in lines)
+        else:
+            parts = []
+            for row, line in enumerate(lines):
+                if row >= len(previous) or previous[row] != line:
+                    parts.append(MOVE_CURSOR.format(row+1)+line+CLEAR_LINE_END)
+            parts.append(MOVE_CURSOR.format(len(lines)+1))
+        parts.append(prompt+CLEAR_SCREEN_END)
+        self.__stream.write(''.join(parts))
+        self.__stream.flush()
+        self.__lines = list(lines) if fits else None
 
 
 
@@ -111,6 +233,7 @@ class InTerminal(Base):
         super(InTerminal, self).__init__()
         self.__widthOfDisplay         = 8
         self.__exit                   = False
+        self.__renderer               = Renderer()
         
         
         
@@ -163,14 +286,13 @@ class InTerminal(Base):
         """
         properInput     = False
         while not properInput:
-            os.system( 'clear' )
-            print()
+            lines = ['']
             for key, option in options.items():
-                print("[", key, "] - ", option.description)
-            self.printPreviousErrors()
-            print()
+                lines.append("[ {0} ] -  {1}".format(key, option.description))
+            lines.extend(self.takePreviousErrors())
+            lines.append('')
             try:
-                userInput = input("Please select an option: ")
+                userInput = self.ask(lines, "Please select an option: ")
             except Exception as e:
                 self._errorMessage += "Someone probably wanted to crash the game with input. The following exception was cought:"
                 self._errorMessage += str(e)
@@ -192,23 +314,21 @@ class InTerminal(Base):
         ----------
     
         """
-        os.system( 'clear' )
+        lines = []
         try:        
+            #the score of the game just ended may still wait in the queue of the storage
+            Game.queryScores('flush')
             scores = self._gameInstance.getScores()
         except Game.ScoreDataProblem:
-            print("Scores could not be accessed")
+            lines.append("Scores could not be accessed")
         else:
             if len(scores) == 0:
-                print("No saved scores")
+                lines.append("No saved scores")
             else:
                 for date, details in scores.items():
-                    print(date, end=" ")
-                    for value in details.values() :
-                        print(value, end=" ")
-                    print()
-        print()
-        print("Press enter to return")
-        input()
+                    lines.append(" ".join(str(value) for value in [date, *details.values()])+" ")
+        lines.append('')
+        self.ask(lines, "Press enter to return")
     
     
     
@@ -228,25 +348,50 @@ class InTerminal(Base):
         while self._gameInstance.active:
             character = self.askForTheInformation(lengthCondition, "Please provide a character as a guess: ")
             self._gameInstance.handleNewCharacter(character)
-        os.system( 'clear' )
-        self.showCurrent()
+        lines = self.describeCurrent()
         if self._gameInstance.userGuesssed:
-            print("Yay. You are amazing. Final score: {0:.2f}".format(self._gameInstance.score))
+            lines.append("Yay. You are amazing. Final score: {0:.2f}".format(self._gameInstance.score))
         else:
-            print("Oh c'mon. It's only 6 words to choose from. Final score: {0:.2f}".format(self._gameInstance.score))
-        print()
-        print("Press enter to continue")
-        input()
+            lines.append("Oh c'mon. It's only {0} words to choose from. Final score: {1:.2f}".format(self._gameInstance.numberOfWords, self._gameInstance.score))
+        lines.append('')
+        self.ask(lines, "Press enter to continue")
         self._gameInstance.resetVariables()
         
         
         
-    def showCurrent(self):
+    def ask(self, lines, requestMessage):
+        """
+        Draws the lines with the renderer and waits for the user's input after the request message.
+    
+        Parameters
+        ----------
+        lines: list(string)
+            lines displayed above the request
+        requestMessage: string
+            a message to display explaining what to enter
+            
+        Returns
+        ----------
+        string
+            the user's input
+    
+        """
+        self.__renderer.render(lines, requestMessage)
+        return input()
+        
+        
+        
+    def describeCurrent(self):
         """
-        Prints a line with current state of the word to guess and the amount of remaining attempts. 
+        Creates lines with current state of the word to guess and the amount of remaining attempts. 
     
         Parameters
         ----------
+        
+        Returns
+        ----------
+        list(string)
+            the lines to display
     
         """        
         lengthOfGuess       = len(self._gameInstance.currentGuess)
@@ -256,45 +401,51 @@ class InTerminal(Base):
         emptyFront          = " "*emptySpaceInFront
         emptyBack           = " "*emptySpaceBehind
         
-        print()
-        print(emptyFront, end='')
-        for character in self._gameInstance.currentGuess:
-            print(character, end='')
-        print(emptyBack , end='')
-        
-        print(" | Attempts left: ", self._gameInstance.attemptsLeft)
-        print()
+        return ['', emptyFront+"".join(self._gameInstance.currentGuess)+emptyBack+" | Attempts left:  "+str(self._gameInstance.attemptsLeft), '']
         
         
         
-    def printPreviousErrors(self):
+    def takePreviousErrors(self):
         """
-        Prints the whole string stored in self._errorMessage. 
+        Creates lines with the whole string stored in self._errorMessage and clears it. 
     
         Parameters
         ----------
+        
+        Returns
+        ----------
+        list(string)
+            the lines to display, none if there are no errors
     
         """
-        if len(self._errorMessage) > 0:
-            print(self._errorMessage)
-            self.clearErrorMessage()
+        if len(self._errorMessage) == 0:
+            return []
+        lines = self._errorMessage.splitlines()
+        self.clearErrorMessage()
+        return lines
         
         
         
-    def printPreviousGuess(self, userInput=None):
+    def describePreviousGuess(self, userInput=None):
         """
-        Prints the line with the previous guess of the user. 
+        Creates the line with the previous guess of the user. 
     
         Parameters
         ----------
         userInput: string
             string to display as user's previous guess
+            
+        Returns
+        ----------
+        list(string)
+            the lines to display, none if there was no guess
     
         """
-        if not userInput is None:
-            if len(userInput) > 8:
-                userInput = userInput[:8]+"..."
-            print("Previous guess: ",userInput)
+        if userInput is None:
+            return []
+        if len(userInput) > 8:
+            userInput = userInput[:8]+"..."
+        return ["Previous guess:  "+userInput]
         
         
         
@@ -313,20 +464,20 @@ class InTerminal(Base):
         displayCurrentState: bool
             display current state line with every repeated question
         allowWhitespaces: bool
-            if True then the provided characters can also be whitespaces
+            if True then the provided characters can also be printable whitespaces, i.e. spaces
     
         """
         properInput     = False
         userInput       = None
         while not properInput:
-            os.system( 'clear' )
+            lines = []
             if displayCurrentState:
-                self.showCurrent()
-                self.printPreviousGuess(userInput)
-            self.printPreviousErrors()
-            print()
+                lines.extend(self.describeCurrent())
+                lines.extend(self.describePreviousGuess(userInput))
+            lines.extend(self.takePreviousErrors())
+            lines.append('')
             try:
-                userInput = input(requestMessage)
+                userInput = self.ask(lines, requestMessage)
             except Exception as e:
                 self._errorMessage += "Someone probably wanted to crash the game with input. The following exception was cought:"
                 self._errorMessage += str(e)
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:24:51 2026
+
+@author: lukasz
+"""
+
+import json
+import time
+import argparse
+import datetime
+import collections
+import concurrent.futures
+
+import Bot
+import Solver
+import OpeningBook
+
+
+def percentile(sortedValues, fraction):
+    """
+    Provides the value below which the given fraction of values falls.
+
+    Parameters
+    ----------
+    sortedValues: list(float)
+        values sorted in increasing order
+    fraction: float
+        a number from 0 to 1
+
+    Returns
+    ----------
+    float
+        the percentile, 0 if there are no values
+
+    """
+    if len(sortedValues) == 0:
+        return 0.0
+    return sortedValues[min(len(sortedValues)-1, int(fraction*len(sortedValues)))]
+
+
+
+def describeError(error):
+    """
+    Provides a short name of the problem which made a request fail, used to count errors.
+
+    Parameters
+    ----------
+    error: Bot.RequestError
+        the error raised by the client
+
+    Returns
+    ----------
+    string
+        the status of the answer, e.g. "HTTP 404", or the name of the exception
+
+    """
+    original = error.originalException
+    if isinstance(original, Bot.ResponseError):
+        return "HTTP "+str(original.status)
+    return type(original).__name__
+
+
+
+class BotStats:
+    """
+    Basically a struct holding everything measured by one bot. Every bot has its own
+    instance, so bots never wait for each other to record a request.
+
+    """
+
+    __slots__ = ('latencies', 'failures', 'errors', 'games', 'wins', 'totalScore')
+
+    def __init__(self):
+        """
+        Constructor of BotStats struct.
+
+        Parameters
+        ----------
+
+        """
+        self.latencies  = collections.defaultdict(list)
+        self.failures   = collections.Counter()
+        self.errors     = collections.Counter()
+        self.games      = 0
+        self.wins       = 0
+        self.totalScore = 0.0
+
+
+
+    def record(self, path, seconds, failed):
+        """
+        Records one request. Used as the recorder of Bot.HangmanClient.
+
+        Parameters
+        ----------
+        path: string
+            path of the api's route
+        seconds: float
+            time of the request
+        failed: bool
+            True if the request failed
+
+        """
+        self.latencies[path].append(seconds)
+        if failed:
+            self.failures[path] += 1
+
+
+
+def runBot(baseUrl, name, games, wordIndex, timeout, retries):
+    """
+    Plays the given number of games one after another with its own client.
+    A game which fails is counted as an error and the bot goes on with the next one.
+
+    Parameters
+    ----------
+    baseUrl: string
+        base url of the game server
+    name: string
+        the name of the bot
+    games: int
+        number of games to play
+    wordIndex: Solver.WordIndex
+        words the bot expects the server to choose from
+    timeout: float
+        seconds after which a request fails
+    retries: int
+        number of times a failed request is repeated
+
+    Returns
+    ----------
+    BotStats
+        what the bot measured
+
+    """
+    stats = BotStats()
+    with Bot.HangmanClient(baseUrl, poolSize=1, timeout=timeout, retries=retries, recorder=stats.record) as client:
+        for _ in range(games):
+            try:
+                state = Bot.playGame(client, name, wordIndex)
+            except Bot.RequestError as e:
+                stats.errors[describeError(e)] += 1
+                continue
+            stats.games         += 1
+            stats.wins          += 1 if state['userGuessed'] else 0
+            stats.totalScore    += state['score'] or 0.0
+    return stats
+
+
+
+def summarize(allStats, seconds):
+    """
+    Merges what the bots measured into the results of the run.
+
+    Parameters
+    ----------
+    allStats: list(BotStats)
+        stats of every bot
+    seconds: float
+        duration of the run
+
+    Returns
+    ----------
+    dict(string,...)
+        throughput, outcome of the games, errors and latencies of every endpoint in milliseconds
+
+    """
+    latencies   = collections.defaultdict(list)
+    failures    = collections.Counter()
+    errors      = collections.Counter()
+    for stats in allStats:
+        for path, values in stats.latencies.items():
+            latencies[path].extend(values)
+        failures.update(stats.failures)
+        errors.update(stats.errors)
+    games       = sum(stats.games for stats in allStats)
+    wins        = sum(stats.wins for stats in allStats)
+    totalScore  = sum(stats.totalScore for stats in allStats)
+    requests    = sum(len(values) for values in latencies.values())
+    endpoints   = dict()
+    for path, values in sorted(latencies.items()):
+        values.sort()
+        endpoints[path] = \
+        {
+         'requests':    len(values),
+         'failures':    failures[path],
+         'meanMs':      sum(values)/len(values)*1000.0,
+         'p50Ms':       percentile(values, 0.50)*1000.0,
+         'p90Ms':       percentile(values, 0.90)*1000.0,
+         'p99Ms':       percentile(values, 0.99)*1000.0,
+         'maxMs':       values[-1]*1000.0,
+         }
+    return \
+    {
+     'seconds':             seconds,
+     'requests':            requests,
+     'requestsPerSecond':   requests/seconds if seconds > 0 else 0.0,
+     'games':               games,
+     'gamesPerSecond':      games/seconds if seconds > 0 else 0.0,
+     'failedGames':         sum(errors.values()),
+     'winRate':             wins/games if games > 0 else 0.0,
+     'averageScore':        totalScore/games if games > 0 else 0.0,
+     'errors':              dict(errors),
+     'endpoints':           endpoints,
+     }
+
+
+
+def runLoad(baseUrl, bots, games, words=Bot.DEFAULT_WORDS, timeout=5.0, retries=3, book=None):
+    """
+    Runs the bots concurrently, each in its own thread, against a running server.
+
+    Parameters
+    ----------
+    baseUrl: string
+        base url of the game server
+    bots: int
+        number of bots playing at the same time
+    games: int
+        number of games played by every bot
+    words: list(string)
+        words the bots expect the server to choose from
+    timeout: float
+        seconds after which a request fails
+    retries: int
+        number of times a failed request is repeated
+    book: OpeningBook.OpeningBook
+        opening book built for the words, none if None
+
+    Returns
+    ----------
+    dict(string,...)
+        the settings of the run and the results made by summarize
+
+    """
+    wordIndex = Solver.WordIndex(words)
+    wordIndex.useOpeningBook(book)
+    startedAt = datetime.datetime.now().isoformat()
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=bots) as executor:
+        futures = [executor.submit(runBot, baseUrl, "Bot"+str(number), games, wordIndex, timeout, retries) for number in range(bots)]
+        allStats = [future.result() for future in futures]
+    results = \
+    {
+     'startedAt':   startedAt,
+     'url':         baseUrl,
+     'bots':        bots,
+     'gamesPerBot': games,
+     }
+    results.update(summarize(allStats, time.perf_counter()-start))
+    return results
+
+
+
+def printResults(results):
+    """
+    Prints the results of the run in a readable form.
+
+    Parameters
+    ----------
+    results: dict(string,...)
+        the results made by runLoad
+
+    """
+    print("{0} bots x {1} games against {2} in {3:.2f} s".format(results['bots'], results['gamesPerBot'], results['url'], results['seconds']))
+    print("requests         {0:10d} {1:10.1f} req/s".format(results['requests'], results['requestsPerSecond']))
+    print("games            {0:10d} {1:10.1f} games/s".format(results['games'], results['gamesPerSecond']))
+    print("win rate         {0:10.1%}".format(results['winRate']))
+    print("average score    {0:10.2f}".format(results['averageScore']))
+    print("failed games     {0:10d} {1}".format(results['failedGames'], results['errors'] if results['errors'] else ''))
+    print()
+    print("{0:34s} {1:>8s} {2:>8s} {3:>8s} {4:>8s} {5:>8s} {6:>8s}".format('endpoint', 'requests', 'failures', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms'))
+    for path, endpoint in results['endpoints'].items():
+        print("{0:34s} {1:8d} {2:8d} {3:8.2f} {4:8.2f} {5:8.2f} {6:8.2f}".format(path, endpoint['requests'], endpoint['failures'],
+              endpoint['p50Ms'], endpoint['p90Ms'], endpoint['p99Ms'], endpoint['maxMs']))
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Many bots playing Hangman at the same time against a running server')
+
+    parser.add_argument('--url', default='http://localhost:5000',
+                        help='base url of the game server')
+
+    parser.add_argument('-n', '--bots', type=int, default=10,
+                        help='number of bots playing at the same time')
+
+    parser.add_argument('-m', '--games', type=int, default=10,
+                        help='number of games played by every bot')
+
+    parser.add_argument('-w', '--words',
+                        help='file with the words the server chooses from, one per line. The default words of the game if not given')
+
+    parser.add_argument('-b', '--book',
+                        help='opening book built for the words with OpeningBook.py')
+
+    parser.add_argument('--timeout', type=float, default=5.0,
+                        help='seconds after which a request to the server fails')
+
+    parser.add_argument('--retries', type=int, default=3,
+                        help='number of times a failed request is repeated')
+
+    parser.add_argument('-o', '--output',
+                        help='path of a json file the results are written to')
+
+    args = parser.parse_args()
+
+    words = Bot.DEFAULT_WORDS
+    if args.words is not None:
+        words = Solver.readWords(args.words)
+    book = None
+    if args.book is not None:
+        book = OpeningBook.OpeningBook.load(args.book)
+
+    results = runLoad(args.url, args.bots, args.games, words, args.timeout, args.retries, book)
+    printResults(results)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:48:26 2026
+
+@author: lukasz
+"""
+
+import os
+import json
+import atexit
+import random
+import weakref
+import datetime
+import threading
+import collections
+
+import logging
+import logging.handlers
+
+import Metrics
+
+#what happens to a record which does not fit in the full queue
+OVERFLOW_DROP_NEW   = 'drop-new'
+OVERFLOW_DROP_OLD   = 'drop-old'
+OVERFLOW_BLOCK      = 'block'
+
+#fraction of records of every event which are written. Events not listed here are always written
+DEFAULT_SAMPLE_RATES = {'request': 0.0}
+
+#QueueLogHandlers still in use, closed at exit and restarted in forked processes by functions 
+#registered once, so that handlers which are no longer used can be garbage collected
+_handlers = weakref.WeakSet()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats every record as one line of json with the time, level, logger, message,
+    the event given in extra data of the record, its fields and the exception if any.
+
+    """
+
+    def format(self, record):
+        """
+        Creates the json line of the record.
+
+        Parameters
+        ----------
+        record: logging.LogRecord
+            the record
+
+        Returns
+        ----------
+        string
+            the line without line break
+        """
+        entry = \
+        {
+         'time':    datetime.datetime.fromtimestamp(record.created).isoformat(timespec='microseconds'),
+         'level':   record.levelname,
+         'logger':  record.name,
+         'message': record.getMessage(),
+         }
+        event = getattr(record, 'event', None)
+        if event is not None:
+            entry['event'] = event
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry['fields'] = fields
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Lets through only the given fraction of records of high-volume events. The event
+    is read from extra data of the record. Warnings and errors always pass.
+
+    """
+
+    def __init__(self, rates=None, rng=None):
+        """
+        Constructor of SamplingFilter.
+
+        Parameters
+        ----------
+        rates: dict(string, float)
+            fraction of records kept for every event, DEFAULT_SAMPLE_RATES if None
+        rng: random.Random
+            source of random numbers, the random module if None
+
+        """
+        super(SamplingFilter, self).__init__()
+        self.__rates    = dict(DEFAULT_SAMPLE_RATES if rates is None else rates)
+        self.__random   = random.random if rng is None else rng.random
+
+
+
+    def rate(self, event):
+        """
+        Provides the fraction of records of the event which are kept.
+
+        Parameters
+        ----------
+        event: string
+            name of the event
+
+        Returns
+        ----------
+        float
+            the fraction, 1 for events without sampling
+        """
+        return self.__rates.get(event, 1.0)
+
+
+
+    def filter(self, record):
+        """
+        Decides if the record is kept.
+
+        Parameters
+        ----------
+        record: logging.LogRecord
+            the record
+
+        Returns
+        ----------
+        bool
+            True if the record is kept
+        """
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.__rates.get(getattr(record, 'event', None), 1.0)
+        return rate >= 1.0 or (rate > 0.0 and self.__random() < rate)
+
+
+
+class QueueLogHandler(logging.handlers.QueueHandler):
+    """
+    Handler which only puts records in a bounded in-memory queue. A background thread, 
+    started with the first record, wakes up every flushInterval seconds, or earlier when 
+    the queue is half full, and passes all queued records to the handler writing the file.
+    The thread which logs never waits for the disk and does not even wake the background 
+    thread up with every record.
+
+    Records are sampled before they are queued. When the queue is full a record is dropped,
+    the new one or the oldest one, or the logging thread waits, as chosen by the overflow
+    policy. Dropped records are counted in Metrics.registry.
+
+    """
+
+    def __init__(self, handler, queueSize=10000, overflow=OVERFLOW_DROP_NEW, sampleRates=None, flushInterval=0.1):
+        """
+        Constructor of QueueLogHandler.
+
+        Parameters
+        ----------
+        handler: logging.Handler
+            handler writing the records, used only by the background thread and flush
+        queueSize: int
+            maximal number of records waiting to be written
+        overflow: string
+            OVERFLOW_DROP_NEW, OVERFLOW_DROP_OLD or OVERFLOW_BLOCK
+        sampleRates: dict(string, float)
+            fraction of records kept for every event, DEFAULT_SAMPLE_RATES if None
+        flushInterval: float
+            maximal number of seconds a record waits in the queue
+
+        """
+        if overflow not in (OVERFLOW_DROP_NEW, OVERFLOW_DROP_OLD, OVERFLOW_BLOCK):
+            raise ValueError("Unknown overflow policy: "+str(overflow))
+        #appending to and popping from a deque are atomic, so the queue needs no lock
+        super(QueueLogHandler, self).__init__(collections.deque())
+        self.__target           = handler
+        self.__queueSize        = queueSize
+        self.__overflow         = overflow
+        self.__flushInterval    = flushInterval
+        self.__sampling         = SamplingFilter(sampleRates)
+        self.__thread           = None
+        self.__startLock        = threading.Lock()
+        self.__writeLock        = threading.Lock()
+        self.__wakeUp           = threading.Event()
+        self.__drained          = threading.Condition()
+        self.addFilter(self.__sampling)
+        _handlers.add(self)
+
+
+
+    def _restartAfterFork(self):
+        """
+        Gives a forked process its own queue, locks and background thread, which is started 
+        with the first record. Records queued before the fork are left to the parent process.
+
+        Parameters
+        ----------
+
+        """
+        self.queue              = collections.deque()
+        self.__thread           = None
+        self.__startLock        = threading.Lock()
+        self.__writeLock        = threading.Lock()
+        self.__wakeUp           = threading.Event()
+        self.__drained          = threading.Condition()
+
+
+
+    def sampleRate(self, event):
+        """
+        Provides the fraction of records of the event which are kept, so that
+        callers can skip creating records which would be dropped anyway.
+
+        Parameters
+        ----------
+        event: string
+            name of the event
+
+        Returns
+        ----------
+        float
+            the fraction, 1 for events without sampling
+        """
+        return self.__sampling.rate(event)
+
+
+
+    def prepare(self, record):
+        """
+        Makes the record ready to wait in the queue. The message is merged with its 
+        arguments and the exception is turned into text, which every formatter uses 
+        instead of the traceback, but the record is formatted only by the background thread.
+        The record is changed in place, since copying it would cost more than the rest of logging.
+
+        Parameters
+        ----------
+        record: logging.LogRecord
+            the record
+
+        Returns
+        ----------
+        logging.LogRecord
+            the same record
+        """
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg          = message
+        record.message      = message
+        record.args         = None
+        record.exc_info     = None
+        record.stack_info   = None
+        return record
+
+
+
+    def enqueue(self, record):
+        """
+        Puts the record in the queue, following the overflow policy if it is full.
+        Starts the background thread with the first record.
+
+        Parameters
+        ----------
+        record: logging.LogRecord
+            the prepared record
+
+        """
+        if self.__thread is None:
+            self.__start()
+        if len(self.queue) >= self.__queueSize:
+            if self.__overflow == OVERFLOW_DROP_NEW:
+                Metrics.registry.increment(Metrics.LOG_RECORDS_DROPPED)
+                return
+            if self.__overflow == OVERFLOW_DROP_OLD:
+                try:
+                    self.queue.popleft()
+                    Metrics.registry.increment(Metrics.LOG_RECORDS_DROPPED)
+                except IndexError:
+                    pass
+            else:
+                with self.__drained:
+                    while len(self.queue) >= self.__queueSize and self.__thread is not None:
+                        self.__wakeUp.set()
+                        self.__drained.wait()
+        self.queue.append(record)
+        if len(self.queue) >= self.__queueSize//2:
+            self.__wakeUp.set()
+
+
+
+    def __start(self):
+        """
+        Starts the background thread unless another thread did it already.
+        Also used after the handler was closed.
+
+        Parameters
+        ----------
+
+        """
+        with self.__startLock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name='QueueLogHandler', daemon=True)
+                self.__thread.start()
+
+
+
+    def __run(self):
+        """
+        Body of the background thread. Writes queued records until the handler is closed,
+        or restarted with another thread.
+
+        Parameters
+        ----------
+
+        """
+        while self.__thread is threading.current_thread():
+            self.__wakeUp.wait(self.__flushInterval)
+            self.__wakeUp.clear()
+            self.__writeQueued()
+
+
+
+    def __writeQueued(self):
+        """
+        Passes all queued records to the handler writing the file and wakes up 
+        the threads waiting for room in the queue.
+
+        Parameters
+        ----------
+
+        """
+        with self.__writeLock:
+            while True:
+                try:
+                    record = self.queue.popleft()
+                except IndexError:
+                    break
+                if record.levelno >= self.__target.level:
+                    self.__target.handle(record)
+            self.__target.flush()
+        with self.__drained:
+            self.__drained.notify_all()
+
+
+
+    def flush(self):
+        """
+        Writes all queued records in the calling thread.
+
+        Parameters
+        ----------
+
+        """
+        self.__writeQueued()
+
+
+
+    def close(self):
+        """
+        Stops the background thread, writes the queued records and closes the handler 
+        writing the file. Can be called many times. Like logging's file handlers, the 
+        handler still works after it is closed, e.g. by logging.config which closes all 
+        handlers; the next record starts the background thread again.
+
+        Parameters
+        ----------
+
+        """
+        with self.__startLock:
+            thread, self.__thread = self.__thread, None
+            self.__wakeUp.set()
+        if thread is not None:
+            thread.join()
+        self.__writeQueued()
+        self.__target.close()
+        super(QueueLogHandler, self).close()
+
+
+
+def _closeHandlers():
+    """
+    Writes the records queued in all handlers when the interpreter exits.
+
+    Parameters
+    ----------
+
+    """
+    for handler in list(_handlers):
+        handler.close()
+
+
+
+def _restartHandlersAfterFork():
+    """
+    Gives all handlers of a forked process their own queues and background threads.
+
+    Parameters
+    ----------
+
+    """
+    for handler in list(_handlers):
+        handler._restartAfterFork()
+
+
+atexit.register(_closeHandlers)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restartHandlersAfterFork)
+
+
+
+def createFileHandler(path='hangman.log', maxBytes=1024*1024, queueSize=10000, overflow=OVERFLOW_DROP_NEW, sampleRates=None, flushInterval=0.1):
+    """
+    Creates the handler writing json lines to a rotating file through a bounded queue.
+    The file is created with the first record.
+
+    Parameters
+    ----------
+    path: string
+        path to the log file
+    maxBytes: int
+        size of the file after which it is rotated
+    queueSize: int
+        maximal number of records waiting to be written
+    overflow: string
+        OVERFLOW_DROP_NEW, OVERFLOW_DROP_OLD or OVERFLOW_BLOCK
+    sampleRates: dict(string, float)
+        fraction of records kept for every event, DEFAULT_SAMPLE_RATES if None
+    flushInterval: float
+        maximal number of seconds a record waits in the queue
+
+    Returns
+    ----------
+    QueueLogHandler
+        the handler to add to a logger
+    """
+    fileHandler = logging.handlers.RotatingFileHandler(path, maxBytes=maxBytes, delay=True)
+    fileHandler.setFormatter(JsonFormatter())
+    return QueueLogHandler(fileHandler, queueSize, overflow, sampleRates, flushInterval)
+
+
+if __name__ == '__main__':
+
+    pass
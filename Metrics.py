@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:12:40 2026
+
+@author: lukasz
+"""
+
+import bisect
+import threading
+
+#upper bounds of the buckets of latency histograms in seconds
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+#content type of the text exposition format of Prometheus
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+COUNTER     = 'counter'
+GAUGE       = 'gauge'
+HISTOGRAM   = 'histogram'
+
+#metrics of the game
+REQUEST_SECONDS     = 'hangman_request_duration_seconds'
+REQUESTS            = 'hangman_requests_total'
+ERRORS              = 'hangman_errors_total'
+ACTIVE_SESSIONS     = 'hangman_active_sessions'
+SCORE_FLUSH_SECONDS = 'hangman_score_flush_duration_seconds'
+SCORES_WRITTEN      = 'hangman_scores_written_total'
+SCORE_FLUSH_ERRORS  = 'hangman_score_flush_errors_total'
+SCORES_DROPPED      = 'hangman_scores_dropped_total'
+LOG_RECORDS_DROPPED = 'hangman_log_records_dropped_total'
+SESSION_CHECKPOINT_SECONDS = 'hangman_session_checkpoint_duration_seconds'
+
+
+class ThreadBucket:
+    """
+    Basically a struct holding the counters and histograms recorded by one thread.
+    Only the owning thread changes it, so recording never takes a lock.
+
+    """
+
+    __slots__ = ('counters', 'histograms')
+
+    def __init__(self):
+        """
+        Constructor of ThreadBucket struct.
+
+        Parameters
+        ----------
+
+        """
+        #(name, labels) -> value
+        self.counters   = dict()
+        #(name, labels) -> count of every bucket, count above the last bound and the sum of values
+        self.histograms = dict()
+
+
+
+class MetricsRegistry:
+    """
+    Collects counters and histograms of the process and renders them in the text format of Prometheus.
+
+    Every thread records into its own ThreadBucket, so threads never wait for each other
+    and the cost of a record is a few dict operations. Buckets are merged only when the
+    metrics are rendered. Buckets of threads which ended are folded into one retired bucket,
+    so threads started for every connection do not make the registry grow. Gauges are not recorded at all; their functions are called when
+    the metrics are rendered.
+
+    Labels are given as tuples of (name, value) pairs, always in the same order.
+
+    """
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        """
+        Constructor of MetricsRegistry.
+
+        Parameters
+        ----------
+        bounds: tuple(float)
+            increasing upper bounds of the buckets of histograms
+
+        """
+        self.__bounds       = tuple(bounds)
+        self.__local        = threading.local()
+        #(thread, its bucket) of every thread which recorded and did not end yet
+        self.__buckets      = []
+        self.__retired      = ThreadBucket()
+        self.__retireAt     = 64
+        self.__lock         = threading.Lock()
+        self.__descriptions = dict()
+        self.__gauges       = dict()
+
+
+
+    def describe(self, name, kind, helpText):
+        """
+        Sets the type and the description of a metric shown in the rendered text.
+
+        Parameters
+        ----------
+        name: string
+            name of the metric
+        kind: string
+            COUNTER, GAUGE or HISTOGRAM
+        helpText: string
+            one line describing the metric
+
+        """
+        self.__descriptions[name] = (kind, helpText)
+
+
+
+    def setGauge(self, name, function):
+        """
+        Sets the function providing the current value of a gauge.
+
+        Parameters
+        ----------
+        name: string
+            name of the gauge
+        function: callable() -> float
+            called every time the metrics are rendered
+
+        """
+        self.__gauges[name] = function
+
+
+
+    def __bucket(self):
+        """
+        Provides the bucket of the calling thread, creating it with the first record of the thread.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        ThreadBucket
+            the bucket of the thread
+        """
+        try:
+            return self.__local.bucket
+        except AttributeError:
+            bucket = self.__local.bucket = ThreadBucket()
+            with self.__lock:
+                self.__buckets.append((threading.current_thread(), bucket))
+                #ended threads are looked for only when the list doubled, so it costs O(1) per thread
+                if len(self.__buckets) >= self.__retireAt:
+                    self.__retireEnded()
+                    self.__retireAt = max(64, 2*len(self.__buckets))
+            return bucket
+
+
+
+    def __retireEnded(self):
+        """
+        Folds buckets of threads which ended into the retired bucket and forgets them.
+        Nothing records into them any more. Lock has to be held by the caller.
+
+        Parameters
+        ----------
+
+        """
+        alive = []
+        for thread, bucket in self.__buckets:
+            if thread.is_alive():
+                alive.append((thread, bucket))
+            else:
+                self.__merge(self.__retired, bucket)
+        self.__buckets = alive
+
+
+
+    @staticmethod
+    def __merge(target, bucket):
+        """
+        Adds counters and histograms of a bucket to the target bucket.
+
+        Parameters
+        ----------
+        target: ThreadBucket
+            the bucket which is changed
+        bucket: ThreadBucket
+            the added bucket, which may still be changed by its thread
+
+        """
+        #copying a dict does not let other threads in, so the owner may go on recording meanwhile
+        for key, value in list(bucket.counters.items()):
+            target.counters[key] = target.counters.get(key, 0)+value
+        for key, counts in list(bucket.histograms.items()):
+            merged = target.histograms.get(key)
+            if merged is None:
+                target.histograms[key] = list(counts)
+            else:
+                for i, count in enumerate(counts):
+                    merged[i] += count
+
+
+
+    def increment(self, name, labels=(), amount=1):
+        """
+        Increases a counter.
+
+        Parameters
+        ----------
+        name: string
+            name of the counter
+        labels: tuple(tuple(string, string))
+            labels of the counter
+        amount: float
+            the increase
+
+        """
+        counters = self.__bucket().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0)+amount
+
+
+
+    def observe(self, name, value, labels=()):
+        """
+        Adds a value to a histogram.
+
+        Parameters
+        ----------
+        name: string
+            name of the histogram
+        value: float
+            the value, e.g. seconds
+        labels: tuple(tuple(string, string))
+            labels of the histogram
+
+        """
+        histograms = self.__bucket().histograms
+        key = (name, labels)
+        counts = histograms.get(key)
+        if counts is None:
+            counts = histograms[key] = [0]*(len(self.__bounds)+1)+[0.0]
+        counts[bisect.bisect_left(self.__bounds, value)] += 1
+        counts[-1] += value
+
+
+
+    def observeRequest(self, route, status, seconds):
+        """
+        Records one request handled by the api.
+
+        Parameters
+        ----------
+        route: string
+            path of the route
+        status: int
+            status code of the response
+        seconds: float
+            time of handling the request
+
+        """
+        self.observe(REQUEST_SECONDS, seconds, (('route', route),))
+        labels = (('route', route), ('status', str(status)))
+        self.increment(REQUESTS, labels)
+        if status >= 400:
+            self.increment(ERRORS, labels)
+
+
+
+    def collect(self):
+        """
+        Merges the buckets of all threads.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        tuple(dict, dict)
+            counters and histograms by name and labels, summed over all threads
+        """
+        total = ThreadBucket()
+        with self.__lock:
+            self.__retireEnded()
+            self.__merge(total, self.__retired)
+            buckets = [bucket for _, bucket in self.__buckets]
+        for bucket in buckets:
+            self.__merge(total, bucket)
+        return total.counters, total.histograms
+
+
+
+    def render(self):
+        """
+        Renders all metrics in the text format of Prometheus.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        string
+            the metrics, one sample per line
+        """
+        counters, histograms = self.collect()
+        samples = dict()
+        for (name, labels), value in sorted(counters.items()):
+            samples.setdefault(name, []).append(self.__sample(name, labels, value))
+        for (name, labels), counts in sorted(histograms.items()):
+            lines = samples.setdefault(name, [])
+            cumulative = 0
+            for bound, count in zip(self.__bounds+(float('inf'),), counts):
+                cumulative += count
+                lines.append(self.__sample(name+'_bucket', labels+(('le', '+Inf' if bound == float('inf') else repr(bound)),), cumulative))
+            lines.append(self.__sample(name+'_sum', labels, counts[-1]))
+            lines.append(self.__sample(name+'_count', labels, cumulative))
+        for name, function in self.__gauges.items():
+            samples.setdefault(name, []).append(self.__sample(name, (), function()))
+        text = []
+        for name in sorted(samples):
+            description = self.__descriptions.get(name)
+            if description is not None:
+                text.append('# HELP '+name+' '+description[1])
+                text.append('# TYPE '+name+' '+description[0])
+            text.extend(samples[name])
+        return '\n'.join(text)+'\n'
+
+
+
+    @staticmethod
+    def __sample(name, labels, value):
+        """
+        Renders one sample.
+
+        Parameters
+        ----------
+        name: string
+            name of the sample
+        labels: tuple(tuple(string, string))
+            labels of the sample
+        value: float
+            value of the sample
+
+        Returns
+        ----------
+        string
+            the line of the sample
+        """
+        if len(labels) > 0:
+            escaped = [(label, labelValue.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for label, labelValue in labels]
+            name += '{'+','.join(label+'="'+labelValue+'"' for label, labelValue in escaped)+'}'
+        return name+' '+(repr(value) if isinstance(value, float) else str(value))
+
+
+
+#All metrics of the process are kept in one registry.
+
+registry = MetricsRegistry()
+registry.describe(REQUEST_SECONDS,      HISTOGRAM,  'Time of handling api requests by route')
+registry.describe(REQUESTS,             COUNTER,    'Api requests by route and status code')
+registry.describe(ERRORS,               COUNTER,    'Api requests answered with an error by route and status code')
+registry.describe(ACTIVE_SESSIONS,      GAUGE,      'Games kept by the api')
+registry.describe(SCORE_FLUSH_SECONDS,  HISTOGRAM,  'Time of saving a batch of scores')
+registry.describe(SCORES_WRITTEN,       COUNTER,    'Saved scores')
+registry.describe(SCORE_FLUSH_ERRORS,   COUNTER,    'Batches of scores which could not be saved')
+registry.describe(SCORES_DROPPED,       COUNTER,    'Scores dropped because the queue of scores waiting to be saved was full')
+registry.describe(LOG_RECORDS_DROPPED,  COUNTER,    'Log records dropped because the queue of the log was full')
+registry.describe(SESSION_CHECKPOINT_SECONDS, HISTOGRAM, 'Time of saving all live games to the checkpoint file')
+
+
+if __name__ == '__main__':
+
+    pass
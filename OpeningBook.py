@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:41:19 2026
+
+@author: lukasz
+"""
+
+import os
+import sys
+import time
+import array
+import bisect
+import struct
+import argparse
+
+import Solver
+
+#magic, version, fingerprint of the words, number of lengths, nodes and edges
+BOOK_MAGIC      = b'HANGBOOK'
+BOOK_VERSION    = 1
+BOOK_HEADER     = struct.Struct('<8sI20sIII')
+
+
+class OpeningBook:
+    """
+    Decision tree of Solver.Solver precomputed for a fixed set of words. The guess of
+    the solver depends only on the patterns revealed so far, so a game which follows
+    the book gets every guess with a lookup instead of measuring all characters.
+
+    Every node is a state of a game. It holds the guess of the solver and its children,
+    one for every pattern the guess can reveal. Nodes are kept in flat arrays: the code
+    of the guess, the position of the first child, and masks and nodes of children
+    sorted by the mask. States with at most one candidate or with no attempts left are
+    not kept, since the solver does not need to choose a guess there.
+
+    """
+
+    def __init__(self, fingerprint, roots, guesses, childStarts, childMasks, childNodes):
+        """
+        Constructor of OpeningBook. Use build or load to create a book.
+
+        Parameters
+        ----------
+        fingerprint: bytes
+            Solver.WordIndex.fingerprint of the words the book was built for
+        roots: dict(int, int)
+            the first node of games of every word length
+        guesses: array.array('B')
+            code of the guessed character of every node
+        childStarts: array.array('I')
+            position of the first child of every node in childMasks and childNodes,
+            followed by the number of all children
+        childMasks: array.array('Q')
+            patterns revealed by the guesses
+        childNodes: array.array('I')
+            nodes reached after the patterns
+
+        """
+        self.__fingerprint  = fingerprint
+        self.__roots        = roots
+        self.__guesses      = guesses
+        self.__childStarts  = childStarts
+        self.__childMasks   = childMasks
+        self.__childNodes   = childNodes
+
+
+
+    @property
+    def fingerprint(self):
+        return self.__fingerprint
+
+
+    @property
+    def lengths(self):
+        return sorted(self.__roots)
+
+
+
+    def root(self, length):
+        """
+        Provides the node of a game which has just started.
+
+        Parameters
+        ----------
+        length: int
+            length of the word to guess
+
+        Returns
+        ----------
+        int
+            the node, None if the book has no games of the length
+        """
+        return self.__roots.get(length)
+
+
+
+    def guess(self, node):
+        """
+        Provides the guess of the solver in the state of the node.
+
+        Parameters
+        ----------
+        node: int
+            the node
+
+        Returns
+        ----------
+        string
+            the character to guess
+        """
+        return chr(self.__guesses[node])
+
+
+
+    def child(self, node, mask):
+        """
+        Provides the node reached when the guess of the node reveals the pattern.
+
+        Parameters
+        ----------
+        node: int
+            the node
+        mask: int
+            bitmask of positions at which the guess was revealed
+
+        Returns
+        ----------
+        int
+            the child node, None if the game leaves the book
+        """
+        start, end = self.__childStarts[node], self.__childStarts[node+1]
+        position = bisect.bisect_left(self.__childMasks, mask, start, end)
+        if position < end and self.__childMasks[position] == mask:
+            return self.__childNodes[position]
+        return None
+
+
+
+    def __len__(self):
+        return len(self.__guesses)
+
+
+
+    @classmethod
+    def build(cls, wordIndex, depth=None, maxAttempts=5, lengths=None):
+        """
+        Plays every possible game of the solver on the words and records its guesses.
+        Words longer than 64 characters or with non-ASCII characters are left out.
+
+        Parameters
+        ----------
+        wordIndex: Solver.WordIndex
+            the words
+        depth: int
+            number of the first guesses kept, the whole games if None
+        maxAttempts: int
+            number of wrong guesses which ends the game
+        lengths: list(int)
+            word lengths to build the book for, all if None
+
+        Returns
+        ----------
+        OpeningBook
+            the book
+        """
+        guesses     = array.array('B')
+        children    = []
+
+        def expand(candidates, attempted, misses, movesLeft):
+            if len(candidates) <= 1 or misses >= maxAttempts or movesLeft == 0:
+                return None
+            character = Solver.chooseCharacter(candidates, attempted)
+            if character is None:
+                return None
+            node = len(guesses)
+            guesses.append(ord(character))
+            children.append([])
+            attempted = attempted | {character}
+            for mask, part in candidates.partition(character):
+                childNode = expand(part, attempted, misses + (1 if mask == 0 else 0), None if movesLeft is None else movesLeft-1)
+                if childNode is not None:
+                    children[node].append((mask, childNode))
+            return node
+
+        roots = dict()
+        for length in (wordIndex.lengths if lengths is None else lengths):
+            group = wordIndex.group(length)
+            if length > 64 or not all(word.isascii() for word in group.words):
+                continue
+            root = expand(group.createCandidates(), frozenset(), 0, depth)
+            if root is not None:
+                roots[length] = root
+
+        childStarts = array.array('I', [0])
+        childMasks  = array.array('Q')
+        childNodes  = array.array('I')
+        for edges in children:
+            for mask, childNode in sorted(edges):
+                childMasks.append(mask)
+                childNodes.append(childNode)
+            childStarts.append(len(childMasks))
+        return cls(wordIndex.fingerprint, roots, guesses, childStarts, childMasks, childNodes)
+
+
+
+    def toBinary(self, path):
+        """
+        Saves the book in the binary format which can be opened with load.
+
+        Parameters
+        ----------
+        path: string
+            path to the file
+
+        """
+        lengthTable = array.array('I')
+        for length in sorted(self.__roots):
+            lengthTable.extend((length, self.__roots[length]))
+        sections = [lengthTable, array.array('B', self.__guesses), array.array('I', self.__childStarts),
+                    array.array('Q', self.__childMasks), array.array('I', self.__childNodes)]
+        if sys.byteorder != 'little':
+            for section in sections:
+                section.byteswap()
+        temporaryPath = path+'.tmp'
+        with open(temporaryPath, 'wb') as f:
+            f.write(BOOK_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, self.__fingerprint, len(self.__roots), len(self.__guesses), len(self.__childMasks)))
+            for section in sections:
+                f.write(b'\0'*(self.__align(f.tell())-f.tell()))
+                f.write(section)
+            f.write(b'\0'*(self.__align(f.tell())-f.tell()))
+        os.replace(temporaryPath, path)
+
+
+
+    @classmethod
+    def load(cls, path):
+        """
+        Opens a book saved with toBinary.
+
+        If the file is not a book of the current version, raises ValueError.
+
+        Parameters
+        ----------
+        path: string
+            path to the file
+
+        Returns
+        ----------
+        OpeningBook
+            the book
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < BOOK_HEADER.size:
+            raise ValueError("Not an opening book file: "+path)
+        magic, version, fingerprint, numberOfLengths, numberOfNodes, numberOfEdges = BOOK_HEADER.unpack_from(data)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            raise ValueError("Not an opening book file of version "+str(BOOK_VERSION)+": "+path)
+        layout = [('I', 2*numberOfLengths), ('B', numberOfNodes), ('I', numberOfNodes+1), ('Q', numberOfEdges), ('I', numberOfEdges)]
+        sections, position = [], cls.__align(BOOK_HEADER.size)
+        for typecode, count in layout:
+            section = array.array(typecode)
+            size = section.itemsize*count
+            if position+size > len(data):
+                raise ValueError("Opening book file is truncated: "+path)
+            section.frombytes(data[position:position+size])
+            if sys.byteorder != 'little':
+                section.byteswap()
+            sections.append(section)
+            position += cls.__align(size)
+        lengthTable = sections[0]
+        roots = {lengthTable[i]: lengthTable[i+1] for i in range(0, len(lengthTable), 2)}
+        return cls(fingerprint, roots, *sections[1:])
+
+
+
+    @staticmethod
+    def __align(position):
+        """
+        Rounds the position up to the multiple of 8.
+
+        Parameters
+        ----------
+        position: int
+            position in the binary file
+
+        Returns
+        ----------
+        int
+            the aligned position
+        """
+        return (position+7)//8*8
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Builds the opening book of the bot for a file with words, one per line')
+
+    parser.add_argument('words',
+                        help='file with the words the server chooses from')
+
+    parser.add_argument('book',
+                        help='path of the created book')
+
+    parser.add_argument('--depth', type=int,
+                        help='number of the first guesses kept in the book. Whole games if not given')
+
+    parser.add_argument('--attempts', type=int, default=5,
+                        help='number of wrong guesses which ends the game')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    book = OpeningBook.build(Solver.WordIndex(Solver.readWords(args.words)), args.depth, args.attempts)
+    book.toBinary(args.book)
+    print("{0} nodes, {1} bytes, built in {2:.1f} s".format(len(book), os.path.getsize(args.book), time.perf_counter()-start))
@@ -0,0 +1,1369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:02:37 2026
+
+@author: lukasz
+"""
+
+import os
+import io
+import csv
+import bisect
+import time
+import atexit
+import logging
+import threading
+
+import Logs
+import Metrics
+
+
+#Format of the dates saved in scores.csv. It is the same one pandas used
+#to write DatetimeIndex, so old and new entries can be mixed in one file.
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+FSYNC_NEVER = 'never'
+FSYNC_BATCH = 'batch'
+FSYNC_CLOSE = 'close'
+
+#the logger of the game, configured by Game
+logger = logging.getLogger('HangmanLogger')
+
+
+class ScoreStorageError(Exception):
+    """
+    Exception raised when scores could not be stored or read.
+
+    """
+
+
+
+class ScoreWriter:
+    """
+    Append-only writer of scores.csv.
+    Scores are queued in memory and written in batches by a background thread,
+    so the game which ends does not wait for any disk I/O. A batch is written
+    when flushSize scores are queued or flushInterval seconds passed.
+    A batch which could not be written is logged, counted in Metrics.registry and
+    written again after flushInterval. At most maxPending scores wait in the queue;
+    what happens to a score which does not fit is chosen by the overflow policy.
+
+    """
+
+    def __init__(self, path='scores.csv', flushInterval=1.0, flushSize=256, fsyncPolicy=FSYNC_NEVER,
+                 maxPending=100000, overflow=Logs.OVERFLOW_DROP_NEW):
+        """
+        Constructor of ScoreWriter. Starts the background thread.
+
+        Parameters
+        ----------
+        path: string
+            path to the csv file with scores
+        flushInterval: float
+            maximal number of seconds a score waits in memory
+        flushSize: int
+            number of queued scores which triggers writing before flushInterval passes
+        fsyncPolicy: string
+            FSYNC_NEVER leaves syncing to the system, FSYNC_BATCH syncs after every
+            written batch and FSYNC_CLOSE syncs once when the writer is closed
+        maxPending: int
+            maximal number of scores waiting in memory
+        overflow: string
+            Logs.OVERFLOW_DROP_NEW or Logs.OVERFLOW_DROP_OLD drop the new or the oldest score
+            when the queue is full, Logs.OVERFLOW_BLOCK makes append wait until it is written
+
+        """
+        if fsyncPolicy not in (FSYNC_NEVER, FSYNC_BATCH, FSYNC_CLOSE):
+            raise ValueError("Unknown fsync policy: "+str(fsyncPolicy))
+        if overflow not in (Logs.OVERFLOW_DROP_NEW, Logs.OVERFLOW_DROP_OLD, Logs.OVERFLOW_BLOCK):
+            raise ValueError("Unknown overflow policy: "+str(overflow))
+        self.__path             = path
+        self.__flushInterval    = flushInterval
+        self.__flushSize        = flushSize
+        self.__fsyncPolicy      = fsyncPolicy
+        self.__maxPending       = maxPending
+        self.__overflow         = overflow
+        self.__pending          = []
+        self.__inFlight         = 0
+        self.__failing          = False
+        self.__closed           = False
+        self.__condition        = threading.Condition()
+        self.__fileLock         = threading.Lock()
+        self.__thread           = threading.Thread(target=self.__run, name='ScoreWriter', daemon=True)
+        self.__thread.start()
+        atexit.register(self.close)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self.__restartAfterFork)
+
+
+
+    def __restartAfterFork(self):
+        """
+        Gives a forked process its own locks and background thread, which are not
+        copied by fork. Scores queued before the fork are left to the parent process.
+
+        Parameters
+        ----------
+
+        """
+        self.__pending          = []
+        self.__inFlight         = 0
+        self.__failing          = False
+        self.__condition        = threading.Condition()
+        self.__fileLock         = threading.Lock()
+        if not self.__closed:
+            self.__thread       = threading.Thread(target=self.__run, name='ScoreWriter', daemon=True)
+            self.__thread.start()
+
+
+
+    @property
+    def path(self):
+        return self.__path
+
+
+
+    @property
+    def fsyncPolicy(self):
+        return self.__fsyncPolicy
+
+
+
+    def append(self, date, name, score):
+        """
+        Queues a score to be written. Never touches the disk, but with Logs.OVERFLOW_BLOCK
+        it waits while the queue is full.
+
+        If the writer is closed, raises ScoreStorageError.
+
+        Parameters
+        ----------
+        date: datetime.datetime
+            time when the game ended
+        name: string
+            the name of the user
+        score: float
+            the score of the game
+
+        """
+        with self.__condition:
+            if self.__closed:
+                raise ScoreStorageError("Score writer is closed")
+            #scores being written count as well, since a batch which fails is queued again
+            if len(self.__pending)+self.__inFlight >= self.__maxPending:
+                if self.__overflow == Logs.OVERFLOW_DROP_NEW or (self.__overflow == Logs.OVERFLOW_DROP_OLD and len(self.__pending) == 0):
+                    Metrics.registry.increment(Metrics.SCORES_DROPPED)
+                    return
+                if self.__overflow == Logs.OVERFLOW_DROP_OLD:
+                    del self.__pending[0]
+                    Metrics.registry.increment(Metrics.SCORES_DROPPED)
+                else:
+                    #appenders are woken whenever a batch is written
+                    while len(self.__pending)+self.__inFlight >= self.__maxPending and not self.__closed:
+                        self.__condition.wait()
+                    if self.__closed:
+                        raise ScoreStorageError("Score writer is closed")
+            self.__pending.append((date.strftime(DATE_FORMAT), name, score))
+            if len(self.__pending) >= self.__flushSize:
+                self.__condition.notify_all()
+
+
+
+    def flush(self):
+        """
+        Writes all queued scores to the file in the calling thread.
+
+        If the scores could not be written, raises ScoreStorageError. They stay queued
+        and are written again by the background thread.
+
+        Parameters
+        ----------
+
+        """
+        with self.__fileLock:
+            with self.__condition:
+                batch, self.__pending = self.__pending, []
+                self.__inFlight = len(batch)
+            if len(batch) > 0:
+                error = self.__writeBatch(batch)
+                if error is not None:
+                    raise ScoreStorageError(error)
+
+
+
+    def close(self):
+        """
+        Stops the background thread and writes the remaining scores.
+        Can be called many times.
+
+        Parameters
+        ----------
+
+        """
+        with self.__condition:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__condition.notify_all()
+        self.__thread.join()
+        with self.__fileLock:
+            batch, self.__pending = self.__pending, []
+            if len(batch) > 0:
+                self.__writeBatch(batch)
+            self._finishWriting()
+
+
+
+    def __writeBatch(self, batch):
+        """
+        Writes a batch of scores with _writeRows. If it fails, the problem is logged
+        and the batch is queued again, as far as the queue's bound lets it.
+        Time of the write is recorded in Metrics.registry.
+        File lock has to be held by the caller, who took the batch from the queue.
+
+        Parameters
+        ----------
+        batch: list(tuple(string, string, float))
+            scores to write
+
+        Returns
+        ----------
+        string
+            the problem if the batch could not be written, None otherwise
+        """
+        start = time.perf_counter()
+        try:
+            self._writeRows(batch)
+        except Exception as e:
+            Metrics.registry.increment(Metrics.SCORE_FLUSH_ERRORS)
+            logger.error("Scores could not be saved to "+self.__path+": "+str(e), extra={'event': 'scoreWriteProblem', 'fields': {'path': self.__path, 'scores': len(batch)}})
+            with self.__condition:
+                self.__pending[:0] = batch
+                self.__inFlight = 0
+                #blocked appenders wait for room, so only the drop policies trim the queue
+                excess = len(self.__pending)-self.__maxPending
+                if excess > 0 and self.__overflow != Logs.OVERFLOW_BLOCK:
+                    if self.__overflow == Logs.OVERFLOW_DROP_NEW:
+                        del self.__pending[-excess:]
+                    else:
+                        del self.__pending[:excess]
+                    Metrics.registry.increment(Metrics.SCORES_DROPPED, amount=excess)
+                self.__failing = True
+            return str(e)
+        with self.__condition:
+            self.__inFlight = 0
+            self.__failing = False
+            self.__condition.notify_all()
+        Metrics.registry.observe(Metrics.SCORE_FLUSH_SECONDS, time.perf_counter()-start)
+        Metrics.registry.increment(Metrics.SCORES_WRITTEN, amount=len(batch))
+        return None
+
+
+
+    def _writeRows(self, batch):
+        """
+        Appends a batch of scores to the file with a single write. Subclasses
+        override it to keep scores elsewhere. File lock is held by the caller.
+
+        Parameters
+        ----------
+        batch: list(tuple(string, string, float))
+            dates in DATE_FORMAT, user names and scores
+
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerows(batch)
+        with open(self.__path, 'ab') as f:
+            if f.tell() == 0:
+                f.write(b'date,name,score\n')
+            f.write(buffer.getvalue().encode('utf8'))
+            f.flush()
+            if self.__fsyncPolicy == FSYNC_BATCH:
+                os.fsync(f.fileno())
+
+
+
+    def _finishWriting(self):
+        """
+        Called once by close after the last batch is written. Syncs the file
+        if fsync policy says so. File lock is held by the caller.
+
+        Parameters
+        ----------
+
+        """
+        if self.__fsyncPolicy == FSYNC_CLOSE and os.path.exists(self.__path):
+            with open(self.__path, 'ab') as f:
+                os.fsync(f.fileno())
+
+
+
+    def __run(self):
+        """
+        Body of the background thread. Writes queued scores until the writer is closed.
+
+        Parameters
+        ----------
+
+        """
+        while True:
+            with self.__condition:
+                if not self.__closed and (len(self.__pending) < self.__flushSize or self.__failing):
+                    self.__condition.wait(self.__flushInterval)
+                if self.__closed:
+                    return
+            with self.__fileLock:
+                with self.__condition:
+                    batch, self.__pending = self.__pending, []
+                    self.__inFlight = len(batch)
+                if len(batch) > 0:
+                    self.__writeBatch(batch)
+
+
+
+
+class UserStats:
+    """
+    Basically a struct holding running aggregates of one user's scores.
+
+    """
+
+    __slots__ = ('count', 'total', 'best')
+
+    def __init__(self):
+        """
+        Constructor of UserStats struct.
+
+        Parameters
+        ----------
+
+        """
+        self.count  = 0
+        self.total  = 0.0
+        self.best   = None
+
+
+
+    def add(self, score):
+        """
+        Updates the aggregates with a new score.
+
+        Parameters
+        ----------
+        score: float
+            the new score of the user
+
+        """
+        self.count += 1
+        self.total += score
+        if self.best is None or score > self.best:
+            self.best = score
+
+
+
+    def copy(self):
+        """
+        Creates an independent copy of the aggregates.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        UserStats
+            the copy
+        """
+        stats = UserStats()
+        stats.count = self.count
+        stats.total = self.total
+        stats.best  = self.best
+        return stats
+
+
+
+    @property
+    def average(self):
+        return self.total/self.count if self.count > 0 else None
+
+
+
+class ScoreIndex:
+    """
+    In-memory index of scores.csv. The file is parsed once and afterwards only
+    the bytes appended since the previous refresh are read, so the cost of a 
+    refresh does not grow with the history. Besides all scores in the order of
+    the file, the index keeps them sorted by score and by date, and running
+    aggregates of every user, so leaderboard queries never scan the history.
+
+    """
+
+    def __init__(self, path='scores.csv'):
+        """
+        Constructor of ScoreIndex. Does not read the file yet.
+
+        Parameters
+        ----------
+        path: string
+            path to the csv file with scores
+
+        """
+        self.__path     = path
+        self.__lock     = threading.Lock()
+        self.__reset()
+
+
+
+    def __reset(self):
+        """
+        Forgets everything read so far.
+
+        Parameters
+        ----------
+
+        """
+        self.__offset   = 0
+        self.__records  = []
+        self.__byScore  = []
+        self.__byDate   = []
+        self.__users    = dict()
+
+
+
+    def refresh(self):
+        """
+        Reads the scores appended to the file since the previous call.
+        Missing file is treated as empty. If the file became shorter, it is read again from the beginning.
+        Malformed rows are logged and skipped, so they do not stop reading of the following ones.
+
+        If the file could not be read, raises ScoreStorageError.
+
+        Parameters
+        ----------
+
+        """
+        with self.__lock:
+            try:
+                with open(self.__path, 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    if size < self.__offset:
+                        self.__reset()
+                    if size == self.__offset:
+                        return
+                    f.seek(self.__offset)
+                    data = f.read(size - self.__offset)
+            except FileNotFoundError:
+                self.__reset()
+                return
+            except Exception as e:
+                raise ScoreStorageError(str(e))
+            #a line which is still being written is left for the next refresh
+            end = data.rfind(b'\n') + 1
+            if end == 0:
+                return
+            #rows are split only by csv, since names may hold characters which str.splitlines treats as line breaks
+            reader = csv.reader(io.StringIO(data[:end].decode('utf8', errors='replace'), newline=''))
+            for row in reader:
+                if len(row) == 0 or (self.__offset == 0 and reader.line_num == 1 and row[:1] == ['date']):
+                    continue
+                try:
+                    date, name, score = row
+                    score = float(score)
+                except ValueError:
+                    logger.warning("Malformed row of "+self.__path+" skipped: "+repr(row), extra={'event': 'malformedScore', 'fields': {'path': self.__path}})
+                    continue
+                self.__add(date, name, score)
+            self.__offset += end
+
+
+
+    def __add(self, date, name, score):
+        """
+        Adds one score to all structures of the index. Lock has to be held by the caller.
+
+        Parameters
+        ----------
+        date: string
+            time when the game ended
+        name: string
+            the name of the user
+        score: float
+            the score of the game
+
+        """
+        position = len(self.__records)
+        self.__records.append((date, name, score))
+        #scores come mostly in the order of dates, so both insertions usually happen at the end of the lists
+        bisect.insort(self.__byScore, (-score, position))
+        bisect.insort(self.__byDate, (date, position))
+        stats = self.__users.get(name)
+        if stats is None:
+            stats = self.__users[name] = UserStats()
+        stats.add(score)
+
+
+
+    def getPage(self, offset=0, limit=None):
+        """
+        Provides scores in the order they were saved.
+
+        Parameters
+        ----------
+        offset: int
+            number of scores to skip
+        limit: int
+            maximal number of returned scores, all remaining if None
+
+        Returns
+        ----------
+        list(tuple(string, string, float))
+            dates, user names and scores
+        """
+        with self.__lock:
+            end = None if limit is None else offset+limit
+            return self.__records[offset:end]
+
+
+
+    def getTop(self, count):
+        """
+        Provides the best scores. Scores equal to each other are given in the order they were saved.
+
+        Parameters
+        ----------
+        count: int
+            number of requested scores
+
+        Returns
+        ----------
+        list(tuple(string, string, float))
+            dates, user names and scores from the best one
+        """
+        with self.__lock:
+            return [self.__records[position] for _, position in self.__byScore[:count]]
+
+
+
+    def getBetween(self, since=None, until=None, offset=0, limit=None):
+        """
+        Provides scores saved in the given period of time, the oldest first.
+
+        Parameters
+        ----------
+        since: string
+            the earliest date in DATE_FORMAT, no bound if None
+        until: string
+            the date in DATE_FORMAT before which scores have to be saved, no bound if None
+        offset: int
+            number of scores to skip
+        limit: int
+            maximal number of returned scores, all remaining if None
+
+        Returns
+        ----------
+        list(tuple(string, string, float))
+            dates, user names and scores
+        """
+        with self.__lock:
+            start   = 0 if since is None else bisect.bisect_left(self.__byDate, (since, -1))
+            end     = len(self.__byDate) if until is None else bisect.bisect_left(self.__byDate, (until, -1))
+            start   = min(start+offset, end)
+            if limit is not None:
+                end = min(end, start+limit)
+            return [self.__records[position] for _, position in self.__byDate[start:end]]
+
+
+
+    def iterateBetween(self, since=None, until=None, name=None, batchSize=1000):
+        """
+        Provides scores saved in the given period of time, the oldest first, in batches.
+        The lock is held only while one batch is copied, and every batch starts after 
+        the last score of the previous one, so scores added meanwhile do not shift it.
+
+        Parameters
+        ----------
+        since: string
+            the earliest date in DATE_FORMAT, no bound if None
+        until: string
+            the date in DATE_FORMAT before which scores have to be saved, no bound if None
+        name: string
+            the name of the user whose scores are given, all users if None
+        batchSize: int
+            number of scores read at once
+
+        Returns
+        ----------
+        generator(list(tuple(string, string, float)))
+            batches of dates, user names and scores
+        """
+        key = None if since is None else (since, -1)
+        while True:
+            with self.__lock:
+                start   = 0 if key is None else bisect.bisect_right(self.__byDate, key)
+                end     = len(self.__byDate) if until is None else bisect.bisect_left(self.__byDate, (until, -1))
+                entries = self.__byDate[start:min(end, start+batchSize)]
+                batch   = [self.__records[position] for _, position in entries]
+            if len(entries) == 0:
+                return
+            key = entries[-1]
+            if name is not None:
+                batch = [record for record in batch if record[1] == name]
+            if len(batch) > 0:
+                yield batch
+
+
+
+    def getUserStats(self, name):
+        """
+        Provides aggregates of the given user's scores.
+
+        Parameters
+        ----------
+        name: string
+            the name of the user
+
+        Returns
+        ----------
+        UserStats
+            aggregates of the user, None if the user has no scores
+        """
+        with self.__lock:
+            stats = self.__users.get(name)
+            return None if stats is None else stats.copy()
+
+
+
+    def __len__(self):
+        return len(self.__records)
+
+
+
+
+class ScoreStore:
+    """
+    Base class for all storages of scores. The game saves and queries scores through its methods 
+    only, so the storage can be chosen when the game starts. Scores are queued by append and 
+    written in batches in the background; queries read only written scores, so they never wait for
+    writing and do not fail with it, but miss scores appended in the last flushInterval. Only iterate,
+    used to export scores, and flush write the queued scores first.
+
+    Every problem is reported with ScoreStorageError.
+
+    """
+
+    @property
+    def path(self):
+        raise NotImplementedError
+
+
+
+    def append(self, date, name, score):
+        """
+        Queues a score to be saved. Never touches the disk.
+
+        Parameters
+        ----------
+        date: datetime.datetime
+            time when the game ended
+        name: string
+            the name of the user
+        score: float
+            the score of the game
+
+        """
+        raise NotImplementedError
+
+
+
+    def flush(self):
+        """
+        Saves all queued scores in the calling thread.
+
+        Parameters
+        ----------
+
+        """
+        raise NotImplementedError
+
+
+
+    def close(self):
+        """
+        Saves the remaining scores and frees resources of the storage. Can be called many times.
+
+        Parameters
+        ----------
+
+        """
+        raise NotImplementedError
+
+
+
+    def refresh(self):
+        """
+        Prepares the storage for queries, e.g. reads scores saved before the game started,
+        so that the first request does not wait for it.
+
+        Parameters
+        ----------
+
+        """
+        raise NotImplementedError
+
+
+
+    def count(self):
+        """
+        Provides the number of saved scores.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        int
+            the number of scores
+        """
+        raise NotImplementedError
+
+
+
+    def getPage(self, offset=0, limit=None):
+        """
+        Provides scores in the order they were saved.
+
+        Parameters
+        ----------
+        offset: int
+            number of scores to skip
+        limit: int
+            maximal number of returned scores, all remaining if None
+
+        Returns
+        ----------
+        list(tuple(string, string, float))
+            dates in DATE_FORMAT, user names and scores
+        """
+        raise NotImplementedError
+
+
+
+    def getTop(self, count):
+        """
+        Provides the best scores. Scores equal to each other are given in the order they were saved.
+
+        Parameters
+        ----------
+        count: int
+            number of requested scores
+
+        Returns
+        ----------
+        list(tuple(string, string, float))
+            dates in DATE_FORMAT, user names and scores from the best one
+        """
+        raise NotImplementedError
+
+
+
+    def getBetween(self, since=None, until=None, offset=0, limit=None):
+        """
+        Provides scores saved in the given period of time, the oldest first.
+
+        Parameters
+        ----------
+        since: string
+            the earliest date in DATE_FORMAT, no bound if None
+        until: string
+            the date in DATE_FORMAT before which scores have to be saved, no bound if None
+        offset: int
+            number of scores to skip
+        limit: int
+            maximal number of returned scores, all remaining if None
+
+        Returns
+        ----------
+        list(tuple(string, string, float))
+            dates in DATE_FORMAT, user names and scores
+        """
+        raise NotImplementedError
+
+
+
+    def getUserStats(self, name):
+        """
+        Provides aggregates of the given user's scores.
+
+        Parameters
+        ----------
+        name: string
+            the name of the user
+
+        Returns
+        ----------
+        UserStats
+            aggregates of the user, None if the user has no scores
+        """
+        raise NotImplementedError
+
+
+
+    def iterate(self, name=None, since=None, until=None, batchSize=1000):
+        """
+        Provides scores saved in the given period of time, the oldest first, in batches, so that 
+        all of them can be sent without holding them in memory. Queued scores are written first.
+        Problems are raised by the generator.
+
+        Parameters
+        ----------
+        name: string
+            the name of the user whose scores are given, all users if None
+        since: string
+            the earliest date in DATE_FORMAT, no bound if None
+        until: string
+            the date in DATE_FORMAT before which scores have to be saved, no bound if None
+        batchSize: int
+            maximal number of scores in one batch
+
+        Returns
+        ----------
+        generator(list(tuple(string, string, float)))
+            batches of dates in DATE_FORMAT, user names and scores
+        """
+        raise NotImplementedError
+
+
+
+class CsvScoreStore(ScoreStore):
+    """
+    Scores kept in scores.csv. They are appended by ScoreWriter and queried from ScoreIndex,
+    which reads only the part of the file appended since the previous query.
+
+    """
+
+    def __init__(self, path='scores.csv', flushInterval=1.0, flushSize=256, fsyncPolicy=FSYNC_NEVER,
+                 maxPending=100000, overflow=Logs.OVERFLOW_DROP_NEW):
+        """
+        Constructor of CsvScoreStore. Starts the background thread of the writer.
+
+        Parameters
+        ----------
+        path: string
+            path to the csv file with scores
+        flushInterval: float
+            maximal number of seconds a score waits in memory
+        flushSize: int
+            number of queued scores which triggers writing before flushInterval passes
+        fsyncPolicy: string
+            FSYNC_NEVER, FSYNC_BATCH or FSYNC_CLOSE, see ScoreWriter
+        maxPending: int
+            maximal number of scores waiting in memory
+        overflow: string
+            what happens to a score when the queue is full, see ScoreWriter
+
+        """
+        self.__writer   = ScoreWriter(path, flushInterval, flushSize, fsyncPolicy, maxPending, overflow)
+        self.__index    = ScoreIndex(path)
+
+
+
+    @property
+    def path(self):
+        return self.__writer.path
+
+
+
+    def append(self, date, name, score):
+        """
+        Queues a score to be written by the writer.
+
+        """
+        self.__writer.append(date, name, score)
+
+
+
+    def flush(self):
+        """
+        Writes all queued scores in the calling thread.
+
+        """
+        self.__writer.flush()
+
+
+
+    def close(self):
+        """
+        Stops the writer and writes the remaining scores.
+
+        """
+        self.__writer.close()
+
+
+
+    def refresh(self):
+        """
+        Reads the scores appended to the file since the previous call.
+
+        """
+        self.__index.refresh()
+
+
+
+    def __refreshedIndex(self):
+        """
+        Provides the index updated with the scores written since the previous query.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        ScoreIndex
+            the index of the file
+        """
+        self.__index.refresh()
+        return self.__index
+
+
+
+    def count(self):
+        """
+        Provides the number of saved scores.
+
+        """
+        return len(self.__refreshedIndex())
+
+
+
+    def getPage(self, offset=0, limit=None):
+        """
+        Provides scores in the order they were saved, see ScoreStore.getPage.
+
+        """
+        return self.__refreshedIndex().getPage(offset, limit)
+
+
+
+    def getTop(self, count):
+        """
+        Provides the best scores, see ScoreStore.getTop.
+
+        """
+        return self.__refreshedIndex().getTop(count)
+
+
+
+    def getBetween(self, since=None, until=None, offset=0, limit=None):
+        """
+        Provides scores saved in the given period of time, see ScoreStore.getBetween.
+
+        """
+        return self.__refreshedIndex().getBetween(since, until, offset, limit)
+
+
+
+    def getUserStats(self, name):
+        """
+        Provides aggregates of the given user's scores, see ScoreStore.getUserStats.
+
+        """
+        return self.__refreshedIndex().getUserStats(name)
+
+
+
+    def iterate(self, name=None, since=None, until=None, batchSize=1000):
+        """
+        Provides scores saved in the given period of time in batches, see ScoreStore.iterate.
+
+        """
+        self.__writer.flush()
+        yield from self.__refreshedIndex().iterateBetween(since, until, name, batchSize)
+
+
+
+#Schema of the SQLite database of scores. Scores are never deleted, so ids of rows are numbers 1, 2, 3... 
+#in the order scores were saved in, which makes counting and paging lookups instead of scans.
+#Indexes are ordered by the id of the row after their columns, so equal values keep that order.
+#The index of users holds scores as well, so statistics of a user are read from the index alone.
+SQLITE_SCHEMA = \
+[
+ 'CREATE TABLE IF NOT EXISTS scores (id INTEGER PRIMARY KEY, date TEXT NOT NULL, name TEXT NOT NULL, score REAL NOT NULL)',
+ 'CREATE INDEX IF NOT EXISTS scoresByScore ON scores (score DESC)',
+ 'CREATE INDEX IF NOT EXISTS scoresByDate ON scores (date)',
+ 'CREATE INDEX IF NOT EXISTS scoresByName ON scores (name, date, id, score)',
+ ]
+
+#Queries are kept as constants, so every connection compiles each of them once and reuses the prepared statement.
+SQLITE_INSERT       = 'INSERT INTO scores (date, name, score) VALUES (?, ?, ?)'
+SQLITE_COUNT        = 'SELECT COALESCE(MAX(id), 0) FROM scores'
+SQLITE_PAGE         = 'SELECT date, name, score FROM scores WHERE id > ? ORDER BY id LIMIT ?'
+SQLITE_TOP          = 'SELECT date, name, score FROM scores ORDER BY score DESC, id LIMIT ?'
+SQLITE_BETWEEN      = 'SELECT date, name, score FROM scores WHERE date >= ? AND date < ? ORDER BY date, id LIMIT ? OFFSET ?'
+SQLITE_USER_STATS   = 'SELECT COUNT(*), SUM(score), MAX(score) FROM scores WHERE name = ?'
+
+#batches of exported scores start after the date and id of the last score of the previous batch
+SQLITE_EXPORT       = 'SELECT date, id, name, score FROM scores WHERE (date, id) > (?, ?) AND date < ? ORDER BY date, id LIMIT ?'
+SQLITE_EXPORT_USER  = 'SELECT date, id, name, score FROM scores WHERE name = ? AND (date, id) > (?, ?) AND date < ? ORDER BY date, id LIMIT ?'
+
+#bounds used in place of missing dates; every date in DATE_FORMAT sorts between them
+SQLITE_EARLIEST     = ''
+SQLITE_LATEST       = '\uffff'
+
+#synchronous setting of SQLite for every fsync policy. In WAL mode NORMAL loses no
+#transaction when the process crashes, only when the system does.
+SQLITE_SYNCHRONOUS  = {FSYNC_NEVER: 'NORMAL', FSYNC_BATCH: 'FULL', FSYNC_CLOSE: 'NORMAL'}
+
+
+
+def connectSqlite(path, synchronous='NORMAL'):
+    """
+    Opens a connection to the SQLite database of scores. The connection may be used 
+    by many threads, one at a time.
+
+    Parameters
+    ----------
+    path: string
+        path to the database
+    synchronous: string
+        synchronous setting of SQLite
+
+    Returns
+    ----------
+    sqlite3.Connection
+        the connection
+    """
+    import sqlite3
+    connection = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+    connection.execute('PRAGMA synchronous = '+synchronous)
+    return connection
+
+
+
+class SqliteScoreWriter(ScoreWriter):
+    """
+    ScoreWriter inserting batches of scores into the SQLite database, one transaction per batch.
+
+    """
+
+    def __init__(self, path='scores.db', flushInterval=1.0, flushSize=256, fsyncPolicy=FSYNC_NEVER,
+                 maxPending=100000, overflow=Logs.OVERFLOW_DROP_NEW):
+        """
+        Constructor of SqliteScoreWriter. Starts the background thread.
+        The database is opened with the first batch.
+
+        Parameters
+        ----------
+        path: string
+            path to the database
+        flushInterval: float
+            maximal number of seconds a score waits in memory
+        flushSize: int
+            number of queued scores which triggers writing before flushInterval passes
+        fsyncPolicy: string
+            FSYNC_NEVER, FSYNC_BATCH or FSYNC_CLOSE, see ScoreWriter
+        maxPending: int
+            maximal number of scores waiting in memory
+        overflow: string
+            what happens to a score when the queue is full, see ScoreWriter
+
+        """
+        self.__connection = None
+        #registered before the writer restarts its thread in a forked process, which must not use the parent's connection
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self.__forgetConnection)
+        super(SqliteScoreWriter, self).__init__(path, flushInterval, flushSize, fsyncPolicy, maxPending, overflow)
+
+
+
+    def __forgetConnection(self):
+        self.__connection = None
+
+
+
+    def _writeRows(self, batch):
+        """
+        Inserts a batch of scores in one transaction. File lock is held by the caller.
+
+        Parameters
+        ----------
+        batch: list(tuple(string, string, float))
+            dates in DATE_FORMAT, user names and scores
+
+        """
+        if self.__connection is None:
+            self.__connection = connectSqlite(self.path, SQLITE_SYNCHRONOUS[self.fsyncPolicy])
+        with self.__connection:
+            self.__connection.executemany(SQLITE_INSERT, batch)
+
+
+
+    def _finishWriting(self):
+        """
+        Moves the write-ahead log of SQLite to the database, syncing it if fsync policy 
+        says so, and closes the connection. File lock is held by the caller.
+
+        Parameters
+        ----------
+
+        """
+        if self.__connection is None:
+            return
+        try:
+            if self.fsyncPolicy == FSYNC_CLOSE:
+                self.__connection.execute('PRAGMA synchronous = FULL')
+            self.__connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        finally:
+            self.__connection.close()
+            self.__connection = None
+
+
+
+class SqliteScoreStore(ScoreStore):
+    """
+    Scores kept in a SQLite database in WAL mode, so queries never wait for inserts and
+    inserts never wait for queries. Scores are inserted by SqliteScoreWriter in batches.
+    Indexes on scores, dates and user names answer every query without scanning the table.
+    Every thread querying the database uses its own connection.
+
+    """
+
+    def __init__(self, path='scores.db', flushInterval=1.0, flushSize=256, fsyncPolicy=FSYNC_NEVER,
+                 maxPending=100000, overflow=Logs.OVERFLOW_DROP_NEW):
+        """
+        Constructor of SqliteScoreStore. Creates the database if needed and starts the background thread of the writer.
+
+        If the database could not be created, raises ScoreStorageError.
+
+        Parameters
+        ----------
+        path: string
+            path to the database
+        flushInterval: float
+            maximal number of seconds a score waits in memory
+        flushSize: int
+            number of queued scores which triggers writing before flushInterval passes
+        fsyncPolicy: string
+            FSYNC_NEVER, FSYNC_BATCH or FSYNC_CLOSE, see ScoreWriter
+        maxPending: int
+            maximal number of scores waiting in memory
+        overflow: string
+            what happens to a score when the queue is full, see ScoreWriter
+
+        """
+        import sqlite3
+        self.__path     = path
+        self.__local    = threading.local()
+        try:
+            connection = connectSqlite(path)
+            try:
+                connection.execute('PRAGMA journal_mode = WAL')
+                with connection:
+                    for statement in SQLITE_SCHEMA:
+                        connection.execute(statement)
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            raise ScoreStorageError(str(e))
+        self.__writer   = SqliteScoreWriter(path, flushInterval, flushSize, fsyncPolicy, maxPending, overflow)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self.__forgetConnections)
+
+
+
+    def __forgetConnections(self):
+        self.__local = threading.local()
+
+
+
+    @property
+    def path(self):
+        return self.__path
+
+
+
+    def append(self, date, name, score):
+        """
+        Queues a score to be written by the writer.
+
+        """
+        self.__writer.append(date, name, score)
+
+
+
+    def flush(self):
+        """
+        Writes all queued scores in the calling thread.
+
+        """
+        self.__writer.flush()
+
+
+
+    def close(self):
+        """
+        Stops the writer and writes the remaining scores.
+
+        """
+        self.__writer.close()
+
+
+
+    def refresh(self):
+        """
+        Does nothing, since queries read the database directly.
+
+        """
+        pass
+
+
+
+    def __query(self, query, parameters=()):
+        """
+        Runs the query with the connection of the calling thread.
+
+        If the query failed, raises ScoreStorageError.
+
+        Parameters
+        ----------
+        query: string
+            one of the SQLITE_ queries
+        parameters: tuple
+            parameters of the query
+
+        Returns
+        ----------
+        list(tuple)
+            rows of the result
+        """
+        import sqlite3
+        try:
+            connection = getattr(self.__local, 'connection', None)
+            if connection is None:
+                connection = self.__local.connection = connectSqlite(self.__path)
+                connection.execute('PRAGMA query_only = ON')
+            return connection.execute(query, parameters).fetchall()
+        except sqlite3.Error as e:
+            raise ScoreStorageError(str(e))
+
+
+
+    def count(self):
+        """
+        Provides the number of saved scores.
+
+        """
+        return self.__query(SQLITE_COUNT)[0][0]
+
+
+
+    def getPage(self, offset=0, limit=None):
+        """
+        Provides scores in the order they were saved, see ScoreStore.getPage.
+
+        """
+        return self.__query(SQLITE_PAGE, (offset, -1 if limit is None else limit))
+
+
+
+    def getTop(self, count):
+        """
+        Provides the best scores, see ScoreStore.getTop.
+
+        """
+        return self.__query(SQLITE_TOP, (count,))
+
+
+
+    def getBetween(self, since=None, until=None, offset=0, limit=None):
+        """
+        Provides scores saved in the given period of time, see ScoreStore.getBetween.
+
+        """
+        return self.__query(SQLITE_BETWEEN, (SQLITE_EARLIEST if since is None else since, SQLITE_LATEST if until is None else until,
+                                             -1 if limit is None else limit, offset))
+
+
+
+    def getUserStats(self, name):
+        """
+        Provides aggregates of the given user's scores, see ScoreStore.getUserStats.
+
+        """
+        count, total, best = self.__query(SQLITE_USER_STATS, (name,))[0]
+        if count == 0:
+            return None
+        stats = UserStats()
+        stats.count = count
+        stats.total = total
+        stats.best  = best
+        return stats
+
+
+
+    def iterate(self, name=None, since=None, until=None, batchSize=1000):
+        """
+        Provides scores saved in the given period of time in batches, see ScoreStore.iterate.
+        Every batch is read with its own short query, so no transaction stays open while scores are sent.
+
+        """
+        self.__writer.flush()
+        date, rowId = SQLITE_EARLIEST if since is None else since, 0
+        until = SQLITE_LATEST if until is None else until
+        while True:
+            if name is None:
+                rows = self.__query(SQLITE_EXPORT, (date, rowId, until, batchSize))
+            else:
+                rows = self.__query(SQLITE_EXPORT_USER, (name, date, rowId, until, batchSize))
+            if len(rows) == 0:
+                return
+            date, rowId = rows[-1][0], rows[-1][1]
+            yield [(scoreDate, scoreName, score) for scoreDate, _, scoreName, score in rows]
+
+
+
+#storages of scores by name, chosen when the game starts
+STORES = {'csv': CsvScoreStore, 'sqlite': SqliteScoreStore}
+
+#default file of every storage
+DEFAULT_PATHS = {'csv': 'scores.csv', 'sqlite': 'scores.db'}
+
+
+
+def createScoreStore(kind='csv', path=None, flushInterval=1.0, flushSize=256, fsyncPolicy=FSYNC_NEVER,
+                     maxPending=100000, overflow=Logs.OVERFLOW_DROP_NEW):
+    """
+    Creates a storage of scores of the given kind.
+
+    If the storage could not be created, raises ScoreStorageError.
+
+    Parameters
+    ----------
+    kind: string
+        one of STORES
+    path: string
+        path to the file of the storage, its default one from DEFAULT_PATHS if None
+    flushInterval: float
+        maximal number of seconds a score waits in memory
+    flushSize: int
+        number of queued scores which are written at once
+    fsyncPolicy: string
+        FSYNC_NEVER, FSYNC_BATCH or FSYNC_CLOSE, see ScoreWriter
+    maxPending: int
+        maximal number of scores waiting in memory
+    overflow: string
+        what happens to a score when the queue is full, see ScoreWriter
+
+    Returns
+    ----------
+    ScoreStore
+        the storage
+    """
+    if not kind in STORES:
+        raise ValueError("Unknown score storage: "+str(kind))
+    return STORES[kind](DEFAULT_PATHS[kind] if path is None else path, flushInterval, flushSize, fsyncPolicy, maxPending, overflow)
+
+
+if __name__ == '__main__':
+
+    pass
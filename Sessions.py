@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:04 2026
+
+@author: lukasz
+"""
+
+import struct
+import secrets
+import threading
+import time
+import contextlib
+
+import Game
+
+
+class SessionNotFound(Exception):
+    """
+    Exception raised when there is no live game for the given game id.
+
+    """
+
+    def __init__(self, gameId):
+        """
+        Constructor of SessionNotFound.
+
+        Parameters
+        ----------
+        gameId: string
+            the id which could not be found
+
+        """
+        super(SessionNotFound, self).__init__("No game with id "+str(gameId))
+        self.gameId = gameId
+
+
+
+class Session:
+    """
+    Basically a struct holding a game and the time of its last use.
+
+    """
+
+    __slots__ = ('game', 'lastAccess')
+
+    def __init__(self, game, lastAccess):
+        """
+        Constructor of Session struct.
+
+        Parameters
+        ----------
+        game: Game.Core
+            the game played in the session
+        lastAccess: float
+            time.monotonic() of the last use of the session
+
+        """
+        self.game           = game
+        self.lastAccess     = lastAccess
+
+
+
+class SessionRegistry:
+    """
+    Thread-safe in-memory store of games keyed by game id.
+    Sessions are spread over shards and each shard is guarded by its own lock,
+    so requests for different games rarely wait for each other.
+    Sessions which were not used for longer than idleTimeout seconds are evicted by a background
+    thread, which sweeps all shards every sweepInterval seconds from the first use of the registry.
+    With a journal attached, every change of a game is saved, so games survive restarts.
+
+    """
+
+    def __init__(self, numberOfShards=64, idleTimeout=1800.0, sweepInterval=60.0):
+        """
+        Constructor of SessionRegistry.
+
+        Parameters
+        ----------
+        numberOfShards: int
+            number of independently locked parts of the registry
+        idleTimeout: float
+            seconds after which an unused session is evicted
+        sweepInterval: float
+            number of seconds between two sweeps of all shards, and the minimal one between two sweeps of the same shard
+
+        """
+        self.__numberOfShards   = numberOfShards
+        self.__idleTimeout      = idleTimeout
+        self.__sweepInterval    = sweepInterval
+        self.__shards           = [dict() for _ in range(numberOfShards)]
+        self.__locks            = [threading.Lock() for _ in range(numberOfShards)]
+        self.__lastSweeps       = [time.monotonic()]*numberOfShards
+        self.__journal          = None
+        self.__sweeper          = None
+        self.__sweeperLock      = threading.Lock()
+
+
+
+    def attachJournal(self, journal):
+        """
+        Restores the games saved by the journal and starts saving every change of games with it.
+        Restored games are used as if they were used just now.
+
+        Raises Snapshots.SnapshotError.
+
+        Parameters
+        ----------
+        journal: Snapshots.SessionJournal
+            the journal
+
+        Returns
+        ----------
+        int
+            number of restored games
+
+        """
+        states  = journal.restore()
+        now     = time.monotonic()
+        for gameId, state in states.items():
+            index = self.shardIndex(gameId)
+            with self.__locks[index]:
+                self.__shards[index][gameId] = Session(Game.Core(state=state), now)
+        journal.attach(self.collectStates)
+        self.__journal = journal
+        self.__startSweeper()
+        return len(states)
+
+
+
+    def collectStates(self):
+        """
+        Provides states of all games. Each shard's lock is held only while its games are read.
+        A game which cannot be saved is logged and skipped, so it does not stop the checkpoint of the others.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        list(tuple(string, int, bytes))
+            id, version and state as bytes of every game
+
+        """
+        states = []
+        for index in range(self.__numberOfShards):
+            with self.__locks[index]:
+                for gameId, entry in self.__shards[index].items():
+                    try:
+                        states.append((gameId, entry.game.version, entry.game.state.toBytes()))
+                    except (struct.error, ValueError) as e:
+                        Game.logger.error("Game "+gameId+" could not be saved: "+str(e), extra={'event': 'sessionSaveProblem', 'fields': {'gameId': gameId}})
+        return states
+
+
+
+    def shardIndex(self, gameId):
+        """
+        Provides the index of the shard holding the given game id.
+
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+
+        Returns
+        ----------
+        int
+            index of the shard
+
+        """
+        return hash(gameId) % self.__numberOfShards
+
+
+
+    def create(self):
+        """
+        Creates a new session with a not started game.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        string
+            id of the created game
+
+        """
+        gameId  = secrets.token_hex(8)
+        index   = self.shardIndex(gameId)
+        now     = time.monotonic()
+        with self.__locks[index]:
+            self.__shards[index][gameId] = Session(Game.Core(), now)
+            if now - self.__lastSweeps[index] > self.__sweepInterval:
+                self.__sweepShard(index, now)
+        if self.__sweeper is None:
+            self.__startSweeper()
+        return gameId
+
+
+
+    @contextlib.contextmanager
+    def session(self, gameId):
+        """
+        Context manager giving exclusive access to the game of the given id.
+        The shard's lock is held until the block ends, so the game cannot be
+        modified by any other request in the meantime. If the game changed in
+        the block, its new state is recorded by the journal.
+
+        Raises SessionNotFound.
+
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+
+        Returns
+        ----------
+        Game.Core
+            the game of the session
+
+        """
+        index   = self.shardIndex(gameId)
+        now     = time.monotonic()
+        with self.__locks[index]:
+            shard   = self.__shards[index]
+            entry   = shard.get(gameId)
+            if entry is None:
+                raise SessionNotFound(gameId)
+            if now - entry.lastAccess > self.__idleTimeout:
+                del shard[gameId]
+                if self.__journal is not None:
+                    self.__journal.recordRemoval(gameId)
+                raise SessionNotFound(gameId)
+            entry.lastAccess = now
+            version = entry.game.version
+            try:
+                yield entry.game
+            finally:
+                if self.__journal is not None and entry.game.version != version:
+                    self.__journal.recordState(gameId, entry.game.state)
+
+
+
+    def remove(self, gameId):
+        """
+        Removes the session of the given id.
+
+        Raises SessionNotFound.
+
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+
+        """
+        index = self.shardIndex(gameId)
+        with self.__locks[index]:
+            if self.__shards[index].pop(gameId, None) is None:
+                raise SessionNotFound(gameId)
+            if self.__journal is not None:
+                self.__journal.recordRemoval(gameId)
+
+
+
+    def evictIdle(self):
+        """
+        Removes all sessions which were not used for longer than the idle timeout.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        int
+            number of evicted sessions
+
+        """
+        evicted = 0
+        for index in range(self.__numberOfShards):
+            with self.__locks[index]:
+                evicted += self.__sweepShard(index, time.monotonic())
+        return evicted
+
+
+
+    def __startSweeper(self):
+        """
+        Starts the background thread evicting idle sessions, unless it already runs.
+        Without it, games of shards where no new games are created would never be evicted.
+
+        Parameters
+        ----------
+
+        """
+        with self.__sweeperLock:
+            if self.__sweeper is None:
+                self.__sweeper = threading.Thread(target=self.__sweepForever, name='SessionSweeper', daemon=True)
+                self.__sweeper.start()
+
+
+
+    def __sweepForever(self):
+        """
+        Body of the background thread. Evicts idle sessions of all shards every sweepInterval seconds.
+
+        Parameters
+        ----------
+
+        """
+        while True:
+            time.sleep(self.__sweepInterval)
+            try:
+                self.evictIdle()
+            except Exception as e:
+                Game.logger.exception("Problem with evicting idle games: "+str(e), extra={'event': 'sessionSweepProblem'})
+
+
+
+    def __sweepShard(self, index, now):
+        """
+        Removes idle sessions from one shard. Shard's lock has to be held by the caller.
+
+        Parameters
+        ----------
+        index: int
+            index of the shard
+        now: float
+            current time.monotonic()
+
+        Returns
+        ----------
+        int
+            number of evicted sessions
+
+        """
+        shard   = self.__shards[index]
+        expired = [gameId for gameId, entry in shard.items() if now - entry.lastAccess > self.__idleTimeout]
+        for gameId in expired:
+            del shard[gameId]
+            if self.__journal is not None:
+                self.__journal.recordRemoval(gameId)
+        self.__lastSweeps[index] = now
+        return len(expired)
+
+
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.__shards)
+
+
+if __name__ == '__main__':
+
+    pass
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:37:05 2026
+
+@author: lukasz
+"""
+
+import time
+import random
+import concurrent.futures
+
+import Game
+import Solver
+import Dictionary
+import OpeningBook
+
+#dictionary, words of the solvers and the game of the current process, created once by initWorker
+workerDictionary    = None
+workerWordIndex     = None
+workerCore          = None
+
+
+class SimulationResults:
+    """
+    Basically a struct holding running totals of simulated games. Results of
+    different processes are merged with merge.
+
+    """
+
+    __slots__ = ('games', 'wins', 'totalScore', 'guesses', 'moves', 'moveSeconds', 'maxMoveSeconds')
+
+    def __init__(self):
+        """
+        Constructor of SimulationResults struct.
+
+        Parameters
+        ----------
+
+        """
+        self.games          = 0
+        self.wins           = 0
+        self.totalScore     = 0.0
+        self.guesses        = 0
+        self.moves          = 0
+        self.moveSeconds    = 0.0
+        self.maxMoveSeconds = 0.0
+
+
+
+    def add(self, won, score, guesses, moves, moveSeconds, maxMoveSeconds):
+        """
+        Adds the outcome of one game, as returned by playWord.
+
+        Parameters
+        ----------
+        won: bool
+            True if the word was guessed
+        score: float
+            score of the game
+        guesses: int
+            number of guessed characters
+        moves: int
+            number of times the solver chose guesses
+        moveSeconds: float
+            time the solver needed for all moves
+        maxMoveSeconds: float
+            time of the longest move
+
+        """
+        self.games          += 1
+        self.wins           += 1 if won else 0
+        self.totalScore     += score
+        self.guesses        += guesses
+        self.moves          += moves
+        self.moveSeconds    += moveSeconds
+        self.maxMoveSeconds  = max(self.maxMoveSeconds, maxMoveSeconds)
+
+
+
+    def merge(self, other):
+        """
+        Adds the totals of other results.
+
+        Parameters
+        ----------
+        other: SimulationResults
+            the results to add
+
+        """
+        self.games          += other.games
+        self.wins           += other.wins
+        self.totalScore     += other.totalScore
+        self.guesses        += other.guesses
+        self.moves          += other.moves
+        self.moveSeconds    += other.moveSeconds
+        self.maxMoveSeconds  = max(self.maxMoveSeconds, other.maxMoveSeconds)
+
+
+
+    def toDict(self):
+        """
+        Creates a dict with the totals and averages of the results.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        dict(string,...)
+            win rate, average score, guesses per game and time of a move in milliseconds
+        """
+        return \
+        {
+         'games':           self.games,
+         'wins':            self.wins,
+         'winRate':         self.wins/self.games if self.games > 0 else 0.0,
+         'averageScore':    self.totalScore/self.games if self.games > 0 else 0.0,
+         'guessesPerGame':  self.guesses/self.games if self.games > 0 else 0.0,
+         'moveMs':          self.moveSeconds/self.moves*1000.0 if self.moves > 0 else 0.0,
+         'maxMoveMs':       self.maxMoveSeconds*1000.0,
+         }
+
+
+
+def loadWords(dictionaryPath=None, bookPath=None):
+    """
+    Loads the dictionary of the game and the same words for the solvers.
+
+    Parameters
+    ----------
+    dictionaryPath: string
+        text or binary dictionary, Game.DEFAULT_WORDS if None
+    bookPath: string
+        opening book built for the words, none if None
+
+    Returns
+    ----------
+    tuple(Dictionary.WordDictionary, Solver.WordIndex)
+        the dictionary and the words of the solvers
+    """
+    if dictionaryPath is None:
+        dictionary = Dictionary.WordDictionary(Game.DEFAULT_WORDS)
+    else:
+        dictionary = Dictionary.WordDictionary.load(dictionaryPath)
+    wordIndex = Solver.WordIndex(dictionary.getWord(wordId) for wordId in range(len(dictionary)))
+    if bookPath is not None:
+        wordIndex.useOpeningBook(OpeningBook.OpeningBook.load(bookPath))
+    return dictionary, wordIndex
+
+
+
+def initWorker(dictionaryPath=None, bookPath=None):
+    """
+    Loads the words and creates the game once per process, so that every task of the process uses them.
+
+    Parameters
+    ----------
+    dictionaryPath: string
+        text or binary dictionary, Game.DEFAULT_WORDS if None
+    bookPath: string
+        opening book built for the words, none if None
+
+    """
+    global workerDictionary, workerWordIndex, workerCore
+    workerDictionary, workerWordIndex = loadWords(dictionaryPath, bookPath)
+    workerCore = Game.Core(workerDictionary, recordScores=False)
+
+
+
+def playWord(core, wordIndex, strategy, wordId, rng):
+    """
+    Plays one game with the given word.
+    Only the time the solver needs to choose the guesses is counted as the time of a move.
+
+    Parameters
+    ----------
+    core: Game.Core
+        the game, not recording scores
+    wordIndex: Solver.WordIndex
+        words of the solver
+    strategy: string
+        one of Solver.STRATEGIES
+    wordId: int
+        id of the word in the game's dictionary
+    rng: random.Random
+        source of random numbers of the random strategy
+
+    Returns
+    ----------
+    tuple(bool, float, int, int, float, float)
+        outcome of the game as taken by SimulationResults.add
+    """
+    core.start("Simulation", wordId=wordId)
+    solver = Solver.createSolver(strategy, wordIndex, len(core.currentGuess), rng)
+    guessed, moves, moveSeconds, maxMoveSeconds = 0, 0, 0.0, 0.0
+    while core.active:
+        start = time.perf_counter()
+        guesses = solver.remainingCharacters()
+        if len(guesses) == 0:
+            guesses = [solver.chooseGuess()]
+        seconds = time.perf_counter()-start
+        moves           += 1
+        moveSeconds     += seconds
+        maxMoveSeconds   = max(maxMoveSeconds, seconds)
+        for character in guesses:
+            if not core.active:
+                break
+            core.handleNewCharacter(character)
+            guessed     += 1
+            solver.update(character, core.currentGuess)
+    return core.userGuesssed, core.score or 0.0, guessed, moves, moveSeconds, maxMoveSeconds
+
+
+
+def playWords(strategy, wordIds, seed=0):
+    """
+    Plays a game with every given word in the current process. Words and the game are the ones created by initWorker.
+
+    Parameters
+    ----------
+    strategy: string
+        one of Solver.STRATEGIES
+    wordIds: list(int)
+        ids of the words in the game's dictionary
+    seed: int
+        seed of the random strategy, every word gets its own generator
+
+    Returns
+    ----------
+    SimulationResults
+        totals of the games
+    """
+    results = SimulationResults()
+    for wordId in wordIds:
+        results.add(*playWord(workerCore, workerWordIndex, strategy, wordId, random.Random(seed*1000003+wordId)))
+    return results
+
+
+
+def simulate(strategy, dictionaryPath=None, sample=None, seed=0, processes=None, bookPath=None, chunkSize=256):
+    """
+    Plays games with every word of the dictionary, or with a random sample of the words,
+    spreading them over a pool of processes.
+
+    Parameters
+    ----------
+    strategy: string
+        one of Solver.STRATEGIES
+    dictionaryPath: string
+        text or binary dictionary, Game.DEFAULT_WORDS if None
+    sample: int
+        number of words to play, all if None
+    seed: int
+        seed of the sample and of the random strategy
+    processes: int
+        number of processes, the number of cpus if None, the current process only if 1
+    bookPath: string
+        opening book for the entropy strategy, none if None
+    chunkSize: int
+        number of words played by one task
+
+    Returns
+    ----------
+    tuple(SimulationResults, float)
+        totals of all games and the number of seconds they took
+    """
+    if not strategy in Solver.STRATEGIES:
+        raise ValueError("Unknown strategy: "+str(strategy))
+    start = time.perf_counter()
+    dictionary = Dictionary.WordDictionary(Game.DEFAULT_WORDS) if dictionaryPath is None else Dictionary.WordDictionary.load(dictionaryPath)
+    wordIds = list(range(len(dictionary)))
+    if sample is not None and sample < len(wordIds):
+        wordIds = sorted(random.Random(seed).sample(wordIds, sample))
+    chunks = [wordIds[i:i+chunkSize] for i in range(0, len(wordIds), chunkSize)]
+    results = SimulationResults()
+    if processes == 1:
+        initWorker(dictionaryPath, bookPath)
+        for chunk in chunks:
+            results.merge(playWords(strategy, chunk, seed))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(processes, initializer=initWorker, initargs=(dictionaryPath, bookPath)) as executor:
+            for chunkResults in executor.map(playWords, [strategy]*len(chunks), chunks, [seed]*len(chunks)):
+                results.merge(chunkResults)
+    return results, time.perf_counter()-start
+
+
+if __name__ == '__main__':
+
+    pass
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:57:09 2026
+
+@author: lukasz
+"""
+
+import os
+import glob
+import time
+import zlib
+import atexit
+import struct
+import threading
+
+import Game
+import Metrics
+
+#magic bytes, generation of the log following the checkpoint, number of words and fingerprint of the dictionary and number of games
+CHECKPOINT_HEADER   = struct.Struct('<8sII20sI')
+CHECKPOINT_MAGIC    = b'HANGSNP2'
+
+#id of the game, version and length of the state, followed by the state
+CHECKPOINT_ENTRY    = struct.Struct('<8sII')
+
+#crc32 of the rest of the record, id of the game, kind, version and length of the state, followed by the state
+LOG_RECORD          = struct.Struct('<I8sBII')
+
+#kinds of records of the log
+RECORD_STATE        = 1
+RECORD_REMOVE       = 2
+
+
+class SnapshotError(Exception):
+    """
+    Exception raised when saved games could not be read or written.
+
+    """
+
+
+
+class SessionJournal:
+    """
+    Keeps the live games of a SessionRegistry on disk, so that they survive restarts of the server.
+
+    Every change of a game appends a record with its compact Game.GameState to a write-ahead log,
+    which is written by a background thread every flushInterval seconds, so requests never wait
+    for the disk. Every checkpointInterval seconds, or sooner when the log holds checkpointRecords
+    records, all games are saved to the checkpoint file and a new log is started, so the time of
+    recovery depends on the number of live games and not on the history of the server.
+
+    Logs are numbered by generations and the checkpoint says which one follows it. Records carry
+    the version of the state, so a change saved both by the checkpoint and by the log is used once.
+    Records of a log cut off by a crash are recognised by their checksums and skipped.
+    Games are saved with ids of words, so they can be restored only with the same dictionary.
+
+    """
+
+    def __init__(self, path='sessions.snap', flushInterval=0.1, checkpointInterval=60.0, checkpointRecords=100000):
+        """
+        Constructor of SessionJournal. Nothing is written before attach is called.
+
+        Parameters
+        ----------
+        path: string
+            path to the checkpoint file, logs are saved next to it with the generation appended
+        flushInterval: float
+            maximal number of seconds a record waits in memory
+        checkpointInterval: float
+            maximal number of seconds between checkpoints of changed games
+        checkpointRecords: int
+            number of records of the log which triggers a checkpoint before checkpointInterval passes
+
+        """
+        self.__path                 = path
+        self.__flushInterval        = flushInterval
+        self.__checkpointInterval   = checkpointInterval
+        self.__checkpointRecords    = checkpointRecords
+        self.__pending              = bytearray()
+        self.__records              = 0
+        self.__generation           = 0
+        self.__logFile              = None
+        self.__collect              = None
+        self.__closed               = False
+        self.__lock                 = threading.Lock()
+        self.__fileLock             = threading.Lock()
+        self.__wakeUp               = threading.Event()
+        self.__thread               = None
+
+
+
+    @property
+    def path(self):
+        return self.__path
+
+
+
+    def __logPath(self, generation):
+        return self.__path+'.'+str(generation)+'.wal'
+
+
+
+    def restore(self):
+        """
+        Reads the games saved by the checkpoint and the logs following it.
+
+        If the checkpoint was saved with another dictionary or cannot be read, raises SnapshotError.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        dict(string, Game.GameState)
+            states of the saved games by game id
+        """
+        #game id -> (version, state as bytes), decoded only at the end
+        states      = dict()
+        generation  = 0
+        if os.path.exists(self.__path):
+            with open(self.__path, 'rb') as f:
+                data = f.read()
+            try:
+                magic, generation, numberOfWords, fingerprint, count = CHECKPOINT_HEADER.unpack_from(data)
+                if magic != CHECKPOINT_MAGIC:
+                    raise SnapshotError("Not a checkpoint of games: "+self.__path)
+                dictionary = Game.getDictionary()
+                if numberOfWords != len(dictionary) or fingerprint != dictionary.fingerprint:
+                    raise SnapshotError("Games in "+self.__path+" were saved with another dictionary")
+                offset = CHECKPOINT_HEADER.size
+                for _ in range(count):
+                    gameId, version, length = CHECKPOINT_ENTRY.unpack_from(data, offset)
+                    offset += CHECKPOINT_ENTRY.size
+                    states[gameId] = (version, data[offset:offset+length])
+                    offset += length
+            except struct.error:
+                raise SnapshotError("Damaged checkpoint "+self.__path)
+        self.__generation = generation
+        for logGeneration in self.__logGenerations(generation):
+            self.__replay(self.__logPath(logGeneration), states)
+            self.__generation = logGeneration
+        return {gameId.hex(): Game.GameState.fromBytes(state) for gameId, (_, state) in states.items()}
+
+
+
+    def __logGenerations(self, first):
+        """
+        Provides generations of the saved logs which follow the checkpoint.
+
+        Parameters
+        ----------
+        first: int
+            generation following the checkpoint
+
+        Returns
+        ----------
+        list(int)
+            the generations in the order they were written
+        """
+        generations = []
+        for logPath in glob.glob(glob.escape(self.__path)+'.*.wal'):
+            number = logPath[len(self.__path)+1:-len('.wal')]
+            if number.isdigit() and int(number) >= first:
+                generations.append(int(number))
+        return sorted(generations)
+
+
+
+    @staticmethod
+    def __replay(logPath, states):
+        """
+        Applies the records of one log to the states. Reading stops at the first damaged record.
+
+        Parameters
+        ----------
+        logPath: string
+            path to the log
+        states: dict(bytes, tuple(int, bytes))
+            version and state of every game by id, updated in place
+
+        """
+        with open(logPath, 'rb') as f:
+            data = f.read()
+        offset = 0
+        while offset+LOG_RECORD.size <= len(data):
+            checksum, gameId, kind, version, length = LOG_RECORD.unpack_from(data, offset)
+            end = offset+LOG_RECORD.size+length
+            if end > len(data) or zlib.crc32(data[offset+4:end]) != checksum:
+                break
+            if kind == RECORD_STATE:
+                saved = states.get(gameId)
+                if saved is None or version > saved[0]:
+                    states[gameId] = (version, data[offset+LOG_RECORD.size:end])
+            elif kind == RECORD_REMOVE:
+                states.pop(gameId, None)
+            offset = end
+
+
+
+    def attach(self, collect):
+        """
+        Starts saving. A checkpoint of the current games is saved at once, so older logs are no
+        longer needed, and the background thread is started. Saved games have to be restored
+        before, otherwise they are lost.
+
+        Parameters
+        ----------
+        collect: callable() -> list(tuple(string, int, bytes))
+            provides the ids, versions and states as bytes of all live games, e.g. SessionRegistry.collectStates
+
+        """
+        self.__collect = collect
+        self.checkpoint()
+        self.__thread = threading.Thread(target=self.__run, name='SessionJournal', daemon=True)
+        self.__thread.start()
+        atexit.register(self.close)
+
+
+
+    def recordState(self, gameId, state):
+        """
+        Queues a record with the new state of the game. Never touches the disk.
+        A state which cannot be saved is logged and skipped, so the change made
+        by the request is kept in memory anyway.
+
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+        state: Game.GameState
+            the changed state
+
+        """
+        try:
+            self.__append(gameId, RECORD_STATE, state.version, state.toBytes())
+        except (struct.error, ValueError) as e:
+            Game.logger.error("Game "+gameId+" could not be saved: "+str(e), extra={'event': 'sessionSaveProblem', 'fields': {'gameId': gameId}})
+
+
+
+    def recordRemoval(self, gameId):
+        """
+        Queues a record saying that the game was removed. Never touches the disk.
+
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+
+        """
+        self.__append(gameId, RECORD_REMOVE, 0, b'')
+
+
+
+    def __append(self, gameId, kind, version, payload):
+        """
+        Queues one record of the log.
+
+        Parameters
+        ----------
+        gameId: string
+            id of the game
+        kind: int
+            RECORD_STATE or RECORD_REMOVE
+        version: int
+            version of the state
+        payload: bytes
+            the state, if any
+
+        """
+        body = LOG_RECORD.pack(0, bytes.fromhex(gameId), kind, version, len(payload))[4:]+payload
+        with self.__lock:
+            self.__pending += struct.pack('<I', zlib.crc32(body))
+            self.__pending += body
+            self.__records += 1
+            if self.__records >= self.__checkpointRecords:
+                self.__wakeUp.set()
+
+
+
+    def __run(self):
+        """
+        Body of the background thread. Writes queued records and saves checkpoints until the journal is closed.
+
+        Parameters
+        ----------
+
+        """
+        lastCheckpoint = time.monotonic()
+        while not self.__closed:
+            self.__wakeUp.wait(self.__flushInterval)
+            self.__wakeUp.clear()
+            try:
+                now = time.monotonic()
+                if self.__records >= self.__checkpointRecords or (self.__records > 0 and now-lastCheckpoint >= self.__checkpointInterval):
+                    self.checkpoint()
+                    lastCheckpoint = now
+                else:
+                    self.flush()
+            except (OSError, SnapshotError) as e:
+                Game.logger.error("Problem with saving games: "+str(e), extra={'event': 'sessionJournalProblem'})
+            except Exception as e:
+                #the thread has to keep running, otherwise no change of any game would be saved again
+                Game.logger.exception("Unexpected problem with saving games: "+str(e), extra={'event': 'sessionJournalProblem'})
+
+
+
+    def flush(self):
+        """
+        Writes all queued records to the current log in the calling thread.
+
+        Parameters
+        ----------
+
+        """
+        with self.__fileLock:
+            with self.__lock:
+                pending, self.__pending = self.__pending, bytearray()
+            if len(pending) > 0 and self.__logFile is not None:
+                self.__logFile.write(pending)
+                self.__logFile.flush()
+
+
+
+    def checkpoint(self):
+        """
+        Starts a new log and saves all live games to the checkpoint file in the calling thread.
+        The file is replaced atomically, then all logs but the new one are removed.
+        Time of the checkpoint is recorded in Metrics.registry.
+
+        Parameters
+        ----------
+
+        """
+        start = time.perf_counter()
+        with self.__fileLock:
+            with self.__lock:
+                pending, self.__pending = self.__pending, bytearray()
+                self.__records = 0
+                self.__generation += 1
+                generation = self.__generation
+            #records queued until now belong to the previous log, newer ones to the new log
+            if self.__logFile is not None:
+                self.__logFile.write(pending)
+                self.__logFile.close()
+            self.__logFile = open(self.__logPath(generation), 'ab')
+            #states are collected after the new log is started, so every change is either in the checkpoint or in the new log
+            states = self.__collect()
+            dictionary = Game.getDictionary()
+            data = bytearray(CHECKPOINT_HEADER.pack(CHECKPOINT_MAGIC, generation, len(dictionary), dictionary.fingerprint, len(states)))
+            for gameId, version, stateBytes in states:
+                data += CHECKPOINT_ENTRY.pack(bytes.fromhex(gameId), version, len(stateBytes))
+                data += stateBytes
+            temporaryPath = self.__path+'.tmp'
+            with open(temporaryPath, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporaryPath, self.__path)
+            for oldGeneration in self.__logGenerations(0):
+                if oldGeneration != generation:
+                    os.remove(self.__logPath(oldGeneration))
+        Metrics.registry.observe(Metrics.SESSION_CHECKPOINT_SECONDS, time.perf_counter()-start)
+
+
+
+    def close(self):
+        """
+        Stops the background thread and saves the final checkpoint, so the next start
+        does not replay any records. Can be called many times.
+
+        Parameters
+        ----------
+
+        """
+        if self.__closed or self.__collect is None:
+            return
+        self.__closed = True
+        self.__wakeUp.set()
+        self.__thread.join()
+        self.checkpoint()
+        with self.__fileLock:
+            self.__logFile.close()
+
+
+if __name__ == '__main__':
+
+    pass
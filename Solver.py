@@ -0,0 +1,1031 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:06:12 2026
+
+@author: lukasz
+"""
+
+import math
+import array
+import random
+import hashlib
+import itertools
+import threading
+import collections
+
+#NumPy is optional. Without it word groups are kept in the arrays of PatternGroup.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#order of guesses used when no known word matches the game any more
+FALLBACK_ORDER = 'etaoinshrdlcumwfgypbvkjxqz0123456789'
+
+#the longest words kept in MatrixGroup, so that a pattern fits in numpy.uint64
+MAX_MATRIX_LENGTH = 64
+
+#names of the strategies accepted by createSolver
+STRATEGIES = ('entropy', 'frequency', 'random')
+
+#strategies whose guesses depend on the random number generator, the others always play a word the same way
+RANDOMIZED_STRATEGIES = ('random',)
+
+
+def splitEntropy(counts, total):
+    """
+    Computes the entropy of a split of candidates into groups.
+
+    Parameters
+    ----------
+    counts: iterable(int)
+        sizes of the groups
+    total: int
+        number of all candidates
+
+    Returns
+    ----------
+    float
+        the entropy in bits
+
+    """
+    return math.log2(total) - sum(count*math.log2(count) for count in counts)/total
+
+
+
+def chooseCharacter(candidates, attempted):
+    """
+    Chooses the character which splits candidates by the revealed pattern with the
+    biggest entropy. Among equally informative characters the one found in most
+    candidates is preferred, since it costs an attempt least often.
+
+    Parameters
+    ----------
+    candidates: PatternCandidates or MatrixCandidates
+        words still matching the game
+    attempted: set(string)
+        characters which were already attempted
+
+    Returns
+    ----------
+    string
+        the character, None if no candidate has any character not attempted yet
+
+    """
+    best = None
+    bestKey = None
+    total = len(candidates)
+    for character in candidates.characters:
+        if character in attempted:
+            continue
+        entropy, misses = candidates.split(character)
+        if misses == total:
+            continue
+        #rounding lets the number of misses decide between characters splitting candidates the same way
+        key = (round(entropy, 9), -misses, character)
+        if bestKey is None or key > bestKey:
+            best, bestKey = character, key
+    return best
+
+
+
+def getSortedCharacters(possibleWords):
+    """
+    Provides a list of characters which can be found in the possible words.
+    List is soted such that the most frequent characters are in the front.
+
+    Parameters
+    ----------
+    possibleWords: list(string)
+        a list with the words which can be a solution to the game
+        
+    Returns
+    ----------
+    list(string)
+        a sorted list of characters which can be found in the possible words
+    
+    """ 
+    charactersFrequencies = dict()
+    for word in possibleWords:
+        for c in word:
+            if not c in charactersFrequencies:
+                charactersFrequencies[c] = 1
+            else:
+                charactersFrequencies[c] += 1
+    return list(dict(sorted(charactersFrequencies.items(), key = lambda kv:(kv[1], kv[0]), reverse=True)).keys())
+
+
+
+def readWords(path):
+    """
+    Reads words from a file with one word per line.
+
+    Parameters
+    ----------
+    path: string
+        path to the file
+        
+    Returns
+    ----------
+    list(string)
+        lowercased words
+    
+    """
+    with open(path, encoding='utf8') as f:
+        return [line.strip().lower() for line in f if line.strip()]
+
+
+
+class PatternGroup:
+    """
+    Basically a struct holding the words of one length with the reveal pattern of
+    every character in every word. A pattern is the bitmask of positions at which
+    the character is found in the word; 0 if it is not found. Patterns of a character
+    are numbered and kept in one array per character, so the patterns of many words
+    are counted and compared without looking at the words again.
+
+    """
+
+    __slots__ = ('words', 'patternIds', 'patterns')
+
+    def __init__(self, words):
+        """
+        Constructor of PatternGroup struct. Computes the patterns of all words.
+
+        Parameters
+        ----------
+        words: list(string)
+            words of the same length
+
+        """
+        self.words      = words
+        #character -> array of pattern ids by word index, character -> dict(mask, pattern id)
+        self.patternIds = dict()
+        self.patterns   = dict()
+        for index, word in enumerate(words):
+            masks = dict()
+            for position, character in enumerate(word):
+                masks[character] = masks.get(character, 0) | (1 << position)
+            for character, mask in masks.items():
+                ids = self.patterns.get(character)
+                if ids is None:
+                    ids = self.patterns[character] = {0: 0}
+                    self.patternIds[character] = array.array('I', bytes(4*len(words)))
+                patternId = ids.get(mask)
+                if patternId is None:
+                    patternId = ids[mask] = len(ids)
+                self.patternIds[character][index] = patternId
+
+
+
+    def createCandidates(self):
+        """
+        Creates a set of candidates holding all words of the group.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        PatternCandidates
+            the candidates
+        """
+        return PatternCandidates(self)
+
+
+
+class PatternCandidates:
+    """
+    Words of a PatternGroup which still match a game, kept as a list of their indices.
+
+    """
+
+    def __init__(self, group, indices=None):
+        """
+        Constructor of PatternCandidates.
+
+        Parameters
+        ----------
+        group: PatternGroup
+            words of the game's length
+        indices: list(int)
+            indices of the candidates in the group, all words of the group if None
+
+        """
+        self.__group    = group
+        self.__indices  = list(range(len(group.words))) if indices is None else indices
+
+
+
+    @property
+    def characters(self):
+        return self.__group.patternIds.keys()
+
+
+
+    def words(self):
+        return [self.__group.words[index] for index in self.__indices]
+
+
+
+    def count(self, character):
+        """
+        Provides the number of candidates having the character.
+
+        Parameters
+        ----------
+        character: string
+            the character
+
+        Returns
+        ----------
+        int
+            the number of candidates
+        """
+        patternIds = self.__group.patternIds.get(character)
+        if patternIds is None:
+            return 0
+        return len(self.__indices) - list(map(patternIds.__getitem__, self.__indices)).count(0)
+
+
+
+    def split(self, character):
+        """
+        Splits candidates by the pattern the character would reveal.
+
+        Parameters
+        ----------
+        character: string
+            the character to measure
+
+        Returns
+        ----------
+        tuple(float, int)
+            entropy in bits of the split and number of candidates which do not have the character
+
+        """
+        patternIds = self.__group.patternIds.get(character)
+        total = len(self.__indices)
+        if patternIds is None or total == 0:
+            return 0.0, total
+        counts = collections.Counter(map(patternIds.__getitem__, self.__indices))
+        return splitEntropy(counts.values(), total), counts.get(0, 0)
+
+
+
+    def keep(self, character, mask):
+        """
+        Keeps only candidates which reveal the given pattern of the character.
+
+        Parameters
+        ----------
+        character: string
+            the attempted character
+        mask: int
+            bitmask of positions at which the game revealed the character
+
+        """
+        patternIds = self.__group.patternIds.get(character)
+        patternId = None if patternIds is None else self.__group.patterns[character].get(mask)
+        if patternId is None:
+            self.__indices = self.__indices if patternIds is None and mask == 0 else []
+            return
+        self.__indices = list(itertools.compress(self.__indices, map(patternId.__eq__, map(patternIds.__getitem__, self.__indices))))
+
+
+
+    def partition(self, character):
+        """
+        Splits candidates by the pattern the character would reveal, leaving these candidates unchanged.
+
+        Parameters
+        ----------
+        character: string
+            the character
+
+        Returns
+        ----------
+        iterator(tuple(int, PatternCandidates))
+            every revealed pattern with the candidates revealing it, in the order of patterns
+        """
+        patternIds = self.__group.patternIds.get(character)
+        if patternIds is None:
+            yield 0, PatternCandidates(self.__group, list(self.__indices))
+            return
+        groups = collections.defaultdict(list)
+        for index, patternId in zip(self.__indices, map(patternIds.__getitem__, self.__indices)):
+            groups[patternId].append(index)
+        masks = {patternId: mask for mask, patternId in self.__group.patterns[character].items()}
+        for mask, patternId in sorted((masks[patternId], patternId) for patternId in groups):
+            yield mask, PatternCandidates(self.__group, groups[patternId])
+
+
+
+    def __len__(self):
+        return len(self.__indices)
+
+
+
+class MatrixGroup:
+    """
+    Basically a struct holding the words of one length as a numpy.uint8 matrix of
+    their character codes, with a boolean matrix telling which characters each word has.
+    The matrix has one row per position and one column per word, so comparing one
+    position of all words reads continuous memory. Needs NumPy and words of ASCII characters.
+
+    """
+
+    __slots__ = ('words', 'matrix', 'characters', 'codes', 'presence', 'counts', 'patternType')
+
+    def __init__(self, words):
+        """
+        Constructor of MatrixGroup struct.
+
+        Parameters
+        ----------
+        words: list(string)
+            words of the same length, of ASCII characters, not longer than MAX_MATRIX_LENGTH
+
+        """
+        length              = len(words[0]) if len(words) > 0 else 0
+        self.words          = words
+        rows                = numpy.frombuffer(''.join(words).encode('ascii'), dtype=numpy.uint8).reshape(len(words), length)
+        self.matrix         = numpy.ascontiguousarray(rows.T)
+        codes               = numpy.unique(self.matrix)
+        self.characters     = [chr(code) for code in codes]
+        #character -> column of presence
+        self.codes          = {character: column for column, character in enumerate(self.characters)}
+        self.presence       = numpy.zeros((len(words), len(codes)), dtype=bool)
+        for column, code in enumerate(codes):
+            self.presence[:, column] = (self.matrix == code).any(axis=0)
+        self.counts         = self.presence.sum(axis=0)
+        #the smallest type holding a bit for every position
+        self.patternType    = next(patternType for patternType in (numpy.uint8, numpy.uint16, numpy.uint32, numpy.uint64)
+                                   if numpy.iinfo(patternType).bits >= length)
+
+
+
+    def createCandidates(self):
+        """
+        Creates a set of candidates holding all words of the group.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        MatrixCandidates
+            the candidates
+        """
+        return MatrixCandidates(self)
+
+
+
+class MatrixCandidates:
+    """
+    Words of a MatrixGroup which still match a game. They are kept as indices of
+    rows of the group together with a smaller matrix of their columns, so every
+    guess works only on the remaining words. The number of remaining words having
+    each character is updated with every guess by subtracting the words which were removed.
+
+    """
+
+    def __init__(self, group, rows=None):
+        """
+        Constructor of MatrixCandidates.
+
+        Parameters
+        ----------
+        group: MatrixGroup
+            words of the game's length
+        rows: numpy.ndarray
+            indices of the candidates in the group, all words of the group if None
+
+        """
+        self.__group    = group
+        if rows is None:
+            self.__rows     = numpy.arange(len(group.words))
+            self.__matrix   = group.matrix
+            self.__counts   = group.counts.copy()
+        else:
+            self.__rows     = rows
+            self.__matrix   = group.matrix[:, rows]
+            self.__counts   = group.presence[rows].sum(axis=0)
+
+
+
+    @property
+    def characters(self):
+        return self.__group.characters
+
+
+
+    def words(self):
+        return [self.__group.words[row] for row in self.__rows]
+
+
+
+    def count(self, character):
+        """
+        Provides the number of candidates having the character.
+
+        Parameters
+        ----------
+        character: string
+            the character
+
+        Returns
+        ----------
+        int
+            the number of candidates
+        """
+        column = self.__group.codes.get(character)
+        return 0 if column is None else int(self.__counts[column])
+
+
+
+    def __patterns(self, character):
+        """
+        Computes the pattern the character reveals in every candidate.
+
+        Parameters
+        ----------
+        character: string
+            the character
+
+        Returns
+        ----------
+        numpy.ndarray
+            bitmasks of positions, one per candidate
+        """
+        patternType = self.__group.patternType
+        code = ord(character)
+        patterns = numpy.zeros(self.__matrix.shape[1], dtype=patternType)
+        for position, row in enumerate(self.__matrix):
+            patterns |= (row == code).astype(patternType) << patternType(position)
+        return patterns
+
+
+
+    def split(self, character):
+        """
+        Splits candidates by the pattern the character would reveal.
+
+        Parameters
+        ----------
+        character: string
+            the character to measure
+
+        Returns
+        ----------
+        tuple(float, int)
+            entropy in bits of the split and number of candidates which do not have the character
+
+        """
+        total = len(self.__rows)
+        having = self.count(character)
+        if having == 0 or total == 0:
+            return 0.0, total
+        patterns = self.__patterns(character)
+        #for short words counting every possible pattern is cheaper than sorting
+        if patterns.dtype.itemsize <= 2:
+            counts = numpy.bincount(patterns)
+            counts = counts[counts > 0].astype(numpy.float64)
+        else:
+            _, counts = numpy.unique(patterns, return_counts=True)
+            counts = counts.astype(numpy.float64)
+        entropy = math.log2(total) - float(numpy.dot(counts, numpy.log2(counts)))/total
+        return entropy, total-having
+
+
+
+    def keep(self, character, mask):
+        """
+        Keeps only candidates which reveal the given pattern of the character.
+
+        Parameters
+        ----------
+        character: string
+            the attempted character
+        mask: int
+            bitmask of positions at which the game revealed the character
+
+        """
+        if len(self.__rows) == 0:
+            return
+        if self.count(character) == 0:
+            matches = numpy.full(len(self.__rows), mask == 0)
+        else:
+            matches = self.__patterns(character) == mask
+        removed = self.__rows[~matches]
+        self.__counts -= self.__group.presence[removed].sum(axis=0)
+        self.__rows = self.__rows[matches]
+        self.__matrix = self.__matrix[:, matches]
+
+
+
+    def partition(self, character):
+        """
+        Splits candidates by the pattern the character would reveal, leaving these candidates unchanged.
+
+        Parameters
+        ----------
+        character: string
+            the character
+
+        Returns
+        ----------
+        iterator(tuple(int, MatrixCandidates))
+            every revealed pattern with the candidates revealing it, in the order of patterns
+        """
+        if self.count(character) == 0:
+            yield 0, MatrixCandidates(self.__group, self.__rows)
+            return
+        patterns = self.__patterns(character)
+        order = numpy.argsort(patterns, kind='stable')
+        boundaries = numpy.flatnonzero(numpy.diff(patterns[order])) + 1
+        for part in numpy.split(order, boundaries):
+            yield int(patterns[part[0]]), MatrixCandidates(self.__group, self.__rows[part])
+
+
+
+    def __len__(self):
+        return len(self.__rows)
+
+
+
+class WordIndex:
+    """
+    Words known to the solver, grouped by length. Groups are built when a game
+    with their length is played for the first time and shared by all later games,
+    also by games solved in other threads. With NumPy the groups are MatrixGroups,
+    otherwise (or for words which do not fit the matrix) PatternGroups.
+
+    """
+
+    def __init__(self, words, useNumpy=None):
+        """
+        Constructor of WordIndex. Words are lowercased and repeated ones are skipped.
+
+        Parameters
+        ----------
+        words: iterable(string)
+            words the server may choose from
+        useNumpy: bool
+            if False then NumPy is not used even if it is installed, 
+            None uses it if it is installed
+
+        """
+        if useNumpy and numpy is None:
+            raise ValueError("NumPy is not installed")
+        self.__useNumpy         = numpy is not None if useNumpy is None else useNumpy
+        self.__wordsByLength    = collections.defaultdict(list)
+        for word in dict.fromkeys(word.lower() for word in words):
+            if len(word) > 0:
+                self.__wordsByLength[len(word)].append(word)
+        self.__groups           = dict()
+        self.__lock             = threading.Lock()
+        self.__fingerprint      = None
+        self.__openingBook      = None
+
+
+
+    @property
+    def lengths(self):
+        return sorted(self.__wordsByLength)
+
+
+    @property
+    def openingBook(self):
+        return self.__openingBook
+
+
+
+    @property
+    def fingerprint(self):
+        """
+        SHA-1 digest of the words, which does not depend on their order. It tells
+        whether an opening book was built for the same words.
+
+        Returns
+        ----------
+        bytes
+            20 bytes of the digest
+        """
+        if self.__fingerprint is None:
+            words = sorted(word for words in self.__wordsByLength.values() for word in words)
+            self.__fingerprint = hashlib.sha1('\n'.join(words).encode('utf8')).digest()
+        return self.__fingerprint
+
+
+
+    def useOpeningBook(self, openingBook):
+        """
+        Makes solvers of these words take their guesses from the opening book
+        as long as the game follows it.
+
+        If the book was built for other words, raises ValueError.
+
+        Parameters
+        ----------
+        openingBook: OpeningBook.OpeningBook
+            the book, None to stop using a book
+
+        """
+        if openingBook is not None and openingBook.fingerprint != self.fingerprint:
+            raise ValueError("Opening book was built for other words")
+        self.__openingBook = openingBook
+
+
+
+    def group(self, length):
+        """
+        Provides the words of the given length with their patterns.
+
+        Parameters
+        ----------
+        length: int
+            length of the words
+
+        Returns
+        ----------
+        PatternGroup or MatrixGroup
+            the group, with no words if none has the length
+
+        """
+        group = self.__groups.get(length)
+        if group is None:
+            with self.__lock:
+                group = self.__groups.get(length)
+                if group is None:
+                    words = self.__wordsByLength.get(length, [])
+                    if self.__useNumpy and 0 < length <= MAX_MATRIX_LENGTH and len(words) > 0 and all(word.isascii() for word in words):
+                        group = MatrixGroup(words)
+                    else:
+                        group = PatternGroup(words)
+                    self.__groups[length] = group
+        return group
+
+
+
+    def __len__(self):
+        return sum(len(words) for words in self.__wordsByLength.values())
+
+
+
+class Solver:
+    """
+    Solver of one game. Keeps the words which still match the game and chooses 
+    the character which gives the most information about the word: candidates are
+    split by the exact pattern the character would reveal and the character with 
+    the biggest entropy of that split is guessed (see chooseCharacter).
+    If the word index uses an opening book, guesses are looked up in the book
+    until the game leaves it and only then computed.
+
+    """
+
+    def __init__(self, wordIndex, length):
+        """
+        Constructor of Solver. All words of the given length are candidates.
+
+        Parameters
+        ----------
+        wordIndex: WordIndex
+            words the server may choose from
+        length: int
+            length of the word to guess
+
+        """
+        self.__candidates   = wordIndex.group(length).createCandidates()
+        self.__attempted    = set()
+        self.__book         = wordIndex.openingBook
+        self.__bookNode     = None if self.__book is None else self.__book.root(length)
+
+
+
+    @property
+    def candidates(self):
+        return self.__candidates.words()
+
+
+    @property
+    def numberOfCandidates(self):
+        return len(self.__candidates)
+
+
+    @property
+    def attempted(self):
+        return frozenset(self.__attempted)
+
+
+    @property
+    def inBook(self):
+        return self.__bookNode is not None
+
+
+
+    def scoreCharacter(self, character):
+        """
+        Measures the information the character would give about the word.
+
+        Parameters
+        ----------
+        character: string
+            a character not attempted yet
+
+        Returns
+        ----------
+        tuple(float, int)
+            entropy in bits of the split of candidates by the revealed pattern and
+            number of candidates which do not have the character
+
+        """
+        return self.__candidates.split(character)
+
+
+
+    def chooseGuess(self):
+        """
+        Chooses the next character to guess.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        string
+            the character, None if every character was attempted
+
+        """
+        if self.__bookNode is not None:
+            return self.__book.guess(self.__bookNode)
+        best = chooseCharacter(self.__candidates, self.__attempted)
+        if best is not None:
+            return best
+        return next((character for character in FALLBACK_ORDER if not character in self.__attempted), None)
+
+
+
+    def possibleCharacters(self):
+        """
+        Provides the characters not attempted yet which at least one candidate has.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        list(string)
+            the characters in alphabetical order
+        """
+        return sorted(character for character in self.__candidates.characters
+                      if not character in self.__attempted and self.__candidates.count(character) > 0)
+
+
+
+    def remainingCharacters(self):
+        """
+        Provides the characters of the only candidate which were not attempted yet,
+        so they can be sent in one batch.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        list(string)
+            the characters in the order of the word, empty if there is not exactly one candidate
+
+        """
+        if len(self.__candidates) != 1:
+            return []
+        return [character for character in dict.fromkeys(self.__candidates.words()[0]) if not character in self.__attempted]
+
+
+
+    def update(self, character, currentGuess):
+        """
+        Keeps only candidates which reveal the same pattern of the attempted character
+        as the game did.
+
+        Parameters
+        ----------
+        character: string
+            the attempted character
+        currentGuess: list(string)
+            state of the word after the attempt, "_" in place of unguessed characters
+
+        """
+        character = character.lower()
+        self.__attempted.add(character)
+        mask = 0
+        for position, revealed in enumerate(currentGuess):
+            if revealed == character:
+                mask |= 1 << position
+        if self.__bookNode is not None:
+            if character == self.__book.guess(self.__bookNode):
+                self.__bookNode = self.__book.child(self.__bookNode, mask)
+            else:
+                self.__bookNode = None
+        self.__candidates.keep(character, mask)
+
+
+class RandomSolver(Solver):
+    """
+    Solver guessing a random character which at least one candidate has. Candidates 
+    are filtered like by Solver, so it differs from it only by the choice of guesses.
+    Serves as a baseline for comparing strategies. Does not use opening books.
+
+    """
+
+    def __init__(self, wordIndex, length, rng=None):
+        """
+        Constructor of RandomSolver.
+
+        Parameters
+        ----------
+        wordIndex: WordIndex
+            words the server may choose from
+        length: int
+            length of the word to guess
+        rng: random.Random
+            source of random numbers, the module random if None
+
+        """
+        super(RandomSolver, self).__init__(wordIndex, length)
+        self.__rng = random if rng is None else rng
+
+
+
+    def chooseGuess(self):
+        """
+        Chooses the next character to guess.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        string
+            the character, None if every character was attempted
+
+        """
+        characters = self.possibleCharacters()
+        if len(characters) > 0:
+            return self.__rng.choice(characters)
+        return next((character for character in FALLBACK_ORDER if not character in self.attempted), None)
+
+
+
+    @property
+    def inBook(self):
+        return False
+
+
+
+class FrequencySolver:
+    """
+    The first strategy of the bot. It guesses the most frequent character in the
+    words which can be a solution of the game. If such a character exists in all
+    the words then the next most frequent one is used. If guessed character was 
+    proper, the words which do not have it are removed, otherwise the words which
+    have it. Revealed positions are not used.
+
+    """
+
+    def __init__(self, wordIndex, length):
+        """
+        Constructor of FrequencySolver. All words of the given length are candidates.
+
+        Parameters
+        ----------
+        wordIndex: WordIndex
+            words the server may choose from
+        length: int
+            length of the word to guess
+
+        """
+        self.__words        = list(wordIndex.group(length).words)
+        self.__attempted    = set()
+
+
+
+    @property
+    def candidates(self):
+        return list(self.__words)
+
+
+    @property
+    def numberOfCandidates(self):
+        return len(self.__words)
+
+
+    @property
+    def attempted(self):
+        return frozenset(self.__attempted)
+
+
+    @property
+    def inBook(self):
+        return False
+
+
+
+    def chooseGuess(self):
+        """
+        Chooses the next character to guess.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        string
+            the character, None if every character was attempted
+
+        """
+        sortedCharacters = [character for character in getSortedCharacters(self.__words) if not character in self.__attempted]
+        for character in sortedCharacters:
+            if not all(character in word for word in self.__words):
+                return character
+        if len(sortedCharacters) > 0:
+            return sortedCharacters[0]
+        return next((character for character in FALLBACK_ORDER if not character in self.__attempted), None)
+
+
+
+    def remainingCharacters(self):
+        """
+        Provides the characters of the only candidate which were not attempted yet,
+        so they can be sent in one batch.
+
+        Parameters
+        ----------
+
+        Returns
+        ----------
+        list(string)
+            the characters in the order of the word, empty if there is not exactly one candidate
+
+        """
+        if len(self.__words) != 1:
+            return []
+        return [character for character in dict.fromkeys(self.__words[0]) if not character in self.__attempted]
+
+
+
+    def update(self, character, currentGuess):
+        """
+        Keeps only candidates which have the character if it was found, otherwise 
+        only candidates which do not have it.
+
+        Parameters
+        ----------
+        character: string
+            the attempted character
+        currentGuess: list(string)
+            state of the word after the attempt, "_" in place of unguessed characters
+
+        """
+        character = character.lower()
+        self.__attempted.add(character)
+        found = character in currentGuess
+        self.__words = [word for word in self.__words if (character in word) == found]
+
+
+
+def createSolver(strategy, wordIndex, length, rng=None):
+    """
+    Creates the solver of one game using the given strategy.
+
+    If the strategy is unknown, raises ValueError.
+
+    Parameters
+    ----------
+    strategy: string
+        one of STRATEGIES
+    wordIndex: WordIndex
+        words the server may choose from
+    length: int
+        length of the word to guess
+    rng: random.Random
+        source of random numbers of the random strategy
+
+    Returns
+    ----------
+    Solver, RandomSolver or FrequencySolver
+        the solver
+    """
+    if strategy == 'entropy':
+        return Solver(wordIndex, length)
+    if strategy == 'frequency':
+        return FrequencySolver(wordIndex, length)
+    if strategy == 'random':
+        return RandomSolver(wordIndex, length, rng)
+    raise ValueError("Unknown strategy: "+str(strategy))
+
+
+if __name__ == '__main__':
+
+    pass
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:31:47 2026
+
+@author: lukasz
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import random
+import struct
+import argparse
+import concurrent.futures
+
+import Game
+import Solver
+import Dictionary
+import Simulation
+
+#index of the strategy, seed, id of the word, won, score, guesses, moves, seconds of all moves and of the longest one
+RECORD = struct.Struct('<BIIBfHHff')
+
+#fields of the csv file with records of the games
+RECORD_FIELDS = ['strategy', 'seed', 'wordId', 'word', 'won', 'score', 'guesses', 'moves', 'moveMs', 'maxMoveMs']
+
+
+def playShard(strategyIndex, seed, wordIds):
+    """
+    Plays a game with every given word in a process prepared by Simulation.initWorker.
+
+    Parameters
+    ----------
+    strategyIndex: int
+        index of the strategy in Solver.STRATEGIES
+    seed: int
+        seed of the random strategy, every word gets its own generator
+    wordIds: list(int)
+        ids of the words in the game's dictionary
+
+    Returns
+    ----------
+    bytes
+        a RECORD of every game, one after another
+    """
+    strategy = Solver.STRATEGIES[strategyIndex]
+    records = bytearray()
+    for wordId in wordIds:
+        won, score, guesses, moves, moveSeconds, maxMoveSeconds = Simulation.playWord(Simulation.workerCore, Simulation.workerWordIndex,
+                                                                                      strategy, wordId, random.Random(seed*1000003+wordId))
+        records += RECORD.pack(strategyIndex, seed, wordId, won, score, guesses, moves, moveSeconds, maxMoveSeconds)
+    return bytes(records)
+
+
+
+def createShards(strategies, wordIds, seeds, shardSize):
+    """
+    Splits the tournament into shards of games played by one task. Strategies which do not
+    depend on random numbers play every word once, since every seed gives the same game.
+    Strategies take turns, so that partial results of all of them grow at the same pace.
+
+    Parameters
+    ----------
+    strategies: list(string)
+        strategies of the tournament
+    wordIds: list(int)
+        ids of the played words
+    seeds: list(int)
+        seeds of the random strategies
+    shardSize: int
+        number of words played by one task
+
+    Returns
+    ----------
+    generator(tuple(int, int, list(int)))
+        index of the strategy, seed and ids of the words of every shard
+    """
+    for seedNumber, seed in enumerate(seeds):
+        for start in range(0, len(wordIds), shardSize):
+            chunk = wordIds[start:start+shardSize]
+            for strategy in strategies:
+                if seedNumber == 0 or strategy in Solver.RANDOMIZED_STRATEGIES:
+                    yield Solver.STRATEGIES.index(strategy), seed, chunk
+
+
+
+def runTournament(strategies=Solver.STRATEGIES, dictionaryPath=None, sample=None, seeds=(0,), processes=None, bookPath=None,
+                  shardSize=256, recordsFile=None, progress=None):
+    """
+    Plays every strategy with every word of the dictionary, or with a random sample of the words,
+    and every seed. Shards of games are spread over a pool of processes, which load the words and
+    create their game once. Every shard sends back its games as compact records, which are added
+    to the results of their strategy as soon as the shard is done, so the memory of the tournament
+    does not grow with the number of games.
+
+    Parameters
+    ----------
+    strategies: list(string)
+        strategies of the tournament, from Solver.STRATEGIES
+    dictionaryPath: string
+        text or binary dictionary, Game.DEFAULT_WORDS if None
+    sample: int
+        number of words to play, all if None. The sample is chosen with the first seed
+    seeds: list(int)
+        seeds of the random strategies, at least one
+    processes: int
+        number of processes, the number of cpus if None, the current process only if 1
+    bookPath: string
+        opening book for the entropy strategy, none if None
+    shardSize: int
+        number of words played by one task
+    recordsFile: file
+        text file the record of every game is written to as csv, none if None
+    progress: callable(int, int)
+        called after every shard with the number of played games and of all games, nothing is called if None
+
+    Returns
+    ----------
+    tuple(dict(string, Simulation.SimulationResults), float)
+        totals of every strategy and the number of seconds the tournament took
+    """
+    for strategy in strategies:
+        if not strategy in Solver.STRATEGIES:
+            raise ValueError("Unknown strategy: "+str(strategy))
+    if len(seeds) < 1:
+        raise ValueError("At least one seed is needed")
+    start = time.perf_counter()
+    dictionary = Dictionary.WordDictionary(Game.DEFAULT_WORDS) if dictionaryPath is None else Dictionary.WordDictionary.load(dictionaryPath)
+    wordIds = list(range(len(dictionary)))
+    if sample is not None and sample < len(wordIds):
+        wordIds = sorted(random.Random(seeds[0]).sample(wordIds, sample))
+    shards = createShards(strategies, wordIds, seeds, shardSize)
+    totalGames = sum(len(wordIds)*(len(seeds) if strategy in Solver.RANDOMIZED_STRATEGIES else 1) for strategy in strategies)
+    results = {strategy: Simulation.SimulationResults() for strategy in strategies}
+    writer = None
+    if recordsFile is not None:
+        writer = csv.writer(recordsFile, lineterminator='\n')
+        writer.writerow(RECORD_FIELDS)
+    playedGames = 0
+
+    def collect(records):
+        nonlocal playedGames
+        for strategyIndex, seed, wordId, won, score, guesses, moves, moveSeconds, maxMoveSeconds in RECORD.iter_unpack(records):
+            strategy = Solver.STRATEGIES[strategyIndex]
+            results[strategy].add(won, score, guesses, moves, moveSeconds, maxMoveSeconds)
+            if writer is not None:
+                writer.writerow([strategy, seed, wordId, dictionary.getWord(wordId), won, score, guesses, moves,
+                                 round(moveSeconds*1000.0, 4), round(maxMoveSeconds*1000.0, 4)])
+        playedGames += len(records)//RECORD.size
+        if progress is not None:
+            progress(playedGames, totalGames)
+
+    if processes == 1:
+        Simulation.initWorker(dictionaryPath, bookPath)
+        for shard in shards:
+            collect(playShard(*shard))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(processes, initializer=Simulation.initWorker, initargs=(dictionaryPath, bookPath)) as executor:
+            #only a few shards per process wait in the queue, so the parent never holds all tasks or all records
+            maxPending = 4*(processes or os.cpu_count() or 1)
+            pending = set()
+            while True:
+                for shard in shards:
+                    pending.add(executor.submit(playShard, *shard))
+                    if len(pending) >= maxPending:
+                        break
+                if len(pending) == 0:
+                    break
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    collect(future.result())
+    return results, time.perf_counter()-start
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Tournament of the solver strategies playing games in-process against Game.Core')
+
+    parser.add_argument('-s', '--strategies', nargs='+', choices=Solver.STRATEGIES, default=list(Solver.STRATEGIES),
+                        help='strategies of the tournament')
+
+    parser.add_argument('-d', '--dictionary',
+                        help='text or binary dictionary of the game. The default words of the game if not given')
+
+    parser.add_argument('--sample', type=int,
+                        help='number of randomly chosen words to play. Every word of the dictionary if not given')
+
+    parser.add_argument('--seeds', type=int, default=1,
+                        help='number of seeds every randomized strategy plays every word with')
+
+    parser.add_argument('-p', '--processes', type=int,
+                        help='number of processes playing the games. The number of cpus if not given')
+
+    parser.add_argument('-b', '--book',
+                        help='opening book built for the dictionary with OpeningBook.py, used by the entropy strategy')
+
+    parser.add_argument('--shard', type=int, default=256,
+                        help='number of words played by one task of a process')
+
+    parser.add_argument('-r', '--records',
+                        help='path of a csv file the record of every game is written to')
+
+    parser.add_argument('-o', '--output',
+                        help='path of a json file the results of the strategies are written to')
+
+    args = parser.parse_args()
+    if args.seeds < 1:
+        parser.error('--seeds must be at least 1')
+
+    def printProgress(played, total):
+        sys.stderr.write("\r{0}/{1} games".format(played, total))
+        sys.stderr.flush()
+
+    recordsFile = None if args.records is None else open(args.records, 'w', newline='')
+    try:
+        results, seconds = runTournament(args.strategies, args.dictionary, args.sample, list(range(args.seeds)), args.processes,
+                                         args.book, args.shard, recordsFile, printProgress)
+    finally:
+        if recordsFile is not None:
+            recordsFile.close()
+    sys.stderr.write("\n")
+
+    summaries = {strategy: strategyResults.toDict() for strategy, strategyResults in results.items()}
+    games = sum(summary['games'] for summary in summaries.values())
+    print("{0} games in {1:.2f} s, {2:.1f} games/s".format(games, seconds, games/seconds if seconds > 0 else 0.0))
+    print("{0:10s} {1:>8s} {2:>8s} {3:>8s} {4:>8s} {5:>9s} {6:>9s}".format('strategy', 'games', 'win rate', 'score', 'guesses', 'move ms', 'max ms'))
+    for strategy, summary in summaries.items():
+        print("{0:10s} {1:8d} {2:8.1%} {3:8.2f} {4:8.2f} {5:9.3f} {6:9.3f}".format(strategy, summary['games'], summary['winRate'],
+              summary['averageScore'], summary['guessesPerGame'], summary['moveMs'], summary['maxMoveMs']))
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump({'seconds': seconds, 'strategies': summaries}, f, indent=1)
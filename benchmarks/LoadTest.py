@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:48:03 2026
+
+@author: lukasz
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import random
+import tempfile
+import threading
+import subprocess
+import http.client
+
+#Benchmarks are launched from any directory, but the game's modules live one level up.
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz0123456789'
+
+
+def percentile(sortedValues, fraction):
+    """
+    Provides the value below which the given fraction of values falls.
+
+    Parameters
+    ----------
+    sortedValues: list(float)
+        values sorted in increasing order
+    fraction: float
+        a number from 0 to 1
+        
+    Returns
+    ----------
+    float
+        the percentile, 0 if there are no values
+    
+    """
+    if len(sortedValues) == 0:
+        return 0.0
+    return sortedValues[min(len(sortedValues)-1, int(fraction*len(sortedValues)))]
+
+
+
+def waitForServer(port, timeout):
+    """
+    Waits until the server accepts connections.
+
+    Raises RuntimeError if it does not happen in time.
+
+    Parameters
+    ----------
+    port: int
+        port of the server on localhost
+    timeout: float
+        maximal number of seconds to wait
+    
+    """
+    deadline = time.monotonic()+timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("Server did not start on port "+str(port))
+
+
+
+def playGames(port, deadline, latencies, errors):
+    """
+    Plays random games over one keep-alive connection until the deadline. Every turn 
+    is a guess followed by a state request, like the bot does.
+
+    Parameters
+    ----------
+    port: int
+        port of the server on localhost
+    deadline: float
+        time.monotonic() when the client stops
+    latencies: list(float)
+        list to which latency of every request is appended
+    errors: list(int)
+        one-element list counting failed requests
+    
+    """
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    
+    def call(method, url, data=None):
+        body = None if data is None else json.dumps(data)
+        start = time.perf_counter()
+        try:
+            connection.request(method, url, body=body, headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            answer = json.loads(response.read())
+        except (OSError, http.client.HTTPException, ValueError):
+            connection.close()
+            errors[0] += 1
+            return None
+        latencies.append(time.perf_counter()-start)
+        if response.status != 200:
+            errors[0] += 1
+            return None
+        return answer
+    
+    while time.monotonic() < deadline:
+        started = call('POST', '/hangman/api/startGame', {'name': 'LoadTest'})
+        if started is None:
+            continue
+        gameId = started['gameId']
+        letters = random.sample(LETTERS, len(LETTERS))
+        active = True
+        while active and len(letters) > 0 and time.monotonic() < deadline:
+            call('PUT', '/hangman/api/tryCharacter', {'gameId': gameId, 'character': letters.pop()})
+            state = call('GET', '/hangman/api/gameState?gameId='+gameId)
+            active = state is not None and state['gameActive']
+        call('GET', '/hangman/api/endGame?gameId='+gameId)
+    connection.close()
+
+
+
+def runLoad(server, port, clients, duration):
+    """
+    Starts the game's API with the given server in a temporary directory, loads it with 
+    concurrent clients and stops it.
+
+    Parameters
+    ----------
+    server: string
+        'flask' or 'asgi'
+    port: int
+        port for the server
+    clients: int
+        number of concurrent clients
+    duration: float
+        number of seconds of the load
+        
+    Returns
+    ----------
+    dict(string,...)
+        requests per second, latency percentiles in milliseconds and number of errors
+    
+    """
+    command = [sys.executable, os.path.join(ROOT_DIRECTORY, 'Execute.py'), '-a', '--server', server, '--port', str(port)]
+    with tempfile.TemporaryDirectory() as directory:
+        process = subprocess.Popen(command, cwd=directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            waitForServer(port, 15)
+            latencies, errors = [], [0]
+            deadline = time.monotonic()+duration
+            threads = [threading.Thread(target=playGames, args=(port, deadline, latencies, errors)) for _ in range(clients)]
+            start = time.monotonic()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.monotonic()-start
+        finally:
+            process.terminate()
+            process.wait()
+    latencies.sort()
+    return {'server':           server,
+            'requests':         len(latencies),
+            'requestsPerSecond':len(latencies)/elapsed,
+            'p50Ms':            percentile(latencies, 0.50)*1000.0,
+            'p99Ms':            percentile(latencies, 0.99)*1000.0,
+            'errors':           errors[0]}
+
+
+if __name__ == '__main__':
+    
+    """
+    Compare throughput and latency of the game's API served by flask and by the asgi server.
+
+    """
+    
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Load test of the Hangman API servers')
+    
+    parser.add_argument('-s', '--servers', nargs='+', choices=['flask', 'asgi'], default=['flask', 'asgi'],
+                        help='servers to test')
+    
+    parser.add_argument('-c', '--clients', type=int, default=16,
+                        help='number of concurrent clients')
+    
+    parser.add_argument('-t', '--duration', type=float, default=10.0,
+                        help='number of seconds of the load for each server')
+    
+    parser.add_argument('-p', '--port', type=int, default=5099,
+                        help='port used by the tested servers')
+    
+    args = parser.parse_args()
+    
+    print("{0:8} {1:>10} {2:>10} {3:>10} {4:>8}".format('server', 'req/s', 'p50 ms', 'p99 ms', 'errors'))
+    for server in args.servers:
+        result = runLoad(server, args.port, args.clients, args.duration)
+        print("{0:8} {1:10.1f} {2:10.2f} {3:10.2f} {4:8d}".format(server, result['requestsPerSecond'], result['p50Ms'], result['p99Ms'], result['errors']))
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:05:52 2026
+
+@author: lukasz
+"""
+
+import os
+import sys
+import random
+import tracemalloc
+
+#Benchmarks are launched from any directory, but the game's modules live one level up.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Game
+
+
+class LegacyCore:
+    """
+    Per-game state laid out as Game.Core kept it before GameState was introduced:
+    instance attributes, the current guess as a list of one-character strings and 
+    wrong letters in a set.
+
+    """
+    
+    def __init__(self, possibleWords):
+        """
+        Constructor of LegacyCore.
+    
+        Parameters
+        ----------
+        possibleWords: list(string)
+            words to guess
+        
+        """
+        self.__possibleWords            = possibleWords
+        self.__userName                 = None
+        self.__selectedWordId           = None
+        self.__currentGuess             = None
+        self.__attemptsLeft             = None
+        self.__active                   = False
+        self.__userGuesssed             = False
+        self.__score                    = None
+        
+        
+        
+    def start(self, userName, wordId):
+        """
+        Starts the game with the given word.
+    
+        Parameters
+        ----------
+        userName: string
+            the name of the user
+        wordId: int
+            index of the word to guess
+        
+        """
+        self.__userName                 = userName
+        self.__selectedWordId           = wordId
+        self.__attemptedWrongLetters    = set()
+        self.__attemptsLeft             = 5
+        self.__currentGuess             = ["_"]*len(self.__possibleWords[wordId])
+        self.__active                   = True
+        self.__userGuesssed             = False
+        self.__score                    = 0
+        
+        
+        
+    def handleNewCharacter(self, usersCharacter):
+        """
+        Applies a guess the way Game.Core did, without scoring.
+    
+        Parameters
+        ----------
+        usersCharacter: string
+            a signle character given by the user as a guess
+        
+        """
+        found = False
+        for idx, character in enumerate(self.__possibleWords[self.__selectedWordId]):
+            if character == usersCharacter:
+                self.__currentGuess[idx] = character
+                found = True
+        if not found:
+            self.__attemptedWrongLetters.add(usersCharacter)
+            self.__attemptsLeft -= 1
+
+
+
+def measure(createGame, numberOfSessions):
+    """
+    Creates the given number of live games and measures memory they hold.
+
+    Parameters
+    ----------
+    createGame: callable(int) -> object
+        creates a started game with a few guesses made, given the number of the game
+    numberOfSessions: int
+        number of games to create
+
+    Returns
+    ----------
+    float
+        average number of bytes held by one game
+    
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    games = [createGame(number) for number in range(numberOfSessions)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del games
+    return (after-before)/numberOfSessions
+
+
+if __name__ == '__main__':
+    
+    """
+    Compare memory of live games held with the legacy layout and with Game.GameState.
+
+    """
+    
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Per-session memory benchmark')
+    
+    parser.add_argument('-n', '--sessions', type=int, default=100000,
+                        help='number of live games created for each layout')
+    
+    args = parser.parse_args()
+    
+    dictionary  = Game.getDictionary()
+    words       = [dictionary.getWord(wordId) for wordId in range(len(dictionary))]
+    guesses     = "eaxq"
+    
+    def createLegacy(number):
+        game = LegacyCore(words)
+        game.start("Player %d" % number, number % len(words))
+        for character in guesses:
+            game.handleNewCharacter(character)
+        return game
+    
+    def createCompact(number):
+        game = Game.Core(dictionary)
+        game.start("Player %d" % number)
+        for character in guesses:
+            game.handleNewCharacter(character)
+        return game
+    
+    random.seed(0)
+    legacy  = measure(createLegacy, args.sessions)
+    compact = measure(createCompact, args.sessions)
+    print("legacy layout   {0:8.1f} bytes per session".format(legacy))
+    print("GameState       {0:8.1f} bytes per session".format(compact))
+    print("serialized      {0:8.1f} bytes per session".format(len(createCompact(0).state.toBytes())))
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:59:12 2026
+
+@author: lukasz
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import datetime
+import tempfile
+import statistics
+
+#Benchmarks are launched from any directory, but the game's modules live one level up.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Logs
+import Scores
+
+#number of users the generated scores are spread over
+USERS = 1000
+
+#queries of the game: name, method of Scores.ScoreStore and its arguments for a store of the given number of scores and dates
+QUERIES = \
+[
+ ('count',      lambda store, size, dates: store.count()),
+ ('top10',      lambda store, size, dates: store.getTop(10)),
+ ('userStats',  lambda store, size, dates: store.getUserStats('user%d' % random.randrange(USERS))),
+ ('firstPage',  lambda store, size, dates: store.getPage(0, 100)),
+ ('lastPage',   lambda store, size, dates: store.getPage(max(size-100, 0), 100)),
+ ('between',    lambda store, size, dates: store.getBetween(*sorted(random.sample(dates, 2)), 0, 100)),
+ ]
+
+
+
+def fillStore(store, size):
+    """
+    Appends generated scores, one second apart, and waits until all of them are saved.
+
+    Parameters
+    ----------
+    store: Scores.ScoreStore
+        the empty storage
+    size: int
+        number of scores
+
+    Returns
+    ----------
+    float
+        number of seconds appending and saving took
+    """
+    rng = random.Random(0)
+    names = ['user%d' % number for number in range(USERS)]
+    start = datetime.datetime(2026, 1, 1)
+    dates = [start+datetime.timedelta(seconds=number) for number in range(size)]
+    scores = [round(rng.uniform(0.0, 100.0), 2) for _ in range(size)]
+    begin = time.perf_counter()
+    for number in range(size):
+        store.append(dates[number], names[number % USERS], scores[number])
+    store.flush()
+    return time.perf_counter()-begin
+
+
+
+def measure(kind, size, repeats, flushSize):
+    """
+    Fills a new storage of the given kind in a temporary directory and measures its queries.
+
+    Parameters
+    ----------
+    kind: string
+        one of Scores.STORES
+    size: int
+        number of scores
+    repeats: int
+        number of runs of every query
+    flushSize: int
+        number of scores saved in one batch
+
+    Returns
+    ----------
+    dict(string,...)
+        inserted scores per second, time of the first query, size of the files
+        and median time of every query in milliseconds
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, Scores.DEFAULT_PATHS[kind])
+        #appending waits for the writer instead of dropping scores, so every store holds all of them
+        store = Scores.createScoreStore(kind, path, flushInterval=0.1, flushSize=flushSize, overflow=Logs.OVERFLOW_BLOCK)
+        try:
+            seconds = fillStore(store, size)
+            begin = time.perf_counter()
+            store.refresh()
+            saved = store.count()
+            firstQuery = time.perf_counter()-begin
+            if saved != size:
+                raise RuntimeError("Storage "+kind+" saved "+str(saved)+" of "+str(size)+" scores")
+            dates = [(datetime.datetime(2026, 1, 1)+datetime.timedelta(seconds=random.randrange(size))).strftime(Scores.DATE_FORMAT) for _ in range(100)]
+            result = {'kind': kind, 'size': size, 'insertsPerSecond': size/seconds, 'firstQuerySeconds': firstQuery,
+                      'megabytes': sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))/1e6}
+            for name, query in QUERIES:
+                times = []
+                for _ in range(repeats):
+                    begin = time.perf_counter()
+                    query(store, size, dates)
+                    times.append(time.perf_counter()-begin)
+                result[name] = statistics.median(times)*1000.0
+        finally:
+            store.close()
+    return result
+
+
+if __name__ == '__main__':
+
+    """
+    Compare insert throughput and query latency of the storages of scores.
+
+    """
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark of the storages of scores')
+
+    parser.add_argument('-s', '--sizes', type=int, nargs='+', default=[10000, 1000000, 10000000],
+                        help='numbers of scores every storage is filled with')
+
+    parser.add_argument('-k', '--kinds', nargs='+', choices=list(Scores.STORES), default=list(Scores.STORES),
+                        help='storages to compare')
+
+    parser.add_argument('-n', '--repeats', type=int, default=100,
+                        help='number of runs of every query')
+
+    parser.add_argument('--flush-size', type=int, default=10000,
+                        help='number of scores saved in one batch')
+
+    parser.add_argument('-o', '--output',
+                        help='path of a json file the results are written to')
+
+    args = parser.parse_args()
+
+    results = []
+    print("{0:7s} {1:>9s} {2:>10s} {3:>8s} {4:>7s}".format('storage', 'scores', 'inserts/s', 'first s', 'MB')+
+          "".join(" {0:>9s}".format(name) for name, _ in QUERIES)+"  (median ms)")
+    for size in args.sizes:
+        for kind in args.kinds:
+            result = measure(kind, size, args.repeats, args.flush_size)
+            results.append(result)
+            print("{0:7s} {1:9d} {2:10.0f} {3:8.3f} {4:7.1f}".format(kind, size, result['insertsPerSecond'], result['firstQuerySeconds'], result['megabytes'])+
+                  "".join(" {0:9.3f}".format(result[name]) for name, _ in QUERIES))
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
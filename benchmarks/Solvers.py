@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:58:14 2026
+
+@author: lukasz
+"""
+
+import os
+import sys
+import json
+
+#Benchmarks are launched from any directory, but the game's modules live one level up.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Solver
+import Simulation
+
+
+if __name__ == '__main__':
+
+    """
+    Compare strategies of the solver playing games in-process against Game.Core, without any server.
+
+    """
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Offline benchmark of the solver strategies')
+
+    parser.add_argument('-s', '--strategies', nargs='+', choices=Solver.STRATEGIES, default=list(Solver.STRATEGIES),
+                        help='strategies to compare')
+
+    parser.add_argument('-d', '--dictionary',
+                        help='text or binary dictionary of the game. The default words of the game if not given')
+
+    parser.add_argument('--sample', type=int,
+                        help='number of randomly chosen words to play. Every word of the dictionary if not given')
+
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the sample and of the random strategy')
+
+    parser.add_argument('-p', '--processes', type=int,
+                        help='number of processes playing the games. The number of cpus if not given')
+
+    parser.add_argument('-b', '--book',
+                        help='opening book built for the dictionary with OpeningBook.py, used by the entropy strategy')
+
+    parser.add_argument('-o', '--output',
+                        help='path of a json file the results are written to')
+
+    args = parser.parse_args()
+
+    allResults = dict()
+    print("{0:10s} {1:>8s} {2:>8s} {3:>8s} {4:>8s} {5:>9s} {6:>9s} {7:>8s}".format('strategy', 'games', 'win rate', 'score', 'guesses', 'move ms', 'max ms', 'seconds'))
+    for strategy in args.strategies:
+        results, seconds = Simulation.simulate(strategy, args.dictionary, args.sample, args.seed, args.processes, args.book)
+        allResults[strategy] = results.toDict()
+        allResults[strategy]['seconds'] = seconds
+        summary = allResults[strategy]
+        print("{0:10s} {1:8d} {2:8.1%} {3:8.2f} {4:8.2f} {5:9.3f} {6:9.3f} {7:8.2f}".format(strategy, summary['games'], summary['winRate'],
+              summary['averageScore'], summary['guessesPerGame'], summary['moveMs'], summary['maxMoveMs'], seconds))
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(allResults, f, indent=1)
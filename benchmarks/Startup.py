@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:41:15 2026
+
+@author: lukasz
+"""
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+import statistics
+
+#Benchmarks are launched from any directory, but the game's modules live one level up.
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#Code run in a fresh interpreter for every measurement. It runs Execute.py with the 
+#arguments of the mode and --dry-run, so everything done before serving the first request 
+#or drawing the menu is measured, and reports the time it took, the peak RSS and whether 
+#pandas got loaded.
+PROBE = """
+import sys, time, json, runpy, resource
+start = time.perf_counter()
+sys.argv = ['Execute.py'] + {arguments!r} + ['--dry-run']
+sys.path.insert(0, {directory!r})
+runpy.run_path({script!r}, run_name='__main__')
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == 'darwin':
+    rss //= 1024
+print(json.dumps({{'seconds': elapsed, 'rssKb': rss, 'pandas': 'pandas' in sys.modules}}))
+"""
+
+MODES = \
+{
+ 'terminal': [],
+ 'api':      ['-a'],
+ }
+
+
+
+def measure(mode, repeats):
+    """
+    Starts a fresh interpreter repeats times and measures the startup of the given mode.
+    The interpreter runs in a temporary directory, which gets the log and the scores.
+
+    Parameters
+    ----------
+    mode: string
+        key of MODES
+    repeats: int
+        number of measurements
+
+    Returns
+    ----------
+    dict(string,...)
+        median startup time in seconds, median peak RSS in kB and whether pandas was loaded
+    
+    """
+    probe = PROBE.format(arguments=MODES[mode], script=os.path.join(ROOT_DIRECTORY, 'Execute.py'), directory=ROOT_DIRECTORY)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for _ in range(repeats):
+            output = subprocess.check_output([sys.executable, '-c', probe], cwd=directory)
+            results.append(json.loads(output))
+    return {'mode':     mode,
+            'seconds':  statistics.median(result['seconds'] for result in results),
+            'rssKb':    statistics.median(result['rssKb'] for result in results),
+            'pandas':   any(result['pandas'] for result in results)}
+
+
+if __name__ == '__main__':
+    
+    """
+    Measure startup time and memory of the game's modes and fail if they exceed the limits.
+
+    """
+    
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Startup benchmark of Execute.py modes')
+    
+    parser.add_argument('-n', '--repeats', type=int, default=5,
+                        help='number of fresh interpreters started for each mode')
+    
+    parser.add_argument('--max-seconds', type=float, default=0.5,
+                        help='fail if median startup time of any mode exceeds this value')
+    
+    parser.add_argument('--max-rss-mb', type=float, default=60.0,
+                        help='fail if median peak RSS of any mode exceeds this value')
+    
+    args = parser.parse_args()
+    
+    failed = False
+    for mode in MODES:
+        result = measure(mode, args.repeats)
+        print("{0:10} {1:8.3f} s {2:8.1f} MB  pandas loaded: {3}".format(mode, result['seconds'], result['rssKb']/1024.0, result['pandas']))
+        if result['pandas'] or result['seconds'] > args.max_seconds or result['rssKb']/1024.0 > args.max_rss_mb:
+            failed = True
+    
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:12:40 2026
+
+@author: lukasz
+"""
+
+import pytest
+
+import Game
+import Logs
+import Scores
+
+
+@pytest.fixture(autouse=True, scope='session')
+def gameFiles(tmp_path_factory):
+    """
+    Makes the game log and save scores in a temporary directory instead of the current one.
+
+    Parameters
+    ----------
+    tmp_path_factory: pytest.TempPathFactory
+        factory of temporary directories
+
+    Returns
+    ----------
+    pathlib.Path
+        the directory
+    """
+    directory = tmp_path_factory.mktemp('game')
+    Game.setLoggingHandler(Logs.createFileHandler(str(directory/'hangman.log')))
+    Game.setScoreStore(Scores.createScoreStore('csv', str(directory/'scores.csv')))
+    yield directory
+    Game.getScoreStore().close()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:02:51 2026
+
+@author: lukasz
+"""
+
+import os
+import csv
+import time
+import datetime
+import threading
+
+import pytest
+
+import Logs
+import Scores
+import Metrics
+
+DATE = datetime.datetime(2026, 1, 1)
+
+
+def savedScores(path):
+    """
+    Reads the scores of a csv file written by ScoreWriter.
+
+    Parameters
+    ----------
+    path: pathlib.Path
+        path to the file
+
+    Returns
+    ----------
+    list(float)
+        the scores in the order of the file
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, newline='') as f:
+        return [float(score) for _, _, score in list(csv.reader(f))[1:]]
+
+
+
+def waitFor(condition, timeout=5.0):
+    deadline = time.monotonic()+timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+
+def counter(name):
+    return Metrics.registry.collect()[0].get((name, ()), 0)
+
+
+
+def testWritesBatchWhenFlushSizeIsQueued(tmp_path):
+    path = tmp_path/'scores.csv'
+    writer = Scores.ScoreWriter(str(path), flushInterval=60.0, flushSize=3)
+    try:
+        for score in (1.0, 2.0):
+            writer.append(DATE, 'user', score)
+        time.sleep(0.1)
+        assert savedScores(path) == []
+        writer.append(DATE, 'user', 3.0)
+        assert waitFor(lambda: savedScores(path) == [1.0, 2.0, 3.0])
+    finally:
+        writer.close()
+
+
+
+def testWritesBatchAfterFlushInterval(tmp_path):
+    path = tmp_path/'scores.csv'
+    writer = Scores.ScoreWriter(str(path), flushInterval=0.05, flushSize=100)
+    try:
+        writer.append(DATE, 'user', 1.0)
+        assert waitFor(lambda: savedScores(path) == [1.0])
+    finally:
+        writer.close()
+
+
+
+@pytest.mark.parametrize('overflow, expected', [(Logs.OVERFLOW_DROP_NEW, [0.0, 1.0, 2.0]),
+                                                (Logs.OVERFLOW_DROP_OLD, [2.0, 3.0, 4.0])])
+def testDropsScoresWhenQueueIsFull(tmp_path, overflow, expected):
+    path = tmp_path/'scores.csv'
+    dropped = counter(Metrics.SCORES_DROPPED)
+    writer = Scores.ScoreWriter(str(path), flushInterval=60.0, flushSize=100, maxPending=3, overflow=overflow)
+    for score in range(5):
+        writer.append(DATE, 'user', float(score))
+    writer.close()
+    assert savedScores(path) == expected
+    assert counter(Metrics.SCORES_DROPPED)-dropped == 2
+
+
+
+def testRetriesFailedBatchWithoutRaisingToAppenders(tmp_path):
+    path = tmp_path/'scores.csv'
+    #a directory in place of the file makes every write fail
+    path.mkdir()
+    errors = counter(Metrics.SCORE_FLUSH_ERRORS)
+    writer = Scores.ScoreWriter(str(path), flushInterval=0.05, flushSize=1)
+    try:
+        writer.append(DATE, 'user', 1.0)
+        assert waitFor(lambda: counter(Metrics.SCORE_FLUSH_ERRORS) > errors)
+        writer.append(DATE, 'user', 2.0)
+        with pytest.raises(Scores.ScoreStorageError):
+            writer.flush()
+        path.rmdir()
+        assert waitFor(lambda: savedScores(path) == [1.0, 2.0])
+    finally:
+        writer.close()
+
+
+
+def testBlocksAppendWhileQueueIsFull(tmp_path):
+    path = tmp_path/'scores.csv'
+    path.mkdir()
+    writer = Scores.ScoreWriter(str(path), flushInterval=0.05, flushSize=2, maxPending=4, overflow=Logs.OVERFLOW_BLOCK)
+    appender = threading.Thread(target=lambda: [writer.append(DATE, 'user', float(score)) for score in range(10)])
+    try:
+        appender.start()
+        time.sleep(0.3)
+        assert appender.is_alive()
+        path.rmdir()
+        appender.join(5.0)
+        assert not appender.is_alive()
+    finally:
+        writer.close()
+    assert savedScores(path) == [float(score) for score in range(10)]
+
+
+
+def testClosingWakesBlockedAppenders(tmp_path):
+    path = tmp_path/'scores.csv'
+    path.mkdir()
+    writer = Scores.ScoreWriter(str(path), flushInterval=0.05, flushSize=1, maxPending=1, overflow=Logs.OVERFLOW_BLOCK)
+    errors = []
+    def append():
+        try:
+            for score in range(3):
+                writer.append(DATE, 'user', float(score))
+        except Scores.ScoreStorageError as e:
+            errors.append(e)
+    appender = threading.Thread(target=append)
+    appender.start()
+    time.sleep(0.2)
+    writer.close()
+    appender.join(5.0)
+    assert not appender.is_alive()
+    assert len(errors) == 1
+
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+def testForkedProcessWritesOnlyItsOwnScores(tmp_path):
+    path = tmp_path/'scores.csv'
+    writer = Scores.ScoreWriter(str(path), flushInterval=60.0, flushSize=100)
+    writer.append(DATE, 'parent', 1.0)
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            writer.append(DATE, 'child', 2.0)
+            writer.close()
+            status = 0
+        finally:
+            os._exit(status)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert savedScores(path) == [2.0]
+    writer.close()
+    assert savedScores(path) == [2.0, 1.0]
+
+
+
+#scores of the storage tests: dates out of order and repeated, users with several scores and equal scores
+STORED = [(DATE+datetime.timedelta(minutes=minutes), 'user%d' % (number % 3), float(score))
+          for number, (minutes, score) in enumerate([(0, 50), (5, 70), (3, 70), (3, 10), (9, 95.5), (1, 50), (7, 0), (5, 88)])]
+
+
+@pytest.fixture(params=sorted(Scores.STORES))
+def store(request, tmp_path):
+    """
+    Provides a storage of every kind holding STORED scores, all of them written.
+
+    """
+    store = Scores.createScoreStore(request.param, str(tmp_path/Scores.DEFAULT_PATHS[request.param]), flushInterval=60.0)
+    for date, name, score in STORED:
+        store.append(date, name, score)
+    store.flush()
+    yield store
+    store.close()
+
+
+
+def rows(indices):
+    return [(STORED[index][0].strftime(Scores.DATE_FORMAT), STORED[index][1], STORED[index][2]) for index in indices]
+
+
+
+def dated(since=None, until=None):
+    """
+    Provides indices of STORED scores saved in the period of time, ordered by date and then by the order of saving.
+
+    """
+    indices = range(len(STORED))
+    if since is not None:
+        indices = [index for index in indices if STORED[index][0] >= since]
+    if until is not None:
+        indices = [index for index in indices if STORED[index][0] < until]
+    return sorted(indices, key=lambda index: (STORED[index][0], index))
+
+
+
+def testCount(store):
+    assert store.count() == len(STORED)
+
+
+
+@pytest.mark.parametrize('offset, limit', [(0, None), (0, 3), (3, 3), (6, 10), (20, 5)])
+def testGetPage(store, offset, limit):
+    end = None if limit is None else offset+limit
+    assert list(store.getPage(offset, limit)) == rows(range(len(STORED)))[offset:end]
+
+
+
+@pytest.mark.parametrize('count', [1, 3, 20])
+def testGetTop(store, count):
+    best = sorted(range(len(STORED)), key=lambda index: (-STORED[index][2], index))
+    assert list(store.getTop(count)) == rows(best[:count])
+
+
+
+@pytest.mark.parametrize('since, until, offset, limit', [(None, None, 0, None),
+                                                         (DATE+datetime.timedelta(minutes=3), DATE+datetime.timedelta(minutes=7), 0, None),
+                                                         (DATE+datetime.timedelta(minutes=3), None, 1, 2),
+                                                         (None, DATE+datetime.timedelta(minutes=5), 0, 10)])
+def testGetBetween(store, since, until, offset, limit):
+    formatted = [None if date is None else date.strftime(Scores.DATE_FORMAT) for date in (since, until)]
+    end = None if limit is None else offset+limit
+    assert list(store.getBetween(*formatted, offset, limit)) == rows(dated(since, until))[offset:end]
+
+
+
+@pytest.mark.parametrize('name', ['user0', 'user1', 'user2'])
+def testGetUserStats(store, name):
+    scores = [score for _, user, score in STORED if user == name]
+    stats = store.getUserStats(name)
+    assert (stats.count, stats.total, stats.best) == (len(scores), sum(scores), max(scores))
+    assert stats.average == pytest.approx(sum(scores)/len(scores))
+
+
+
+def testGetUserStatsOfUnknownUser(store):
+    assert store.getUserStats('nobody') is None
+
+
+
+@pytest.mark.parametrize('name', [None, 'user1'])
+def testIterate(store, name):
+    since = DATE+datetime.timedelta(minutes=1)
+    batches = list(store.iterate(name, since.strftime(Scores.DATE_FORMAT), None, 2))
+    assert all(0 < len(batch) <= 2 for batch in batches)
+    expected = [index for index in dated(since) if name is None or STORED[index][1] == name]
+    assert [tuple(row) for batch in batches for row in batch] == rows(expected)
+
+
+
+def testQueriesSeeOnlyWrittenScores(store):
+    store.append(DATE, 'late', 1.0)
+    assert store.count() == len(STORED)
+    store.flush()
+    assert store.count() == len(STORED)+1
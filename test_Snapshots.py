@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:20:05 2026
+
+@author: lukasz
+"""
+
+import os
+
+import pytest
+
+import Game
+import Sessions
+import Snapshots
+import Dictionary
+
+WORDS       = ['apple', 'berry', 'cherry', 'melon']
+OTHER_WORDS = ['apple', 'berry', 'cherry', 'lemon']
+
+
+@pytest.fixture(autouse=True)
+def words():
+    """
+    Makes games use WORDS and brings the previous dictionary back afterwards.
+
+    """
+    previous = Game.getDictionary()
+    Game.setDictionary(Dictionary.WordDictionary(WORDS))
+    yield
+    Game.setDictionary(previous)
+
+
+
+def attach(path):
+    """
+    Creates a registry with a journal which writes only when asked to, as if the
+    server crashed whenever the test stops calling it.
+
+    Parameters
+    ----------
+    path: pathlib.Path
+        path to the checkpoint file
+
+    Returns
+    ----------
+    tuple(Sessions.SessionRegistry, Snapshots.SessionJournal, int)
+        the registry, its journal and the number of restored games
+    """
+    registry    = Sessions.SessionRegistry()
+    journal     = Snapshots.SessionJournal(str(path), flushInterval=3600.0, checkpointInterval=3600.0)
+    restored    = registry.attachJournal(journal)
+    return registry, journal, restored
+
+
+
+def startGame(registry, wordId, characters=()):
+    """
+    Creates a game with the given word and tries the characters.
+
+    Parameters
+    ----------
+    registry: Sessions.SessionRegistry
+        registry of the game
+    wordId: int
+        id of the word to guess
+    characters: iterable(string)
+        characters tried one after another
+
+    Returns
+    ----------
+    string
+        id of the game
+    """
+    gameId = registry.create()
+    with registry.session(gameId) as game:
+        game.start('tester', wordId=wordId)
+    for character in characters:
+        with registry.session(gameId) as game:
+            game.handleNewCharacter(character)
+    return gameId
+
+
+
+def savedState(registry, gameId):
+    with registry.session(gameId) as game:
+        return game.state.toBytes()
+
+
+
+def testRestoresCheckpointAndLog(tmp_path):
+    path = tmp_path/'sessions.snap'
+    registry, journal, _ = attach(path)
+    beforeCheckpoint = startGame(registry, 0, 'a')
+    journal.checkpoint()
+    with registry.session(beforeCheckpoint) as game:
+        game.handleNewCharacter('p')
+    afterCheckpoint = startGame(registry, 2, 'ce')
+    journal.flush()
+
+    restoredRegistry, _, restored = attach(path)
+    assert restored == 2
+    for gameId in (beforeCheckpoint, afterCheckpoint):
+        assert savedState(restoredRegistry, gameId) == savedState(registry, gameId)
+    with restoredRegistry.session(beforeCheckpoint) as game:
+        assert ''.join(game.currentGuess) == 'app__'
+        assert game.version == 3
+
+
+
+def testSkipsTruncatedLastRecord(tmp_path):
+    path = tmp_path/'sessions.snap'
+    registry, journal, _ = attach(path)
+    gameId = startGame(registry, 1, 'b')
+    journal.flush()
+    with registry.session(gameId) as game:
+        game.handleNewCharacter('e')
+    journal.flush()
+    logPath = str(path)+'.1.wal'
+    with open(logPath, 'r+b') as f:
+        f.truncate(os.path.getsize(logPath)-3)
+
+    restoredRegistry, _, restored = attach(path)
+    assert restored == 1
+    with restoredRegistry.session(gameId) as game:
+        assert ''.join(game.currentGuess) == 'b____'
+
+
+
+def testSkipsCorruptLastRecord(tmp_path):
+    path = tmp_path/'sessions.snap'
+    registry, journal, _ = attach(path)
+    gameId = startGame(registry, 1, 'b')
+    journal.flush()
+    with registry.session(gameId) as game:
+        game.handleNewCharacter('r')
+    journal.flush()
+    logPath = str(path)+'.1.wal'
+    with open(logPath, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xff]))
+
+    restoredRegistry, _, _ = attach(path)
+    with restoredRegistry.session(gameId) as game:
+        assert ''.join(game.currentGuess) == 'b____'
+
+
+
+def testForgetsGameRemovedAfterCheckpoint(tmp_path):
+    path = tmp_path/'sessions.snap'
+    registry, journal, _ = attach(path)
+    removed = startGame(registry, 0)
+    kept    = startGame(registry, 3)
+    journal.checkpoint()
+    registry.remove(removed)
+    journal.flush()
+
+    restoredRegistry, _, restored = attach(path)
+    assert restored == 1
+    with pytest.raises(Sessions.SessionNotFound):
+        with restoredRegistry.session(removed):
+            pass
+    assert savedState(restoredRegistry, kept) == savedState(registry, kept)
+
+
+
+def testRefusesCheckpointOfAnotherDictionary(tmp_path):
+    path = tmp_path/'sessions.snap'
+    registry, journal, _ = attach(path)
+    startGame(registry, 3, 'm')
+    journal.close()
+
+    Game.setDictionary(Dictionary.WordDictionary(OTHER_WORDS))
+    with pytest.raises(Snapshots.SnapshotError):
+        Snapshots.SessionJournal(str(path)).restore()